@@ -0,0 +1,109 @@
+"""
+Import-time benchmark for the xbarray compute backends.
+
+Each measurement runs in a fresh interpreter so that nothing is cached in `sys.modules`.
+For every backend we report
+  - the time to import the underlying framework itself (numpy / torch / jax.numpy),
+  - the extra time spent importing the xbarray backend on top of it, in eager and lazy binding mode,
+  - the time of the first call through the backend class (which pays for lazy resolution).
+
+With `--check-compile`, it also checks in a fresh interpreter per mode that the first use of the PyTorch backend
+(before any name is resolved) compiles into a single graph with `torch.compile(fullgraph=True)`.
+
+Usage:
+    python benchmarks/import_time.py [--repeat 7] [--backends numpy pytorch jax] [--check-compile]
+"""
+from typing import Dict, List
+import argparse
+import importlib.util
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BACKENDS = {
+    "numpy": ("numpy", "xbarray.backends.numpy", "NumpyComputeBackend"),
+    "pytorch": ("torch", "xbarray.backends.pytorch", "PytorchComputeBackend"),
+    "jax": ("jax.numpy", "xbarray.backends.jax", "JaxComputeBackend"),
+}
+
+_CHILD_SCRIPT = """
+import json, time
+t0 = time.perf_counter()
+import {framework}
+t1 = time.perf_counter()
+from {module} import {cls} as backend
+t2 = time.perf_counter()
+backend.zeros(4, dtype=backend.default_floating_dtype)
+t3 = time.perf_counter()
+print(json.dumps({{"framework": t1 - t0, "xbarray": t2 - t1, "first_call": t3 - t2}}))
+"""
+
+# Compiles functions of a fresh backend class with fullgraph=True, which raises on any graph break
+_COMPILE_CHECK_SCRIPT = """
+import torch
+from xbarray.backends.pytorch import PytorchComputeBackend as backend
+from xbarray.transformations.rotation_conversions import base
+torch.compile(base.quaternion_to_matrix, fullgraph=True)(backend, torch.randn(8, 4))
+torch.compile(base.matrix_to_axis_angle, fullgraph=True)(backend, torch.randn(8, 3, 3))
+"""
+
+def check_compile(lazy : bool) -> str:
+    env = dict(os.environ)
+    env["XBARRAY_LAZY_BINDING"] = "1" if lazy else "0"
+    out = subprocess.run([sys.executable, "-c", _COMPILE_CHECK_SCRIPT], env=env, capture_output=True, text=True)
+    if out.returncode == 0:
+        return "ok"
+    return "failed: " + (out.stderr.strip().splitlines() or ["?"])[-1]
+
+def _measure_once(backend_name : str, lazy : bool) -> Dict[str, float]:
+    framework, module, cls = BACKENDS[backend_name]
+    env = dict(os.environ)
+    env["XBARRAY_LAZY_BINDING"] = "1" if lazy else "0"
+    out = subprocess.run(
+        [sys.executable, "-c", _CHILD_SCRIPT.format(framework=framework, module=module, cls=cls)],
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+def measure(backend_name : str, lazy : bool, repeat : int) -> Dict[str, float]:
+    runs = [_measure_once(backend_name, lazy) for _ in range(repeat)]
+    return {
+        key: statistics.median(run[key] for run in runs)
+        for key in runs[0].keys()
+    }
+
+def main(argv : List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=7, help="Number of fresh interpreters per configuration (median is reported)")
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS.keys()), choices=list(BACKENDS.keys()))
+    parser.add_argument("--check-compile", action="store_true", help="Check that torch.compile(fullgraph=True) works in both modes")
+    args = parser.parse_args(argv)
+
+    header = f"{'backend':<10} {'mode':<6} {'framework (ms)':>15} {'xbarray (ms)':>13} {'first call (ms)':>16}"
+    print(header)
+    print("-" * len(header))
+    for backend_name in args.backends:
+        if importlib.util.find_spec(BACKENDS[backend_name][0].split(".")[0]) is None:
+            print(f"{backend_name:<10} skipped (framework not installed)")
+            continue
+        results = {}
+        for lazy in (False, True):
+            result = measure(backend_name, lazy, args.repeat)
+            results[lazy] = result
+            print(
+                f"{backend_name:<10} {'lazy' if lazy else 'eager':<6} "
+                f"{result['framework'] * 1e3:>15.1f} {result['xbarray'] * 1e3:>13.2f} {result['first_call'] * 1e3:>16.2f}"
+            )
+        saved = results[False]["xbarray"] - results[True]["xbarray"]
+        print(f"{backend_name:<10} lazy binding saves {saved * 1e3:.2f} ms of xbarray import time")
+        if args.check_compile and backend_name == "pytorch":
+            for lazy in (False, True):
+                print(f"{backend_name:<10} {'lazy' if lazy else 'eager':<6} torch.compile(fullgraph=True): {check_compile(lazy)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+`backend.jit` with and without shape bucketing on a stream of varying batch sizes.
+
+Calls a jitted rotation conversion (`quaternion_to_matrix`) with random batch sizes, as a data loader with variable-length
+batches would, and reports the total time (compilations included) and the number of compilations (cache misses),
+without bucketing (one compilation per distinct batch size) and with `bucket_sizes="pow2"`.
+
+Usage:
+    python benchmarks/jit_buckets.py [--backends pytorch jax] [--calls 200] [--max-batch-size 4096]
+"""
+from typing import Any, Callable, List
+import argparse
+import importlib
+import importlib.util
+import time
+import warnings
+import numpy as np
+
+BACKENDS = {
+    "numpy": ("numpy", "xbarray.backends.numpy", "NumpyComputeBackend"),
+    "pytorch": ("torch", "xbarray.backends.pytorch", "PytorchComputeBackend"),
+    "jax": ("jax", "xbarray.backends.jax", "JaxComputeBackend"),
+}
+
+def synchronized(backend_name : str, fn : Callable[..., Any]) -> Callable[..., Any]:
+    if backend_name == "jax":
+        import jax
+        return lambda *args: jax.block_until_ready(fn(*args))
+    return fn
+
+def main(argv : List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", nargs="+", default=["pytorch", "jax"], choices=list(BACKENDS.keys()))
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--max-batch-size", type=int, default=4096)
+    args = parser.parse_args(argv)
+
+    from xbarray.transformations.rotation_conversions import base as rotation_conversions
+    # torch.compile warns about the array API helpers it traces through
+    warnings.filterwarnings("ignore", category=UserWarning)
+    rng = np.random.default_rng(0)
+    batch_sizes = rng.integers(1, args.max_batch_size + 1, size=args.calls)
+
+    header = f"{'backend':<8} {'buckets':<8} {'total (s)':>10} {'compilations':>13} {'hits':>6}"
+    print(header)
+    print("-" * len(header))
+    for backend_name in args.backends:
+        framework, module, cls = BACKENDS[backend_name]
+        if importlib.util.find_spec(framework) is None:
+            print(f"{backend_name:<8} skipped (framework not installed)")
+            continue
+        backend = getattr(importlib.import_module(module), cls)
+        if backend_name == "pytorch":
+            import torch._dynamo
+            # Without buckets, every batch size is a compilation, past the default limit torch.compile falls back to eager
+            torch._dynamo.config.cache_size_limit = args.calls
+        inputs = [backend.from_numpy(rng.normal(size=(batch_size, 4)).astype(np.float32)) for batch_size in batch_sizes]
+        for bucket_sizes in (None, "pow2"):
+            jitted = backend.jit(lambda quaternions: rotation_conversions.quaternion_to_matrix(backend, quaternions), bucket_sizes=bucket_sizes)
+            call = synchronized(backend_name, jitted)
+            start = time.perf_counter()
+            for quaternions in inputs:
+                call(quaternions)
+            total = time.perf_counter() - start
+            info = jitted.cache_info()
+            print(f"{backend_name:<8} {str(bucket_sizes):<8} {total:>10.2f} {info.misses:>13} {info.hits:>6}")
+
+if __name__ == "__main__":
+    main()
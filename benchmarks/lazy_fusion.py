@@ -0,0 +1,156 @@
+"""
+Deferred (fused) vs. eager evaluation of rotation conversions.
+
+Runs rotation conversions (long chains of small array operations) on each backend directly, and through a `LazyComputeBackend`
+wrapping it (recorded, then evaluated as one program: `jax.jit` / `torch.compile` / cache-blocked NumPy),
+and reports the time per call (recording included) for a few batch sizes. The first call, which compiles the program, is not timed.
+With `--check`, it first checks that every rotation conversion gives the same results through the `LazyComputeBackend`
+as on the backend directly, and that programs differing only by constants that compare equal (e.g. `2` and `2.0`) are not mixed up.
+
+Usage:
+    python benchmarks/lazy_fusion.py [--backends numpy pytorch jax] [--batch-sizes 1000 100000 1000000] [--block-size 32768] [--check]
+"""
+from typing import Any, Callable, List
+import argparse
+import importlib
+import importlib.util
+import timeit
+import warnings
+import numpy as np
+
+BACKENDS = {
+    "numpy": ("numpy", "xbarray.backends.numpy", "NumpyComputeBackend"),
+    "pytorch": ("torch", "xbarray.backends.pytorch", "PytorchComputeBackend"),
+    "jax": ("jax", "xbarray.backends.jax", "JaxComputeBackend"),
+}
+
+FUNCTIONS = ("quaternion_to_matrix", "axis_angle_to_quaternion", "quaternion_multiply")
+
+def synchronized(backend_name : str, fn : Callable[[], Any]) -> Callable[[], Any]:
+    if backend_name == "jax":
+        import jax
+        return lambda: jax.block_until_ready(fn())
+    return fn
+
+def check_inputs(rng : np.random.Generator, batch_size : int = 16) -> dict:
+    # Arguments of every rotation conversion (after the backend), arrays as float32 NumPy arrays
+    def unit(shape):
+        q = rng.normal(size=shape).astype(np.float32)
+        return q / np.linalg.norm(q, axis=-1, keepdims=True)
+    quaternions, others = unit((batch_size, 4)), unit((batch_size, 4))
+    matrices = np.stack([np.eye(3, dtype=np.float32)] * batch_size)
+    vectors = rng.normal(size=(batch_size, 3)).astype(np.float32)
+    sequence = unit((8, batch_size, 4))
+    times = np.arange(8, dtype=np.float32)
+    return {
+        "quaternion_to_matrix": (quaternions,),
+        "matrix_to_quaternion": (matrices,),
+        "euler_angles_to_matrix": (vectors, "XYZ"),
+        "matrix_to_euler_angles": (matrices, "XYZ"),
+        "standardize_quaternion": (quaternions,),
+        "encode_quaternion": (quaternions,),
+        "decode_quaternion": (np.arange(batch_size, dtype=np.uint32) * 7919,),
+        "quaternion_multiply": (quaternions, others),
+        "quaternion_invert": (quaternions,),
+        "quaternion_apply": (quaternions, vectors),
+        "quaternion_slerp": (quaternions, others, 0.25),
+        "squad": (quaternions, others, quaternions, others, 0.25),
+        "make_quaternions_continuous": (sequence,),
+        "squad_control_points": (sequence,),
+        "resample_quaternion_trajectory": (times, sequence, times[:-1] + 0.5),
+        "axis_angle_to_matrix": (vectors,),
+        "matrix_to_axis_angle": (matrices,),
+        "axis_angle_to_quaternion": (vectors,),
+        "quaternion_to_axis_angle": (quaternions,),
+        "rotation_6d_to_matrix": (rng.normal(size=(batch_size, 6)).astype(np.float32),),
+        "matrix_to_rotation_6d": (matrices,),
+        "to_components": (quaternions,),
+        "from_components": (quaternions.T,),
+    }
+
+def check(backend : Any, lazy : Any, rotation_conversions : Any) -> List[str]:
+    # Random conversions are run too, from generators seeded the same way
+    failures = []
+    inputs = check_inputs(np.random.default_rng(0))
+    for name in rotation_conversions.__all__:
+        function = getattr(rotation_conversions, name)
+        try:
+            if name.startswith("random_"):
+                count = () if name == "random_rotation" else (16,)
+                expected = function(backend, backend.random.random_number_generator(0), *count)
+                result = function(lazy, lazy.random.random_number_generator(0), *count)
+            else:
+                wrap = lambda target, value: target.from_numpy(value) if isinstance(value, np.ndarray) else value
+                expected = function(backend, *(wrap(backend, value) for value in inputs[name]))
+                result = function(lazy, *(wrap(lazy, value) for value in inputs[name]))
+            expected, result = backend.to_numpy(expected), lazy.to_numpy(result)
+        except Exception as error:
+            failures.append(f"{name}: {type(error).__name__}: {error}")
+            continue
+        if result.dtype != expected.dtype or result.shape != expected.shape or not np.allclose(result, expected, atol=1e-5, equal_nan=True):
+            failures.append(f"{name}: results differ")
+    # Programs differing only by constants that compare equal (2 == 2.0 == True, 0.0 == -0.0) must not share a compiled program
+    integers, floats = np.arange(4, dtype=np.int32), np.ones(4, dtype=np.float32)
+    cases = {
+        "x * 2.0 after x * 2": (lambda b, x: x * 2, lambda b, x: x * 2.0, integers),
+        "x + True after x + 1": (lambda b, x: x + 1, lambda b, x: x + True, integers),
+        "copysign(x, -0.0) after copysign(x, 0.0)": (lambda b, x: b.copysign(x, 0.0), lambda b, x: b.copysign(x, -0.0), floats),
+    }
+    for name, (first, second, x) in cases.items():
+        lazy.to_numpy(first(lazy, lazy.from_numpy(x)))
+        expected, result = backend.to_numpy(second(backend, backend.from_numpy(x))), lazy.to_numpy(second(lazy, lazy.from_numpy(x)))
+        if result.dtype != expected.dtype or not np.array_equal(np.signbit(result), np.signbit(expected)) or not np.array_equal(result, expected):
+            failures.append(f"{name}: {result!r} != {expected!r}")
+    return failures
+
+def main(argv : List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS.keys()), choices=list(BACKENDS.keys()))
+    parser.add_argument("--batch-sizes", nargs="+", type=int, default=[1000, 100000, 1000000])
+    parser.add_argument("--block-size", type=int, default=None, help="Elements per block on NumPy (default: DEFAULT_BLOCK_SIZE)")
+    parser.add_argument("--number", type=int, default=5, help="Calls per timing")
+    parser.add_argument("--check", action="store_true", help="Check the results of every rotation conversion through the lazy backend first")
+    args = parser.parse_args(argv)
+
+    from xbarray.backends.deferred import DEFAULT_BLOCK_SIZE, LazyComputeBackend
+    from xbarray.transformations.rotation_conversions import base as rotation_conversions
+    # torch.compile warns about the array API helpers it traces through
+    warnings.filterwarnings("ignore", category=UserWarning)
+    rng = np.random.default_rng(0)
+
+    header = f"{'backend':<8} {'function':<26} {'batch':>9} {'eager (ms)':>11} {'lazy (ms)':>10} {'speedup':>8}"
+    print(header)
+    print("-" * len(header))
+    for backend_name in args.backends:
+        framework, module, cls = BACKENDS[backend_name]
+        if importlib.util.find_spec(framework) is None:
+            print(f"{backend_name:<8} skipped (framework not installed)")
+            continue
+        backend = getattr(importlib.import_module(module), cls)
+        lazy = LazyComputeBackend(backend, block_size=args.block_size or DEFAULT_BLOCK_SIZE)
+        if args.check:
+            failures = check(backend, lazy, rotation_conversions)
+            print(f"{backend_name:<8} check: " + ("ok" if len(failures) == 0 else "failed"))
+            for failure in failures:
+                print(f"  {failure}")
+        for batch_size in args.batch_sizes:
+            quaternions = rng.normal(size=(batch_size, 4)).astype(np.float32)
+            inputs = {
+                "quaternion_to_matrix": (quaternions,),
+                "axis_angle_to_quaternion": (rng.normal(size=(batch_size, 3)).astype(np.float32),),
+                "quaternion_multiply": (quaternions, rng.normal(size=(batch_size, 4)).astype(np.float32)),
+            }
+            for name in FUNCTIONS:
+                function = getattr(rotation_conversions, name)
+                eager_inputs = [backend.from_numpy(x) for x in inputs[name]]
+                lazy_inputs = [lazy.from_numpy(x) for x in inputs[name]]
+                eager = synchronized(backend_name, lambda: function(backend, *eager_inputs))
+                deferred = synchronized(backend_name, lambda: function(lazy, *lazy_inputs).compute())
+                eager()
+                deferred()
+                t_eager = min(timeit.repeat(eager, number=args.number, repeat=3)) / args.number
+                t_lazy = min(timeit.repeat(deferred, number=args.number, repeat=3)) / args.number
+                print(f"{backend_name:<8} {name:<26} {batch_size:>9} {t_eager * 1e3:>11.3f} {t_lazy * 1e3:>10.3f} {t_eager / t_lazy:>7.2f}x")
+
+if __name__ == "__main__":
+    main()
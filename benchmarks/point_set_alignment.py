@@ -0,0 +1,67 @@
+"""
+Batched point set alignment vs. a loop over the problems.
+
+Solves many small Kabsch / Umeyama problems (`align_point_sets`) in one vectorized call on each backend,
+and in a Python loop (one call per problem) for comparison, and reports the problems solved per second.
+
+Usage:
+    python benchmarks/point_set_alignment.py [--backends numpy pytorch jax] [--num-problems 10000] [--num-points 32] [--with-scale]
+"""
+from typing import Any, Callable, List
+import argparse
+import importlib
+import importlib.util
+import timeit
+import numpy as np
+
+BACKENDS = {
+    "numpy": ("numpy", "xbarray.backends.numpy", "NumpyComputeBackend"),
+    "pytorch": ("torch", "xbarray.backends.pytorch", "PytorchComputeBackend"),
+    "jax": ("jax", "xbarray.backends.jax", "JaxComputeBackend"),
+}
+
+def synchronized(backend_name : str, fn : Callable[[], Any]) -> Callable[[], Any]:
+    if backend_name == "jax":
+        import jax
+        return lambda: jax.block_until_ready(fn())
+    return fn
+
+def main(argv : List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS.keys()), choices=list(BACKENDS.keys()))
+    parser.add_argument("--num-problems", type=int, default=10000)
+    parser.add_argument("--num-points", type=int, default=32, help="Points per problem")
+    parser.add_argument("--with-scale", action="store_true", help="Also estimate the scales (Umeyama)")
+    parser.add_argument("--number", type=int, default=5, help="Calls per timing")
+    args = parser.parse_args(argv)
+
+    from xbarray.transformations.lie import base as lie
+    rng = np.random.default_rng(0)
+    src = rng.normal(size=(args.num_problems, args.num_points, 3))
+    # A cyclic permutation of the axes (a proper rotation) plus a translation
+    dst = src[..., [1, 2, 0]] + rng.normal(size=(args.num_problems, 1, 3))
+
+    header = f"{'backend':<8} {'loop (problems/s)':>18} {'batched (problems/s)':>21} {'speedup':>8}"
+    print(header)
+    print("-" * len(header))
+    for backend_name in args.backends:
+        framework, module, cls = BACKENDS[backend_name]
+        if importlib.util.find_spec(framework) is None:
+            print(f"{backend_name:<8} skipped (framework not installed)")
+            continue
+        backend = getattr(importlib.import_module(module), cls)
+        src_b = backend.from_numpy(src.astype(np.float32))
+        dst_b = backend.from_numpy(dst.astype(np.float32))
+        batched = synchronized(backend_name, lambda: lie.align_point_sets(backend, src_b, dst_b, with_scale=args.with_scale))
+        num_looped = min(args.num_problems, 200)
+        looped = synchronized(backend_name, lambda: [
+            lie.align_point_sets(backend, src_b[i], dst_b[i], with_scale=args.with_scale) for i in range(num_looped)
+        ])
+        batched()
+        looped()
+        t_batched = min(timeit.repeat(batched, number=args.number, repeat=3)) / args.number / args.num_problems
+        t_looped = min(timeit.repeat(looped, number=1, repeat=3)) / num_looped
+        print(f"{backend_name:<8} {1.0 / t_looped:>18.0f} {1.0 / t_batched:>21.0f} {t_looped / t_batched:>7.0f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Host -> device prefetch benchmark.
+
+Runs a loop of `transfer batch, compute on batch` once with synchronous transfers and once through `backend.prefetch`,
+and reports the time per step. With prefetching, the transfer of the next batches overlaps with the computation on the current one.
+Without a GPU the transfers go through the CPU stand-in (a background copy thread).
+
+Usage:
+    python benchmarks/prefetch_overlap.py [--backends numpy pytorch jax] [--device cuda] [--steps 20] [--size 2048]
+"""
+from typing import Any, List
+import argparse
+import importlib
+import importlib.util
+import time
+
+BACKENDS = {
+    "numpy": ("numpy", "xbarray.backends.numpy", "NumpyComputeBackend"),
+    "pytorch": ("torch", "xbarray.backends.pytorch", "PytorchComputeBackend"),
+    "jax": ("jax", "xbarray.backends.jax", "JaxComputeBackend"),
+}
+
+def resolve_device(backend_name : str, device : str) -> Any:
+    if backend_name == "pytorch":
+        import torch
+        return torch.device(device)
+    if backend_name == "jax":
+        import jax
+        return jax.devices(device)[0]
+    return device
+
+def run(backend : Any, batches : List[Any], device : Any, prefetch : bool) -> float:
+    def compute(batch):
+        x = batch["x"]
+        for _ in range(4):
+            x = backend.matmul(x, batch["w"])
+        return float(backend.sum(x))
+
+    start = time.perf_counter()
+    if prefetch:
+        for batch in backend.prefetch(batches, device, buffer_size=2):
+            compute(batch)
+    else:
+        for batch in batches:
+            compute(backend.async_to_device(batch, device).result())
+    return (time.perf_counter() - start) / len(batches)
+
+def main(argv : List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS.keys()), choices=list(BACKENDS.keys()))
+    parser.add_argument("--device", type=str, default="cpu", help="Target device (numpy only supports cpu)")
+    parser.add_argument("--steps", type=int, default=20)
+    parser.add_argument("--size", type=int, default=2048, help="Batches hold a (size, size // 8) input and a (size // 8, size // 8) weight")
+    args = parser.parse_args(argv)
+
+    header = f"{'backend':<10} {'sync (ms/step)':>15} {'prefetch (ms/step)':>19} {'speedup':>8}"
+    print(header)
+    print("-" * len(header))
+    for backend_name in args.backends:
+        framework, module, cls = BACKENDS[backend_name]
+        if importlib.util.find_spec(framework) is None:
+            print(f"{backend_name:<10} skipped (framework not installed)")
+            continue
+        backend = getattr(importlib.import_module(module), cls)
+        device = resolve_device(backend_name, args.device if backend_name != "numpy" else "cpu")
+        batches = [
+            {"x": backend.ones((args.size, args.size // 8)) * i, "w": backend.eye(args.size // 8)}
+            for i in range(args.steps)
+        ]
+        run(backend, batches[:2], device, prefetch=True) # warm up
+        sync = run(backend, batches, device, prefetch=False)
+        overlapped = run(backend, batches, device, prefetch=True)
+        print(f"{backend_name:<10} {sync * 1e3:>15.2f} {overlapped * 1e3:>19.2f} {sync / overlapped:>7.2f}x")
+
+if __name__ == "__main__":
+    main()
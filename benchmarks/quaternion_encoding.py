@@ -0,0 +1,77 @@
+"""
+Compact quaternion encodings: size, angular error and throughput.
+
+For each encoding of `QUATERNION_ENCODINGS` and each backend, reports the bytes per quaternion (and the compression ratio
+vs. float32 quaternions), the worst-case angular error bound of the encoding and the largest error measured
+over random unit quaternions, and the throughput of `encode_quaternion` / `decode_quaternion` in millions of quaternions per second.
+
+Usage:
+    python benchmarks/quaternion_encoding.py [--backends numpy pytorch jax] [--batch-size 1048576] [--number 10]
+"""
+from typing import Any, Callable, List
+import argparse
+import importlib
+import importlib.util
+import timeit
+import numpy as np
+
+BACKENDS = {
+    "numpy": ("numpy", "xbarray.backends.numpy", "NumpyComputeBackend"),
+    "pytorch": ("torch", "xbarray.backends.pytorch", "PytorchComputeBackend"),
+    "jax": ("jax", "xbarray.backends.jax", "JaxComputeBackend"),
+}
+
+def synchronized(backend_name : str, fn : Callable[[], Any]) -> Callable[[], Any]:
+    if backend_name == "jax":
+        import jax
+        return lambda: jax.block_until_ready(fn())
+    return fn
+
+def angular_errors(quaternions : np.ndarray, decoded : np.ndarray) -> np.ndarray:
+    # Angle between the rotations, through atan2 (arccos of the dot product is inaccurate for small angles)
+    decoded = decoded / np.linalg.norm(decoded, axis=-1, keepdims=True)
+    dot = np.sum(quaternions * decoded, axis=-1)
+    orthogonal = np.linalg.norm(decoded - dot[..., None] * quaternions, axis=-1)
+    return 2.0 * np.arctan2(orthogonal, np.abs(dot))
+
+def main(argv : List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS.keys()), choices=list(BACKENDS.keys()))
+    parser.add_argument("--batch-size", type=int, default=1 << 20)
+    parser.add_argument("--number", type=int, default=10, help="Calls per timing")
+    args = parser.parse_args(argv)
+
+    from xbarray.transformations.rotation_conversions import base as rotation_conversions, get_quaternion_encoding, QUATERNION_ENCODINGS
+    rng = np.random.default_rng(0)
+    quaternions = rng.normal(size=(args.batch_size, 4))
+    quaternions /= np.linalg.norm(quaternions, axis=-1, keepdims=True)
+
+    header = (
+        f"{'backend':<8} {'encoding':<18} {'bytes':>5} {'ratio':>6} {'bound (deg)':>12} {'measured (deg)':>15} "
+        f"{'encode (M/s)':>13} {'decode (M/s)':>13}"
+    )
+    print(header)
+    print("-" * len(header))
+    for backend_name in args.backends:
+        framework, module, cls = BACKENDS[backend_name]
+        if importlib.util.find_spec(framework) is None:
+            print(f"{backend_name:<8} skipped (framework not installed)")
+            continue
+        backend = getattr(importlib.import_module(module), cls)
+        inputs = backend.from_numpy(quaternions.astype(np.float32))
+        for name in QUATERNION_ENCODINGS:
+            encoding = get_quaternion_encoding(name)
+            encode = synchronized(backend_name, lambda: rotation_conversions.encode_quaternion(backend, inputs, encoding))
+            encoded = encode()
+            decode = synchronized(backend_name, lambda: rotation_conversions.decode_quaternion(backend, encoded, encoding, dtype=backend.float32))
+            decoded = backend.to_numpy(decode()).astype(np.float64)
+            t_encode = min(timeit.repeat(encode, number=args.number, repeat=3)) / args.number
+            t_decode = min(timeit.repeat(decode, number=args.number, repeat=3)) / args.number
+            print(
+                f"{backend_name:<8} {name:<18} {encoding.nbytes:>5} {16 / encoding.nbytes:>5.1f}x "
+                f"{np.degrees(encoding.max_angular_error):>12.4f} {np.degrees(angular_errors(quaternions, decoded).max()):>15.4f} "
+                f"{args.batch_size / t_encode / 1e6:>13.1f} {args.batch_size / t_decode / 1e6:>13.1f}"
+            )
+
+if __name__ == "__main__":
+    main()
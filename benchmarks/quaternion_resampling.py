@@ -0,0 +1,81 @@
+"""
+Vectorized quaternion trajectory resampling vs. a Python loop.
+
+Resamples a batch of quaternion trajectories at new times with `resample_quaternion_trajectory` (slerp and squad),
+and reports the throughput in millions of resampled quaternions per second, next to a NumPy baseline
+looping in Python over the new times (interval lookup + slerp per new time, vectorized over the batch only).
+
+Usage:
+    python benchmarks/quaternion_resampling.py [--backends numpy pytorch jax] [--num-times 1000] [--num-new-times 100000] [--batch-size 16]
+"""
+from typing import Any, Callable, List
+import argparse
+import importlib
+import importlib.util
+import timeit
+import numpy as np
+
+BACKENDS = {
+    "numpy": ("numpy", "xbarray.backends.numpy", "NumpyComputeBackend"),
+    "pytorch": ("torch", "xbarray.backends.pytorch", "PytorchComputeBackend"),
+    "jax": ("jax", "xbarray.backends.jax", "JaxComputeBackend"),
+}
+
+def synchronized(backend_name : str, fn : Callable[[], Any]) -> Callable[[], Any]:
+    if backend_name == "jax":
+        import jax
+        return lambda: jax.block_until_ready(fn())
+    return fn
+
+def loop_resample(times : np.ndarray, quaternions : np.ndarray, new_times : np.ndarray) -> np.ndarray:
+    out = np.empty((len(new_times),) + quaternions.shape[1:])
+    for n, new_time in enumerate(new_times):
+        i = min(max(int(np.searchsorted(times, new_time, side="right")) - 1, 0), len(times) - 2)
+        t = min(max((new_time - times[i]) / (times[i + 1] - times[i]), 0.0), 1.0)
+        q0, q1 = quaternions[i], quaternions[i + 1]
+        dot = np.sum(q0 * q1, axis=-1, keepdims=True)
+        q1 = np.where(dot < 0, -q1, q1)
+        theta = np.arccos(np.clip(np.abs(dot), 0.0, 1.0))
+        sin_theta = np.maximum(np.sin(theta), 1e-12)
+        out[n] = (np.sin((1.0 - t) * theta) * q0 + np.sin(t * theta) * q1) / sin_theta
+    return out
+
+def main(argv : List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS.keys()), choices=list(BACKENDS.keys()))
+    parser.add_argument("--num-times", type=int, default=1000, help="Samples per input trajectory")
+    parser.add_argument("--num-new-times", type=int, default=100000, help="Samples per resampled trajectory")
+    parser.add_argument("--batch-size", type=int, default=16, help="Trajectories resampled together")
+    parser.add_argument("--number", type=int, default=5, help="Calls per timing")
+    args = parser.parse_args(argv)
+
+    from xbarray.transformations.rotation_conversions import base as rotation_conversions
+    from xbarray.backends.numpy import NumpyComputeBackend
+    rng = np.random.default_rng(0)
+    times = np.sort(rng.uniform(0.0, 100.0, size=args.num_times))
+    axis_angles = np.cumsum(rng.normal(scale=0.1, size=(args.num_times, args.batch_size, 3)), axis=0)
+    quaternions = rotation_conversions.axis_angle_to_quaternion(NumpyComputeBackend, axis_angles)
+    new_times = np.linspace(times[0], times[-1], args.num_new_times)
+    num_samples = args.num_new_times * args.batch_size
+
+    header = f"{'backend':<8} {'method':<12} {'M quaternions/s':>16}"
+    print(header)
+    print("-" * len(header))
+    loop_new_times = new_times[:max(args.num_new_times // 100, 1)]
+    t_loop = min(timeit.repeat(lambda: loop_resample(times, quaternions, loop_new_times), number=1, repeat=3))
+    print(f"{'numpy':<8} {'python loop':<12} {len(loop_new_times) * args.batch_size / t_loop / 1e6:>16.2f}")
+    for backend_name in args.backends:
+        framework, module, cls = BACKENDS[backend_name]
+        if importlib.util.find_spec(framework) is None:
+            print(f"{backend_name:<8} skipped (framework not installed)")
+            continue
+        backend = getattr(importlib.import_module(module), cls)
+        inputs = [backend.from_numpy(x.astype(np.float32)) for x in (times, quaternions, new_times)]
+        for method in ("slerp", "squad"):
+            resample = synchronized(backend_name, lambda: rotation_conversions.resample_quaternion_trajectory(backend, *inputs, method=method))
+            resample()
+            t = min(timeit.repeat(resample, number=args.number, repeat=3)) / args.number
+            print(f"{backend_name:<8} {method:<12} {num_samples / t / 1e6:>16.2f}")
+
+if __name__ == "__main__":
+    main()
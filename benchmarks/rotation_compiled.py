@@ -0,0 +1,102 @@
+"""
+Eager vs. compiled rotation conversions.
+
+For every installed backend and batch sizes from 1 to 10^max_exp, reports the median time per call of a few rotation conversions
+with the eager functions (`rotation_conversions.<backend>`) and the compiled ones (`rotation_conversions.<backend>.compiled`),
+and the largest difference between their results. Compilation happens during the warm-up calls and is not timed.
+
+Usage:
+    python benchmarks/rotation_compiled.py [--backends numpy pytorch jax] [--max-exp 7] [--repeat 5]
+"""
+from typing import Any, Callable, Dict, List, Tuple
+import argparse
+import importlib
+import importlib.util
+import statistics
+import time
+import numpy as np
+
+BACKENDS = {
+    "numpy": "numpy",
+    "pytorch": "torch",
+    "jax": "jax",
+}
+FUNCTIONS = [
+    "quaternion_to_matrix",
+    "matrix_to_quaternion",
+    "quaternion_multiply",
+    "quaternion_apply",
+    "axis_angle_to_matrix",
+]
+
+def make_inputs(backend_name : str, n : int) -> Dict[str, Tuple[Any, ...]]:
+    rng = np.random.default_rng(0)
+    q = rng.normal(size=(n, 4)).astype(np.float32)
+    q /= np.linalg.norm(q, axis=-1, keepdims=True)
+    q2 = rng.normal(size=(n, 4)).astype(np.float32)
+    q2 /= np.linalg.norm(q2, axis=-1, keepdims=True)
+    points = rng.normal(size=(n, 3)).astype(np.float32)
+    axis_angle = rng.normal(size=(n, 3)).astype(np.float32)
+    if backend_name == "pytorch":
+        import torch
+        convert = torch.from_numpy
+    elif backend_name == "jax":
+        import jax.numpy as jnp
+        convert = jnp.asarray
+    else:
+        convert = lambda x: x
+    module = importlib.import_module(f"xbarray.transformations.rotation_conversions.{backend_name}")
+    matrices = module.quaternion_to_matrix(convert(q))
+    return {
+        "quaternion_to_matrix": (convert(q),),
+        "matrix_to_quaternion": (matrices,),
+        "quaternion_multiply": (convert(q), convert(q2)),
+        "quaternion_apply": (convert(q), convert(points)),
+        "axis_angle_to_matrix": (convert(axis_angle),),
+    }
+
+def block(x : Any) -> Any:
+    if hasattr(x, "block_until_ready"):
+        x.block_until_ready()
+    return x
+
+def time_call(fn : Callable, args : Tuple[Any, ...], repeat : int) -> float:
+    for _ in range(2): # warm-up, includes compilation
+        block(fn(*args))
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        block(fn(*args))
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+def main(argv : List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS.keys()), choices=list(BACKENDS.keys()))
+    parser.add_argument("--max-exp", type=int, default=7, help="Largest batch size is 10 ** max_exp")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    header = f"{'backend':<8} {'function':<22} {'batch':>9} {'eager (us)':>12} {'compiled (us)':>14} {'speedup':>8} {'max abs diff':>13}"
+    print(header)
+    print("-" * len(header))
+    for backend_name in args.backends:
+        if importlib.util.find_spec(BACKENDS[backend_name]) is None:
+            print(f"{backend_name:<8} skipped (framework not installed)")
+            continue
+        module = importlib.import_module(f"xbarray.transformations.rotation_conversions.{backend_name}")
+        for exp in range(args.max_exp + 1):
+            n = 10 ** exp
+            inputs = make_inputs(backend_name, n)
+            for name in FUNCTIONS:
+                eager, compiled = getattr(module, name), getattr(module.compiled, name)
+                t_eager = time_call(eager, inputs[name], args.repeat)
+                t_compiled = time_call(compiled, inputs[name], args.repeat)
+                diff = float(np.max(np.abs(np.asarray(eager(*inputs[name])) - np.asarray(compiled(*inputs[name])))))
+                print(
+                    f"{backend_name:<8} {name:<22} {n:>9} {t_eager * 1e6:>12.1f} {t_compiled * 1e6:>14.1f} "
+                    f"{t_eager / t_compiled:>7.2f}x {diff:>13.2e}"
+                )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Allocating vs. in-place (`out=` + `workspace=`) rotation conversions.
+
+For NumPy and PyTorch and a few batch sizes, reports the time per call of some rotation conversions
+called the usual way and with a preallocated `out` and a `RotationWorkspace`, and the peak number of bytes
+allocated by one call (NumPy: tracemalloc, PyTorch: the CPU memory of `torch.profiler`).
+
+Usage:
+    python benchmarks/rotation_inplace.py [--backends numpy pytorch] [--batch-sizes 1 64 4096] [--number 200]
+"""
+from typing import Any, Callable, List
+import argparse
+import importlib
+import importlib.util
+import timeit
+import tracemalloc
+import numpy as np
+
+BACKENDS = {
+    "numpy": ("numpy", "xbarray.backends.numpy", "NumpyComputeBackend"),
+    "pytorch": ("torch", "xbarray.backends.pytorch", "PytorchComputeBackend"),
+}
+FUNCTIONS = [
+    "quaternion_to_matrix",
+    "matrix_to_quaternion",
+    "quaternion_multiply",
+    "quaternion_apply",
+    "axis_angle_to_matrix",
+]
+
+def allocated_bytes(backend_name : str, fn : Callable[[], Any]) -> int:
+    fn()
+    if backend_name == "pytorch":
+        from torch.profiler import profile, ProfilerActivity
+        with profile(activities=[ProfilerActivity.CPU], profile_memory=True) as prof:
+            fn()
+        return sum(event.cpu_memory_usage for event in prof.key_averages() if event.cpu_memory_usage > 0)
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def main(argv : List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS.keys()), choices=list(BACKENDS.keys()))
+    parser.add_argument("--batch-sizes", nargs="+", type=int, default=[1, 64, 4096])
+    parser.add_argument("--number", type=int, default=200, help="Calls per timing")
+    args = parser.parse_args(argv)
+
+    from xbarray.transformations.rotation_conversions import base as rotation_conversions, RotationWorkspace
+    header = f"{'backend':<8} {'function':<22} {'batch':>6} {'alloc (us)':>11} {'in-place (us)':>14} {'alloc (bytes)':>14} {'in-place (bytes)':>17}"
+    print(header)
+    print("-" * len(header))
+    for backend_name in args.backends:
+        framework, module, cls = BACKENDS[backend_name]
+        if importlib.util.find_spec(framework) is None:
+            print(f"{backend_name:<8} skipped (framework not installed)")
+            continue
+        backend = getattr(importlib.import_module(module), cls)
+        workspace = RotationWorkspace(backend)
+        rng = np.random.default_rng(0)
+        for n in args.batch_sizes:
+            quaternions = backend.from_numpy(rng.normal(size=(n, 4)))
+            points = backend.from_numpy(rng.normal(size=(n, 3)))
+            inputs = {
+                "quaternion_to_matrix": (quaternions,),
+                "matrix_to_quaternion": (rotation_conversions.quaternion_to_matrix(backend, quaternions),),
+                "quaternion_multiply": (quaternions, quaternions),
+                "quaternion_apply": (quaternions, points),
+                "axis_angle_to_matrix": (points,),
+            }
+            for name in FUNCTIONS:
+                func = getattr(rotation_conversions, name)
+                func_args = inputs[name]
+                out = func(backend, *func_args, workspace=workspace)
+                allocating = lambda: func(backend, *func_args)
+                inplace = lambda: func(backend, *func_args, out=out, workspace=workspace)
+                t_allocating = min(timeit.repeat(allocating, number=args.number, repeat=3)) / args.number
+                t_inplace = min(timeit.repeat(inplace, number=args.number, repeat=3)) / args.number
+                print(
+                    f"{backend_name:<8} {name:<22} {n:>6} {t_allocating * 1e6:>11.1f} {t_inplace * 1e6:>14.1f} "
+                    f"{allocated_bytes(backend_name, allocating):>14} {allocated_bytes(backend_name, inplace):>17}"
+                )
+
+if __name__ == "__main__":
+    main()
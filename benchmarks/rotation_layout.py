@@ -0,0 +1,95 @@
+"""
+Interleaved vs. components-first (`layout="components"`) rotation conversions.
+
+For each backend and a few (large) batch sizes, reports the throughput in millions of rotations per second
+of some rotation conversions on interleaved (..., 4) / (..., 3, 3) arrays and on contiguous components-first
+(4, ...) / (9, ...) arrays holding the same data.
+
+Usage:
+    python benchmarks/rotation_layout.py [--backends numpy pytorch jax] [--batch-sizes 4096 65536 1048576] [--number 20]
+"""
+from typing import Any, Callable, List
+import argparse
+import importlib
+import importlib.util
+import timeit
+import numpy as np
+
+BACKENDS = {
+    "numpy": ("numpy", "xbarray.backends.numpy", "NumpyComputeBackend"),
+    "pytorch": ("torch", "xbarray.backends.pytorch", "PytorchComputeBackend"),
+    "jax": ("jax", "xbarray.backends.jax", "JaxComputeBackend"),
+}
+FUNCTIONS = [
+    "quaternion_to_matrix",
+    "matrix_to_quaternion",
+    "quaternion_multiply",
+    "quaternion_apply",
+    "axis_angle_to_matrix",
+]
+
+def synchronized(backend_name : str, fn : Callable[[], Any]) -> Callable[[], Any]:
+    if backend_name == "jax":
+        import jax
+        return lambda: jax.block_until_ready(fn())
+    return fn
+
+def main(argv : List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS.keys()), choices=list(BACKENDS.keys()))
+    parser.add_argument("--batch-sizes", nargs="+", type=int, default=[4096, 65536, 1048576])
+    parser.add_argument("--number", type=int, default=20, help="Calls per timing")
+    args = parser.parse_args(argv)
+
+    from xbarray.transformations.rotation_conversions import base as rotation_conversions
+    header = f"{'backend':<8} {'function':<22} {'batch':>8} {'interleaved (M/s)':>18} {'components (M/s)':>17} {'speedup':>8}"
+    print(header)
+    print("-" * len(header))
+    for backend_name in args.backends:
+        framework, module, cls = BACKENDS[backend_name]
+        if importlib.util.find_spec(framework) is None:
+            print(f"{backend_name:<8} skipped (framework not installed)")
+            continue
+        backend = getattr(importlib.import_module(module), cls)
+        rng = np.random.default_rng(0)
+        for n in args.batch_sizes:
+            quaternions = rng.normal(size=(n, 4)).astype(np.float32)
+            points = rng.normal(size=(n, 3)).astype(np.float32)
+            interleaved = {
+                "quaternions": backend.from_numpy(quaternions),
+                "points": backend.from_numpy(points),
+            }
+            interleaved["matrices"] = rotation_conversions.quaternion_to_matrix(backend, interleaved["quaternions"])
+            # Contiguous copies in the components layout (not views), as data stored that way would be
+            components = {
+                "quaternions": backend.from_numpy(np.ascontiguousarray(quaternions.T)),
+                "points": backend.from_numpy(np.ascontiguousarray(points.T)),
+                "matrices": backend.from_numpy(np.ascontiguousarray(
+                    backend.to_numpy(interleaved["matrices"]).reshape(n, 9).T
+                )),
+            }
+            def inputs(arrays : dict, name : str) -> tuple:
+                return {
+                    "quaternion_to_matrix": (arrays["quaternions"],),
+                    "matrix_to_quaternion": (arrays["matrices"],),
+                    "quaternion_multiply": (arrays["quaternions"], arrays["quaternions"]),
+                    "quaternion_apply": (arrays["quaternions"], arrays["points"]),
+                    "axis_angle_to_matrix": (arrays["points"],),
+                }[name]
+            for name in FUNCTIONS:
+                func = getattr(rotation_conversions, name)
+                interleaved_args = inputs(interleaved, name)
+                components_args = inputs(components, name)
+                run_interleaved = synchronized(backend_name, lambda: func(backend, *interleaved_args))
+                run_components = synchronized(backend_name, lambda: func(backend, *components_args, layout="components"))
+                run_interleaved()
+                run_components()
+                t_interleaved = min(timeit.repeat(run_interleaved, number=args.number, repeat=3)) / args.number
+                t_components = min(timeit.repeat(run_components, number=args.number, repeat=3)) / args.number
+                print(
+                    f"{backend_name:<8} {name:<22} {n:>8} {n / t_interleaved / 1e6:>18.1f} "
+                    f"{n / t_components / 1e6:>17.1f} {t_interleaved / t_components:>7.2f}x"
+                )
+
+if __name__ == "__main__":
+    main()
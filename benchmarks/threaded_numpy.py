@@ -0,0 +1,100 @@
+"""
+Multi-threaded vs. plain NumPy backend.
+
+Times elementwise functions, reductions, a batched matmul and random fills on `NumpyComputeBackend` and
+`ThreadedNumpyComputeBackend` for a few array sizes (below the threading threshold both run the same code,
+so the ratio there is the overhead of the size check).
+With `--check`, it first checks that both backends give the same results for float, integer and boolean arrays
+split into parts of unequal lengths, and the same float16 means.
+
+Usage:
+    python benchmarks/threaded_numpy.py [--sizes 10000 1000000 10000000] [--num-threads 8] [--threshold 131072] [--check]
+"""
+from typing import Any, Callable, Dict, List, Tuple
+import argparse
+import timeit
+import numpy as np
+
+def operations(backend : Any, size : int, rng : np.random.Generator) -> Dict[str, Callable[[], Any]]:
+    x = rng.normal(size=(size // 4, 4)).astype(np.float32)
+    y = rng.normal(size=(size // 4, 4)).astype(np.float32)
+    matrices = rng.normal(size=(size // 9, 3, 3)).astype(np.float32)
+    vectors = rng.normal(size=(size // 9, 3, 1)).astype(np.float32)
+    generator = backend.random.random_number_generator(0)
+    return {
+        "multiply": lambda: backend.multiply(x, y),
+        "exp": lambda: backend.exp(x),
+        "atan2": lambda: backend.atan2(x, y),
+        "where": lambda: backend.where(x > 0, x, y),
+        "sum": lambda: backend.sum(x),
+        "mean(axis=0)": lambda: backend.mean(x, axis=0),
+        "max(axis=-1)": lambda: backend.max(x, axis=-1),
+        "matmul (3x3 @ 3x1)": lambda: backend.matmul(matrices, vectors),
+        "random_normal": lambda: backend.random.random_normal((size,), rng=generator, dtype=np.float32),
+    }
+
+def check(plain : Any, threaded : Any) -> List[str]:
+    # A leading axis of 103 is split into parts of unequal lengths, with a threshold small enough to split every array below
+    threshold = threaded.get_threading_threshold()
+    threaded.set_threading_threshold(10)
+    failures = []
+    try:
+        # Small values, so that the products do not overflow the floats
+        values = np.arange(103 * 5).reshape(103, 5) % 7
+        for x in ((1 + values / 64).astype(np.float32), 1 + values / 64, values, values.astype(np.int8), values % 3 == 0):
+            for name in ("sum", "prod", "max", "min", "any", "all", "mean"):
+                for axis in (None, 0, 1, (0, 1)):
+                    expected, result = getattr(plain, name)(x, axis=axis), getattr(threaded, name)(x, axis=axis)
+                    if np.asarray(result).dtype != np.asarray(expected).dtype or not np.allclose(result, expected, equal_nan=True):
+                        failures.append(f"{name}({x.dtype}, axis={axis}): {result!r} != {expected!r}")
+            for name, fn in (("add", lambda backend: backend.add(x, x)), ("astype", lambda backend: backend.astype(x, np.float64))):
+                expected, result = fn(plain), fn(threaded)
+                if result.dtype != expected.dtype or not np.array_equal(result, expected):
+                    failures.append(f"{name}({x.dtype}): results differ")
+        # float16 sums overflow beyond 65504, `np.mean` accumulates them in float32
+        x = np.full((100000, 2), 1000, dtype=np.float16)
+        for axis in (None, 0):
+            expected, result = plain.mean(x, axis=axis), threaded.mean(x, axis=axis)
+            if np.asarray(result).dtype != np.asarray(expected).dtype or not np.allclose(result, expected):
+                failures.append(f"mean(large float16, axis={axis}): {result!r} != {expected!r}")
+    finally:
+        threaded.set_threading_threshold(threshold)
+    return failures
+
+def main(argv : List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", nargs="+", type=int, default=[10000, 1000000, 10000000], help="Elements per array")
+    parser.add_argument("--num-threads", type=int, default=None, help="Threads of the threaded backend (default: XBARRAY_NUM_THREADS or the CPU count)")
+    parser.add_argument("--threshold", type=int, default=None, help="Minimum elements per thread (default: DEFAULT_THREADING_THRESHOLD)")
+    parser.add_argument("--number", type=int, default=5, help="Calls per timing")
+    parser.add_argument("--check", action="store_true", help="Check that the threaded results match the plain ones first")
+    args = parser.parse_args(argv)
+
+    from xbarray.backends.numpy import NumpyComputeBackend
+    from xbarray.backends.numpy_threaded import ThreadedNumpyComputeBackend
+    if args.num_threads is not None:
+        ThreadedNumpyComputeBackend.set_num_threads(args.num_threads)
+    if args.threshold is not None:
+        ThreadedNumpyComputeBackend.set_threading_threshold(args.threshold)
+    print(f"threads: {ThreadedNumpyComputeBackend.get_num_threads()}, threshold: {ThreadedNumpyComputeBackend.get_threading_threshold()}")
+    if args.check:
+        failures = check(NumpyComputeBackend, ThreadedNumpyComputeBackend)
+        print("check: " + ("ok" if len(failures) == 0 else "failed"))
+        for failure in failures:
+            print(f"  {failure}")
+
+    header = f"{'operation':<20} {'size':>9} {'numpy (ms)':>11} {'threaded (ms)':>14} {'speedup':>8}"
+    print(header)
+    print("-" * len(header))
+    for size in args.sizes:
+        plain = operations(NumpyComputeBackend, size, np.random.default_rng(0))
+        threaded = operations(ThreadedNumpyComputeBackend, size, np.random.default_rng(0))
+        for name in plain:
+            timings : Tuple[float, float] = tuple(
+                min(timeit.repeat(fn, number=args.number, repeat=3)) / args.number
+                for fn in (plain[name], threaded[name])
+            )
+            print(f"{name:<20} {size:>9} {timings[0] * 1e3:>11.3f} {timings[1] * 1e3:>14.3f} {timings[0] / timings[1]:>7.2f}x")
+
+if __name__ == "__main__":
+    main()
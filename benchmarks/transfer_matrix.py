@@ -0,0 +1,84 @@
+"""
+Cross-backend transfer matrix.
+
+For every installed (source, target) backend pair and a set of dtypes / layouts, reports which transfer path
+`from_other_backend_with_info` picks, whether the transfer was zero-copy, and the median time per transfer.
+
+Usage:
+    python benchmarks/transfer_matrix.py [--size 1000000] [--repeat 20]
+"""
+from typing import Any, Callable, Dict, List, Tuple
+import argparse
+import importlib
+import importlib.util
+import statistics
+import time
+
+BACKENDS = {
+    "numpy": ("numpy", "xbarray.backends.numpy", "NumpyComputeBackend"),
+    "pytorch": ("torch", "xbarray.backends.pytorch", "PytorchComputeBackend"),
+    "jax": ("jax", "xbarray.backends.jax", "JaxComputeBackend"),
+}
+DTYPES = ["float32", "float64", "bfloat16", "float16", "uint8", "uint16", "uint32", "uint64", "int64", "bool"]
+
+def load_backends() -> Dict[str, Any]:
+    backends = {}
+    for name, (framework, module, cls) in BACKENDS.items():
+        if importlib.util.find_spec(framework) is None:
+            continue
+        backends[name] = getattr(importlib.import_module(module), cls)
+    return backends
+
+def make_array(backend_name : str, dtype : str, size : int, contiguous : bool) -> Any:
+    import numpy as np
+    if backend_name == "numpy":
+        import ml_dtypes
+        np_dtype = np.dtype(getattr(ml_dtypes, dtype)) if hasattr(ml_dtypes, dtype) else np.dtype(dtype)
+        x = np.zeros((size // 2, 2), dtype=np_dtype)
+    elif backend_name == "pytorch":
+        import torch
+        x = torch.zeros((size // 2, 2), dtype=getattr(torch, dtype))
+    else:
+        import jax.numpy as jnp
+        x = jnp.zeros((size // 2, 2), dtype=getattr(jnp, dtype))
+    return x if contiguous else x.T
+
+def time_transfer(fn : Callable[[], Any], repeat : int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+def main(argv : List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=1_000_000, help="Number of elements per array")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    backends = load_backends()
+    header = f"{'source':<8} {'target':<8} {'dtype':<9} {'layout':<10} {'method':<9} {'zero-copy':<9} {'moved':<6} {'time (us)':>10}"
+    print(header)
+    print("-" * len(header))
+    for source_name, source in backends.items():
+        for target_name, target in backends.items():
+            if source_name == target_name:
+                continue
+            for dtype in DTYPES:
+                for contiguous in (True, False):
+                    layout = "contiguous" if contiguous else "strided"
+                    try:
+                        x = make_array(source_name, dtype, args.size, contiguous)
+                    except Exception:
+                        continue # dtype or layout not supported by the source backend
+                    try:
+                        _, info = target.from_other_backend_with_info(source, x)
+                    except Exception as e:
+                        print(f"{source_name:<8} {target_name:<8} {dtype:<9} {layout:<10} failed: {type(e).__name__}")
+                        continue
+                    elapsed = time_transfer(lambda: target.from_other_backend_with_info(source, x), args.repeat)
+                    print(f"{source_name:<8} {target_name:<8} {dtype:<9} {layout:<10} {info.method:<9} {str(info.zero_copy):<9} {str(info.device_changed):<6} {elapsed * 1e6:>10.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,60 @@
-from typing import Type, Generic
+from typing import Type, Generic, Any, List
+from types import ModuleType
 from .base import BArrayType, BDeviceType, BDtypeType, BRNGType
+from ._implementations._common.lazy import LAZY_BINDING
+
+# Private names of the implementation module that are still exposed on the backend class
+EXPOSED_PRIVATE_NAMES = (
+    '__array_namespace_info__',
+    '__array_api_version__',
+)
+
+def _is_exposed_name(name : str) -> bool:
+    return not name.startswith('_') or name in EXPOSED_PRIVATE_NAMES
 
 class ComputeBackendImplCls(Generic[BArrayType, BDeviceType, BDtypeType, BRNGType], Type):
+    """
+    Metaclass of the concrete compute backends.
+    A backend class declares its implementation module as `_impl_module`,
+    and every public name of that module is resolved on first access and then cached on the class.
+    """
+    def __getattr__(cls, name : str) -> Any:
+        # Only called when the normal lookup fails
+        # The class dicts are read directly (not through `type.__getattribute__`) so that torch.compile can trace the lookup
+        impl_module = next((klass.__dict__['_impl_module'] for klass in cls.__mro__ if '_impl_module' in klass.__dict__), None)
+        if not _is_exposed_name(name) or impl_module is None:
+            raise AttributeError(f"type object {cls.__name__!r} has no attribute {name!r}")
+        try:
+            value = getattr(impl_module, name)
+        except AttributeError:
+            raise AttributeError(f"type object {cls.__name__!r} has no attribute {name!r}") from None
+        setattr(cls, name, value)
+        return value
+
+    def __dir__(cls) -> List[str]:
+        names = set(type.__dir__(cls))
+        impl_module = vars(cls).get('_impl_module')
+        if impl_module is not None:
+            names.update(name for name in dir(impl_module) if _is_exposed_name(name))
+        return sorted(names)
+
     def __str__(self):
         return self.simplified_name
     
     def __repr__(self):
-        return self.simplified_name
\ No newline at end of file
+        return self.simplified_name
+
+def bind_impl_module(backend_cls : ComputeBackendImplCls) -> None:
+    """
+    Resolve all public names of the implementation module of `backend_cls` onto the class.
+    This is a no-op in lazy binding mode, where the names are resolved on first access instead.
+    """
+    if LAZY_BINDING:
+        return
+    impl_module : ModuleType = vars(backend_cls)['_impl_module']
+    for name in dir(impl_module):
+        if _is_exposed_name(name):
+            try:
+                setattr(backend_cls, name, getattr(impl_module, name))
+            except AttributeError:
+                pass
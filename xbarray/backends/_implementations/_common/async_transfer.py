@@ -0,0 +1,103 @@
+from typing import Any, Callable, Iterable, Iterator, Optional
+from concurrent.futures import ThreadPoolExecutor
+import collections
+import threading
+
+__all__ = [
+    "TransferFuture",
+    "completed_transfer",
+    "submit_host_transfer",
+    "get_prefetch_function",
+]
+
+class TransferFuture:
+    """
+    Handle of a device transfer started by `async_to_device`.
+    The transfer runs in the background until `result()` is called, which waits for it and returns the transferred data.
+    """
+    __slots__ = ("_func_done", "_func_wait", "_value", "_finished")
+
+    def __init__(
+        self,
+        func_done : Callable[[], bool],
+        func_wait : Callable[[], Any],
+    ):
+        """
+        Args:
+            func_done: Non-blocking check of whether the transfer has completed.
+            func_wait: Blocks until the transfer has completed and returns the transferred data.
+        """
+        self._func_done = func_done
+        self._func_wait = func_wait
+        self._value = None
+        self._finished = False
+
+    def done(self) -> bool:
+        """
+        Whether the transfer has completed, without blocking.
+        """
+        return self._finished or self._func_done()
+
+    def result(self) -> Any:
+        """
+        Wait for the transfer to complete and return the transferred data.
+        """
+        if not self._finished:
+            self._value = self._func_wait()
+            self._finished = True
+            self._func_done = self._func_wait = None # release references to the source data
+        return self._value
+
+    def __repr__(self) -> str:
+        return f"TransferFuture(done={self.done()})"
+
+def completed_transfer(value : Any) -> TransferFuture:
+    """
+    A `TransferFuture` for a transfer that already completed synchronously.
+    """
+    future = TransferFuture(func_done=lambda: True, func_wait=lambda: value)
+    future.result()
+    return future
+
+# A single background thread plays the role of the copy engine for transfers without native asynchronous support,
+# so CPU-only setups go through the same overlapping code path as GPU transfers.
+_host_executor : Optional[ThreadPoolExecutor] = None
+_host_executor_lock = threading.Lock()
+
+def submit_host_transfer(func_transfer : Callable[[], Any]) -> TransferFuture:
+    """
+    Run `func_transfer` on the background transfer thread and return a `TransferFuture` of its result.
+    """
+    global _host_executor
+    if _host_executor is None:
+        with _host_executor_lock:
+            if _host_executor is None:
+                _host_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="xbarray-transfer")
+    future = _host_executor.submit(func_transfer)
+    return TransferFuture(func_done=future.done, func_wait=future.result)
+
+def get_prefetch_function(
+    async_to_device : Callable[..., TransferFuture],
+):
+    def prefetch(
+        iterable : Iterable[Any],
+        device : Any,
+        /,
+        *,
+        buffer_size : int = 2,
+        stream : Optional[Any] = None,
+    ) -> Iterator[Any]:
+        """
+        Iterate over `iterable` (e.g. batches from a data loader) with every item moved to `device`.
+        The transfers of the next `buffer_size` items are started ahead of time, so that they overlap with the computation on the current item.
+        """
+        if buffer_size < 1:
+            raise ValueError(f"buffer_size must be at least 1, got {buffer_size}.")
+        pending = collections.deque()
+        for item in iterable:
+            pending.append(async_to_device(item, device, stream=stream))
+            if len(pending) > buffer_size:
+                yield pending.popleft().result()
+        while len(pending) > 0:
+            yield pending.popleft().result()
+    return prefetch
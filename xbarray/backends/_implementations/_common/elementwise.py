@@ -0,0 +1,16 @@
+from typing import Tuple
+
+__all__ = [
+    "ELEMENTWISE_FUNCTIONS",
+]
+
+# Functions of the array API applied elementwise with broadcasting (fused by the deferred backend, split across threads by the threaded NumPy one)
+ELEMENTWISE_FUNCTIONS : Tuple[str, ...] = (
+    "abs", "acos", "acosh", "add", "asin", "asinh", "atan", "atan2", "atanh", "astype",
+    "bitwise_and", "bitwise_invert", "bitwise_left_shift", "bitwise_or", "bitwise_right_shift", "bitwise_xor",
+    "ceil", "clip", "conj", "copysign", "cos", "cosh", "divide", "equal", "exp", "expm1", "floor", "floor_divide",
+    "greater", "greater_equal", "hypot", "imag", "isclose", "isfinite", "isinf", "isnan", "less", "less_equal",
+    "log", "log1p", "log2", "log10", "logaddexp", "logical_and", "logical_not", "logical_or", "logical_xor",
+    "maximum", "minimum", "multiply", "negative", "not_equal", "positive", "pow", "real", "remainder", "round",
+    "sign", "signbit", "sin", "sinc", "sinh", "square", "sqrt", "subtract", "tan", "tanh", "trunc", "where",
+)
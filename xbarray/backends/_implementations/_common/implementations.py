@@ -1,71 +1,141 @@
-from typing import Any, Union, Callable, Mapping, Sequence
+from typing import Any, Union, Callable, Optional, Dict, List, Sequence, Tuple
+import math
 from array_api_typing.typing_compat import ArrayAPINamespace as CompatNamespace, ArrayAPIArray as CompatArray, ArrayAPIDType as CompatDType
-import array_api_compat
-import dataclasses
 
 __all__ = [
     "get_abbreviate_array_function",
-    "get_map_fn_over_arrays_function",
+    "get_map_fn_over_arrays_batched_function",
 ]
 
+# Maximum number of distinct group layouts whose compiled unpack functions are cached per backend
+MAX_CACHED_LAYOUTS = 1024
+
 def get_abbreviate_array_function(
     backend : CompatNamespace[CompatArray, Any, Any],
-    default_integer_dtype : CompatDType,
+    func_to_numpy : Callable[[CompatArray], Any],
     func_dtype_is_real_floating : Callable[[CompatDType], bool],
     func_dtype_is_real_integer : Callable[[CompatDType], bool],
     func_dtype_is_boolean : Callable[[CompatDType], bool],
+    func_compile : Optional[Callable[[Callable], Callable]] = None,
 ):
+    """
+    Build the `abbreviate_array` function of a backend.
+
+    Args:
+        backend: The array-api-compatible namespace of the backend.
+        func_to_numpy: Converts a backend array to a numpy array, this is the only device -> host synchronization point.
+        func_compile: Optionally compiles the on-device summary computation (e.g. `jax.jit`).
+    """
+    def abbreviation_summary(array : CompatArray) -> CompatArray:
+        """
+        For each axis, whether the array is constant along it, followed by the first element of the array.
+        Everything is packed into a single 1D array of the array's dtype so that it can be fetched with one transfer.
+        """
+        ndim = len(array.shape)
+        parts = []
+        for dim_i in range(ndim):
+            first_slice = array[(slice(None),) * dim_i + (slice(0, 1),)]
+            parts.append(backend.astype(backend.all(array == first_slice), array.dtype))
+        parts.append(array[(0,) * ndim])
+        return backend.stack(parts)
+
+    if func_compile is not None:
+        abbreviation_summary = func_compile(abbreviation_summary)
+
     def abbreviate_array(array : CompatArray, try_cast_scalar : bool = True) -> Union[float, int, CompatArray]:
         """
         Abbreivates an array to a single element if possible.
         Or, if some dimensions are the same, abbreviates to a smaller array (but with the same number of dimensions).
         """
-        abbr_array = array
-        idx = backend.zeros(1, dtype=default_integer_dtype, device=array_api_compat.device(abbr_array))
-        for dim_i in range(len(array.shape)):
-            first_elem = backend.take(abbr_array, idx, axis=dim_i)
-            if backend.all(abbr_array == first_elem):
-                abbr_array = first_elem
+        # An axis can be collapsed iff the array is constant along it, independently of the other axes,
+        # so all axes are checked in one pass and fetched to the host at once.
+        if any(i == 0 for i in array.shape):
+            return array
+        summary = func_to_numpy(abbreviation_summary(array))
+        collapsible = [bool(flag) for flag in summary[:-1]]
+        if try_cast_scalar and all(collapsible):
+            elem = summary[-1]
+            if func_dtype_is_real_floating(array.dtype):
+                return float(elem)
+            elif func_dtype_is_real_integer(array.dtype):
+                return int(elem)
+            elif func_dtype_is_boolean(array.dtype):
+                return bool(elem)
             else:
-                continue
-        if try_cast_scalar:
-            if all(i == 1 for i in abbr_array.shape):
-                elem = abbr_array[tuple([0] * len(abbr_array.shape))]
-                if func_dtype_is_real_floating(elem.dtype):
-                    return float(elem)
-                elif func_dtype_is_real_integer(elem.dtype):
-                    return int(elem)
-                elif func_dtype_is_boolean(elem.dtype):
-                    return bool(elem)
-                else:
-                    raise ValueError(f"Abbreviated array element dtype must be a real floating or integer or boolean type, actual dtype: {elem.dtype}")
-        else:
+                raise ValueError(f"Abbreviated array element dtype must be a real floating or integer or boolean type, actual dtype: {array.dtype}")
+        if not any(collapsible):
             return array
+        return array[tuple(slice(0, 1) if collapse else slice(None) for collapse in collapsible)]
     return abbreviate_array
 
-def get_map_fn_over_arrays_function(
-    is_backendarray : Callable[[Any], bool],
+def get_map_fn_over_arrays_batched_function(
+    backend : CompatNamespace[CompatArray, Any, Any],
+    func_device : Callable[[CompatArray], Any],
+    func_tree_flatten : Callable[[Any], Tuple[List[CompatArray], Any]],
+    func_tree_unflatten : Callable[[Any, Sequence[CompatArray]], Any],
+    func_compile : Optional[Callable[[Callable], Callable]] = None,
 ):
-    def map_fn_over_arrays(data : Any, func : Callable[[CompatArray], CompatArray]) -> Any:
+    """
+    Build the `map_fn_over_arrays_batched` function of a backend.
+
+    Args:
+        backend: The array-api-compatible namespace of the backend.
+        func_device: Returns the device of a backend array.
+        func_tree_flatten / func_tree_unflatten: The tree utilities of the backend.
+        func_compile: Optionally compiles the packing / unpacking of each group (e.g. `jax.jit`),
+            for backends where every eager reshape and slice is a separate dispatch.
+    """
+    def eager_pack(*arrays : CompatArray) -> CompatArray:
+        return backend.concat([backend.reshape(array, (-1,)) for array in arrays], axis=0)
+
+    def eager_unpack(flat : CompatArray, shapes : Tuple[Tuple[int, ...], ...]) -> List[CompatArray]:
+        ret = []
+        offset = 0
+        for shape in shapes:
+            size = math.prod(shape)
+            ret.append(backend.reshape(flat[offset:offset + size], shape))
+            offset += size
+        return ret
+
+    if func_compile is None:
+        pack, unpack = eager_pack, eager_unpack
+    else:
+        # Compiled functions specialize on the input shapes anyway, so one compiled unpack is cached per group layout
+        pack = func_compile(eager_pack)
+        compiled_unpack_cache : Dict[Tuple[Tuple[int, ...], ...], Callable[[CompatArray], List[CompatArray]]] = {}
+        def unpack(flat : CompatArray, shapes : Tuple[Tuple[int, ...], ...]) -> List[CompatArray]:
+            compiled_unpack = compiled_unpack_cache.get(shapes)
+            if compiled_unpack is None:
+                if len(compiled_unpack_cache) >= MAX_CACHED_LAYOUTS:
+                    compiled_unpack_cache.clear()
+                compiled_unpack = func_compile(lambda flat: eager_unpack(flat, shapes))
+                compiled_unpack_cache[shapes] = compiled_unpack
+            return compiled_unpack(flat)
+
+    def map_fn_over_arrays_batched(data : Any, func : Callable[[CompatArray], CompatArray]) -> Any:
         """
-        Map a function to the data.
+        Map an elementwise function over the arrays in a data structure with as few calls to `func` as possible.
+        Arrays with the same dtype and device are flattened and concatenated into one buffer, `func` is applied once per buffer,
+        and the result is split back into arrays of the original shapes.
+
+        `func` must be elementwise (output shape == input shape, the dtype / device may change), e.g. a dtype cast, scaling, clipping or a device transfer.
+        Arrays in the result may be views into the same buffer.
         """
-        if is_backendarray(data):
-            return func(data)
-        elif isinstance(data, Mapping):
-            ret = {k: map_fn_over_arrays(v, func) for k, v in data.items()}
-            try:
-                return type(data)(**ret)  # try to keep the same mapping type
-            except:
-                return ret
-        elif isinstance(data, Sequence):
-            ret = [map_fn_over_arrays(i, func) for i in data]
-            try:
-                return type(data)(ret)  # try to keep the same sequence type
-            except:
-                return ret
-        elif dataclasses.is_dataclass(data):
-            return type(data)(**map_fn_over_arrays(dataclasses.asdict(data), func))
-        else:
-            return data
-    return map_fn_over_arrays
+        leaves, treedef = func_tree_flatten(data)
+        groups : Dict[Tuple[Any, Any], List[int]] = {}
+        for leaf_i, leaf in enumerate(leaves):
+            groups.setdefault((leaf.dtype, func_device(leaf)), []).append(leaf_i)
+
+        new_leaves : List[Optional[CompatArray]] = [None] * len(leaves)
+        for leaf_idxs in groups.values():
+            if len(leaf_idxs) == 1:
+                new_leaves[leaf_idxs[0]] = func(leaves[leaf_idxs[0]])
+                continue
+            flat = pack(*[leaves[i] for i in leaf_idxs])
+            flat_out = func(flat)
+            if tuple(flat_out.shape) != tuple(flat.shape):
+                raise ValueError(f"map_fn_over_arrays_batched requires an elementwise function, got output shape {flat_out.shape} for input shape {flat.shape}.")
+            for i, out in zip(leaf_idxs, unpack(flat_out, tuple(tuple(leaves[i].shape) for i in leaf_idxs))):
+                new_leaves[i] = out
+        return func_tree_unflatten(treedef, new_leaves)
+    return map_fn_over_arrays_batched
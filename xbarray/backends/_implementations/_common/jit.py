@@ -0,0 +1,243 @@
+"""
+Backend-generic compilation of functions (`backend.jit`).
+
+A compiled function specializes on its signature: the structure of its arguments, the shapes / dtypes / devices of
+their arrays, their other (non-array) values and the values of the static arguments. Every call with a new signature
+traces and compiles the function again, which `JitFunction` counts as a cache miss (a hit otherwise).
+With `bucket_sizes`, the batch (leading) axis of the arguments is padded up to a few bucket sizes before the call,
+and the outputs are sliced back, so that varying batch sizes only compile once per bucket.
+"""
+from typing import Any, Callable, Hashable, List, Optional, Sequence, Set, Tuple, Union
+import dataclasses
+import functools
+import inspect
+from array_api_typing.typing_compat import ArrayAPINamespace as CompatNamespace, ArrayAPIArray as CompatArray
+
+__all__ = [
+    "JitCacheInfo",
+    "JitFunction",
+    "get_jit_function",
+]
+
+# `bucket_sizes` value padding batch sizes up to the next power of two
+POW2_BUCKETS = "pow2"
+
+@dataclasses.dataclass(frozen=True)
+class JitCacheInfo:
+    """
+    Cache statistics of a `JitFunction`.
+
+    Attributes:
+        hits: Number of calls with an already seen signature.
+        misses: Number of calls with a new signature, each of which traced and compiled the function.
+        signatures: Number of distinct signatures seen.
+    """
+    hits : int
+    misses : int
+    signatures : int
+
+def _value_key(value : Any) -> Hashable:
+    try:
+        hash(value)
+    except TypeError:
+        # Unhashable values can only be told apart by identity
+        return (type(value), id(value))
+    return (type(value), value)
+
+class JitFunction:
+    """
+    A function compiled by `backend.jit`, called like the original function.
+    """
+    def __init__(
+        self,
+        fn : Callable,
+        compile_fn : Callable[[], Callable],
+        backend : CompatNamespace[CompatArray, Any, Any],
+        func_device : Callable[[CompatArray], Any],
+        func_tree_flatten : Callable[[Any], Tuple[List[CompatArray], Any]],
+        func_tree_map : Callable[..., Any],
+        static_argnames : Tuple[str, ...],
+        bucket_sizes : Optional[Union[str, Sequence[int]]],
+        batch_argnames : Optional[Tuple[str, ...]],
+        trace_python_scalars : bool,
+        func_compile_padding : Optional[Callable[[Callable], Callable]] = None,
+    ) -> None:
+        self._fn = fn
+        self._compile_fn = compile_fn
+        self._compiled = compile_fn()
+        self._backend = backend
+        self._func_device = func_device
+        self._func_tree_flatten = func_tree_flatten
+        self._func_tree_map = func_tree_map
+        self._signature = inspect.signature(fn)
+        self.static_argnames = static_argnames
+        self.bucket_sizes = bucket_sizes
+        self.batch_argnames = batch_argnames
+        self._trace_python_scalars = trace_python_scalars
+        self._pad_fn = self._pad if func_compile_padding is None else func_compile_padding(self._pad)
+        self._seen : Set[Hashable] = set()
+        self._hits = 0
+        self._misses = 0
+        functools.update_wrapper(self, fn)
+
+    def cache_info(self) -> JitCacheInfo:
+        return JitCacheInfo(hits=self._hits, misses=self._misses, signatures=len(self._seen))
+
+    def cache_clear(self) -> None:
+        """
+        Reset the statistics and drop the compiled function, the next calls compile it again.
+        """
+        self._compiled = self._compile_fn()
+        self._seen = set()
+        self._hits = 0
+        self._misses = 0
+
+    def bucket_size(self, batch_size : int) -> int:
+        """
+        The batch size `batch_size` is padded to.
+        """
+        if self.bucket_sizes is None or batch_size == 0:
+            return batch_size
+        if self.bucket_sizes == POW2_BUCKETS:
+            return 1 << (batch_size - 1).bit_length()
+        for size in self.bucket_sizes:
+            if batch_size <= size:
+                return size
+        # Beyond the largest bucket, to the next multiple of it
+        largest = self.bucket_sizes[-1]
+        return -(-batch_size // largest) * largest
+
+    def _pad(self, array : CompatArray, padded_size : int) -> CompatArray:
+        # Repeating the last row keeps the padding in the domain of the function (no 0 / 0 for zero padding)
+        num_padding = padded_size - array.shape[0]
+        padding = self._backend.broadcast_to(array[-1:], (num_padding,) + tuple(array.shape[1:]))
+        return self._backend.concat([array, padding], axis=0)
+
+    def _leaves_key(self, value : Any) -> Hashable:
+        leaves, treedef = self._func_tree_flatten(value)
+        statics = tuple(
+            type(static) if self._trace_python_scalars and isinstance(static, (bool, int, float, complex)) else _value_key(static)
+            for static in treedef.statics
+        )
+        return (
+            treedef.structure,
+            statics,
+            tuple((tuple(leaf.shape), leaf.dtype, self._func_device(leaf)) for leaf in leaves),
+        )
+
+    def __call__(self, *args : Any, **kwargs : Any) -> Any:
+        bound = self._signature.bind(*args, **kwargs)
+        arguments = bound.arguments
+
+        batch_size = padded_size = None
+        if self.bucket_sizes is not None:
+            batch_names = [
+                name for name in (arguments if self.batch_argnames is None else self.batch_argnames)
+                if name in arguments and name not in self.static_argnames
+            ]
+            batch_sizes = {
+                leaf.shape[0]
+                for name in batch_names
+                for leaf in self._func_tree_flatten(arguments[name])[0]
+                if len(leaf.shape) > 0
+            }
+            if len(batch_sizes) > 1:
+                raise ValueError(f"The batched arguments {batch_names} have different batch sizes {sorted(batch_sizes)}, set batch_argnames.")
+            if len(batch_sizes) == 1:
+                batch_size = batch_sizes.pop()
+                padded_size = self.bucket_size(batch_size)
+            if padded_size is not None and padded_size != batch_size:
+                for name in batch_names:
+                    arguments[name] = self._func_tree_map(
+                        lambda leaf: self._pad_fn(leaf, padded_size) if len(leaf.shape) > 0 else leaf,
+                        arguments[name],
+                    )
+
+        key = tuple(
+            (name, _value_key(value)) if name in self.static_argnames else (name, self._leaves_key(value))
+            for name, value in arguments.items()
+        )
+        if key in self._seen:
+            self._hits += 1
+        else:
+            self._seen.add(key)
+            self._misses += 1
+
+        out = self._compiled(*bound.args, **bound.kwargs)
+        if padded_size is not None and padded_size != batch_size:
+            out = self._func_tree_map(
+                lambda leaf: leaf[:batch_size] if len(leaf.shape) > 0 and leaf.shape[0] == padded_size else leaf,
+                out,
+            )
+        return out
+
+    def __repr__(self) -> str:
+        return f"JitFunction({self._fn!r}, static_argnames={self.static_argnames!r}, bucket_sizes={self.bucket_sizes!r})"
+
+def get_jit_function(
+    backend : CompatNamespace[CompatArray, Any, Any],
+    func_device : Callable[[CompatArray], Any],
+    func_tree_flatten : Callable[[Any], Tuple[List[CompatArray], Any]],
+    func_tree_map : Callable[..., Any],
+    func_compile : Optional[Callable[..., Callable]] = None,
+    trace_python_scalars : bool = False,
+    func_compile_padding : Optional[Callable[[Callable], Callable]] = None,
+):
+    """
+    Build the `jit` function of a backend.
+
+    Args:
+        backend: The array-api-compatible namespace of the backend.
+        func_device: Returns the device of a backend array.
+        func_tree_flatten / func_tree_map: The tree utilities of the backend.
+        func_compile: Compiles a function, called as `func_compile(fn, static_argnames, **compile_kwargs)`,
+            None for backends without a compiler (the function is called as is).
+        trace_python_scalars: Whether the compiler traces Python scalars (new values do not recompile) instead of specializing on them.
+        func_compile_padding: Optionally compiles the padding of the batched arguments, called with a function of (array, padded size),
+            for backends where every eager op on a new shape is compiled (one compilation per input shape instead of several).
+    """
+    def jit(
+        fn : Callable,
+        /,
+        *,
+        static_argnames : Union[str, Sequence[str]] = (),
+        bucket_sizes : Optional[Union[str, Sequence[int]]] = None,
+        batch_argnames : Optional[Union[str, Sequence[str]]] = None,
+        **compile_kwargs : Any,
+    ) -> JitFunction:
+        """
+        Compile a function written against the backend, see `ComputeBackend.jit`.
+        """
+        static_argnames = (static_argnames,) if isinstance(static_argnames, str) else tuple(static_argnames)
+        batch_argnames = (batch_argnames,) if isinstance(batch_argnames, str) else (None if batch_argnames is None else tuple(batch_argnames))
+        parameters = inspect.signature(fn).parameters
+        for name in static_argnames + (batch_argnames or ()):
+            if name not in parameters:
+                raise ValueError(f"{name!r} is not an argument of {getattr(fn, '__name__', fn)!r}, expected some of {list(parameters.keys())}.")
+        if isinstance(bucket_sizes, str):
+            if bucket_sizes != POW2_BUCKETS:
+                raise ValueError(f"Unknown bucket_sizes {bucket_sizes!r}, expected {POW2_BUCKETS!r} or a sequence of sizes.")
+        elif bucket_sizes is not None:
+            bucket_sizes = tuple(sorted(int(size) for size in bucket_sizes))
+            if len(bucket_sizes) == 0 or bucket_sizes[0] < 1:
+                raise ValueError(f"bucket_sizes must be positive sizes, got {bucket_sizes}.")
+        if func_compile is None:
+            if len(compile_kwargs) > 0:
+                raise ValueError(f"The {getattr(backend, '__name__', 'backend')} backend does not compile, got compile arguments {list(compile_kwargs.keys())}.")
+            compile_fn = lambda: fn
+        else:
+            compile_fn = lambda: func_compile(fn, static_argnames, **compile_kwargs)
+        return JitFunction(
+            fn,
+            compile_fn,
+            backend=backend,
+            func_device=func_device,
+            func_tree_flatten=func_tree_flatten,
+            func_tree_map=func_tree_map,
+            static_argnames=static_argnames,
+            bucket_sizes=bucket_sizes,
+            batch_argnames=batch_argnames,
+            trace_python_scalars=trace_python_scalars,
+            func_compile_padding=func_compile_padding,
+        )
+    return jit
@@ -0,0 +1,72 @@
+from typing import Any, Dict, List
+from types import ModuleType
+from functools import partial
+import os
+
+__all__ = [
+    "LAZY_BINDING",
+    "ARRAY_API_EXTRA_UNBOUND_NAMES",
+    "array_api_extra_names",
+    "bind_array_api_extra",
+    "install_array_api_extra",
+]
+
+# Set `XBARRAY_LAZY_BINDING=0` to resolve every backend function at import time (the legacy behavior).
+LAZY_BINDING = os.environ.get("XBARRAY_LAZY_BINDING", "1").strip().lower() not in ("0", "false", "no", "off")
+
+# Functions in array_api_extra that are exposed as-is instead of being bound to the backend namespace
+ARRAY_API_EXTRA_UNBOUND_NAMES = ("at", "broadcast_shapes")
+
+def array_api_extra_names() -> List[str]:
+    import array_api_extra
+    names = getattr(array_api_extra, "__all__", None)
+    if names is None:
+        names = dir(array_api_extra)
+    return [name for name in names if not name.startswith('_')]
+
+def bind_array_api_extra(name : str, compat_module : ModuleType) -> Any:
+    """
+    Bind a single function from array_api_extra to the given array-api-compatible namespace.
+    Names that are not callable (e.g. the `testing` submodule) are exposed as-is.
+    """
+    import array_api_extra
+    fn = getattr(array_api_extra, name)
+    if name in ARRAY_API_EXTRA_UNBOUND_NAMES or not callable(fn):
+        return fn
+    return partial(fn, xp=compat_module)
+
+def install_array_api_extra(
+    module_globals : Dict[str, Any],
+    compat_module : ModuleType,
+) -> None:
+    """
+    Expose all functions from array_api_extra in a backend implementation module.
+    Functions from array_api_extra take precedence over the ones already imported from the compat namespace.
+
+    In lazy binding mode, a module-level `__getattr__` (PEP 562) is installed so that the functions are only bound on first access,
+    and then cached in the module globals.
+    In eager binding mode, every function is bound immediately.
+    """
+    names = array_api_extra_names()
+    if not LAZY_BINDING:
+        for name in names:
+            module_globals[name] = bind_array_api_extra(name, compat_module)
+        return
+
+    for name in names:
+        module_globals.pop(name, None)
+
+    extra_names = frozenset(names)
+    module_name = module_globals["__name__"]
+    def __getattr__(name : str) -> Any:
+        if name not in extra_names:
+            raise AttributeError(f"module {module_name!r} has no attribute {name!r}")
+        value = bind_array_api_extra(name, compat_module)
+        module_globals[name] = value
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(module_globals.keys()) | extra_names)
+
+    module_globals["__getattr__"] = __getattr__
+    module_globals["__dir__"] = __dir__
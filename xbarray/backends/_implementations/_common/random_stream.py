@@ -0,0 +1,312 @@
+from typing import Any, List, Optional, Sequence, Tuple, Union
+from types import ModuleType
+import importlib
+import math
+import secrets
+import numpy as np
+from array_api_compat import to_device as compat_to_device
+
+__all__ = [
+    "DEFAULT_BUFFER_SIZE",
+    "philox4x32",
+    "RandomStream",
+    "RandomStreamBatch",
+]
+
+# Number of 32-bit random words generated at once into the buffer of a stream
+DEFAULT_BUFFER_SIZE = 1 << 16
+
+_MASK32 = 0xFFFFFFFF
+_PHILOX_M0 = 0xD2511F53
+_PHILOX_M1 = 0xCD9E8D57
+_PHILOX_W0 = 0x9E3779B9
+_PHILOX_W1 = 0xBB67AE85
+
+# Values of the third counter word, so that key derivations never collide with the counters of the random words
+_DOMAIN_DATA = 0
+_DOMAIN_FOLD_IN = 1
+_DOMAIN_SPLIT = 2
+
+def philox4x32(c0 : Any, c1 : Any, c2 : Any, c3 : Any, k0 : int, k1 : int, rounds : int = 10) -> Tuple[Any, Any, Any, Any]:
+    """
+    The Philox4x32 counter-based generator (Salmon et al., "Parallel random numbers: as easy as 1, 2, 3").
+    The counter words can be Python ints or int64 arrays of any backend (32-bit values stored in int64, products are allowed to wrap around),
+    the key words are Python ints. Returns the 4 output words in the same representation as the counter.
+    """
+    for _ in range(rounds):
+        p0 = c0 * _PHILOX_M0
+        p1 = c2 * _PHILOX_M1
+        c0, c1, c2, c3 = (
+            ((p1 >> 32) & _MASK32) ^ c1 ^ k0,
+            p1 & _MASK32,
+            ((p0 >> 32) & _MASK32) ^ c3 ^ k1,
+            p0 & _MASK32,
+        )
+        k0 = (k0 + _PHILOX_W0) & _MASK32
+        k1 = (k1 + _PHILOX_W1) & _MASK32
+    return c0, c1, c2, c3
+
+def _derive_key(key : Tuple[int, int], domain : int, data : int) -> Tuple[int, int]:
+    data &= (1 << 64) - 1
+    out = philox4x32(data & _MASK32, data >> 32, domain, 0, key[0], key[1])
+    return (out[0], out[1])
+
+def _seed_to_key(seed : Optional[int]) -> Tuple[int, int]:
+    if seed is None:
+        seed = secrets.randbits(64)
+    seed = int(seed)
+    if seed < 0:
+        raise ValueError(f"Seed must be non-negative, got {seed}.")
+    key = (seed & _MASK32, (seed >> 32) & _MASK32)
+    seed >>= 64
+    while seed > 0: # fold the bits of wider seeds into the key
+        key = _derive_key(key, _DOMAIN_FOLD_IN, seed)
+        seed >>= 64
+    return key
+
+class RandomStream:
+    """
+    A counter-based random stream for the numpy and pytorch backends, usable everywhere an `rng` is accepted.
+
+    The i-th 32-bit random word of a stream is `philox4x32(i // 4, key)[i % 4]`, so a stream is fully determined by its 64-bit key and
+    its position: it produces the same random bits on every backend and device, `split` / `fold_in` derive independent streams
+    without any seed bookkeeping (e.g. `stream.fold_in(worker_id)` in each worker process), and random words are generated
+    `buffer_size` at a time into a buffer that many small draws are served from.
+
+    Like `jax.random.split` / `jax.random.fold_in`, `split` and `fold_in` only depend on the key, not on the position of the stream.
+    Sampling advances the position (the stream is returned as the new `rng`).
+    """
+    def __init__(
+        self,
+        backend : ModuleType,
+        seed : Optional[int] = None,
+        *,
+        device : Any = None,
+        buffer_size : int = DEFAULT_BUFFER_SIZE,
+        key : Optional[Tuple[int, int]] = None,
+    ):
+        """
+        Args:
+            backend: The array-api-compatible namespace the arrays are generated with.
+            seed: Seed of the stream, ignored if `key` is given. A random seed is drawn if both are None.
+            device: Device the arrays are generated on.
+            buffer_size: Number of 32-bit words generated at once, draws of at least this size bypass the buffer.
+            key: The two 32-bit key words of the stream.
+        """
+        if buffer_size < 4 or buffer_size % 4 != 0:
+            raise ValueError(f"buffer_size must be a positive multiple of 4, got {buffer_size}.")
+        self.backend = backend
+        self.device = device
+        self.buffer_size = int(buffer_size)
+        self.key = _seed_to_key(seed) if key is None else (int(key[0]) & _MASK32, int(key[1]) & _MASK32)
+        self.position = 0 # index of the next random word
+        self._batch_shape : Tuple[int, ...] = ()
+        self._buffer = None
+        self._buffer_start = 0
+        self._uniform_cache = {} # float64 -> the buffer converted to uniform samples
+
+    def _with_key(self, key : Tuple[int, int]) -> "RandomStream":
+        return RandomStream(self.backend, device=self.device, buffer_size=self.buffer_size, key=key)
+
+    def split(self, n : int) -> List["RandomStream"]:
+        """
+        Derive `n` independent streams from this stream's key.
+        """
+        return [self._with_key(_derive_key(self.key, _DOMAIN_SPLIT, i)) for i in range(n)]
+
+    def fold_in(self, data : int) -> "RandomStream":
+        """
+        Derive a new stream from this stream's key and an integer (e.g. a worker id or a step index).
+        """
+        return self._with_key(_derive_key(self.key, _DOMAIN_FOLD_IN, int(data)))
+
+    def __reduce__(self):
+        # Streams are sent to worker processes as (backend name, key, position), the buffer is regenerated lazily
+        return (_rebuild_random_stream, (self.backend.__name__, self.device, self.buffer_size, self.key, self.position))
+
+    def __repr__(self) -> str:
+        return f"RandomStream(backend={self.backend.__name__}, key=0x{self.key[1]:08x}{self.key[0]:08x}, position={self.position}, device={self.device})"
+
+    # ========== Random words ==========
+
+    def _generate_words(self, start : int, n : int) -> Any:
+        """
+        Random words [start, start + n) of the stream as an int64 array of 32-bit values, of shape (*batch_shape, n).
+        """
+        xp = self.backend
+        first_block = start // 4
+        end_block = (start + n + 3) // 4
+        counters = xp.arange(first_block, end_block, dtype=xp.int64, device=self.device)
+        zeros = xp.zeros_like(counters) + _DOMAIN_DATA
+        words = philox4x32(counters & _MASK32, counters >> 32, zeros, zeros, self.key[0], self.key[1])
+        words = xp.reshape(xp.stack(words, axis=-1), self._batch_shape + (-1,))
+        offset = start - first_block * 4
+        return words[..., offset:offset + n]
+
+    def _reserve(self, num_words : int, align : int) -> Tuple[int, bool]:
+        """
+        Advance the stream by `num_words` words starting at a multiple of `align`,
+        and make sure they are in the buffer unless they do not fit in it. Returns (start word, whether it is buffered).
+        """
+        start = self.position
+        start += (-start) % align
+        self.position = start + num_words
+        if self._buffer is not None and self._buffer_start <= start and self.position <= self._buffer_start + self._buffer.shape[-1]:
+            return start, True
+        if num_words > self.buffer_size - start % 4:
+            return start, False
+        self._buffer_start = start - start % 4 # block-aligned, so float64 pairs are aligned too
+        self._buffer = self._generate_words(self._buffer_start, self.buffer_size)
+        self._uniform_cache = {}
+        return start, True
+
+    def _next_words(self, n : int) -> Any:
+        start, buffered = self._reserve(n, 1)
+        if not buffered:
+            return self._generate_words(start, n)
+        return self._buffer[..., start - self._buffer_start:start - self._buffer_start + n]
+
+    def _words_to_uniform01(self, words : Any, float64 : bool) -> Any:
+        xp = self.backend
+        if float64:
+            bits = (words[..., 0::2] >> 5) * (1 << 26) + (words[..., 1::2] >> 6)
+            return xp.astype(bits, xp.float64) * (1.0 / (1 << 53))
+        return xp.astype(words >> 8, xp.float32) * (1.0 / (1 << 24))
+
+    def _uniform01(self, n : int, float64 : bool) -> Any:
+        """
+        `n` uniform samples in [0, 1), with 53 random bits from two words (float64) or 24 random bits from one word (float32).
+        Buffered samples are sliced from uniforms converted once per buffer, callers must not modify them in place.
+        """
+        words_per_sample = 2 if float64 else 1
+        start, buffered = self._reserve(n * words_per_sample, words_per_sample)
+        if not buffered:
+            return self._words_to_uniform01(self._generate_words(start, n * words_per_sample), float64)
+        uniforms = self._uniform_cache.get(float64)
+        if uniforms is None:
+            uniforms = self._words_to_uniform01(self._buffer, float64)
+            self._uniform_cache[float64] = uniforms
+        offset = (start - self._buffer_start) // words_per_sample
+        return uniforms[..., offset:offset + n]
+
+    def _finalize(self, data : Any, shape : Union[int, Tuple[int, ...]], dtype : Any, device : Any) -> Any:
+        data = data.reshape(self._batch_shape + ((shape,) if isinstance(shape, int) else tuple(shape)))
+        if data.dtype != dtype:
+            data = self.backend.astype(data, dtype)
+        if device is not None and device != self.device:
+            data = compat_to_device(data, device)
+        return data
+
+    def _is_float64(self, dtype : Any) -> bool:
+        return dtype == self.backend.float64
+
+    # ========== Distributions ==========
+
+    def uniform(self, shape : Union[int, Tuple[int, ...]], low : float, high : float, dtype : Any, device : Any = None) -> Any:
+        u = self._uniform01(_size(shape), self._is_float64(dtype))
+        u = u * (float(high) - float(low)) # also copies the buffered samples
+        if low != 0.0:
+            u = u + float(low)
+        return self._finalize(u, shape, dtype, device)
+
+    def normal(self, shape : Union[int, Tuple[int, ...]], mean : float, std : float, dtype : Any, device : Any = None) -> Any:
+        # Box-Muller, both outputs of every pair are used
+        xp = self.backend
+        n = _size(shape)
+        half = (n + 1) // 2
+        u = self._uniform01(2 * half, self._is_float64(dtype))
+        radius = xp.sqrt(-2.0 * xp.log1p(-u[..., :half]))
+        theta = (2.0 * math.pi) * u[..., half:]
+        z = xp.concat([radius * xp.cos(theta), radius * xp.sin(theta)], axis=-1)[..., :n]
+        return self._finalize(z * float(std) + float(mean), shape, dtype, device)
+
+    def exponential(self, shape : Union[int, Tuple[int, ...]], lambd : float, dtype : Any, device : Any = None) -> Any:
+        u = self._uniform01(_size(shape), self._is_float64(dtype))
+        return self._finalize(-self.backend.log1p(-u) / float(lambd), shape, dtype, device)
+
+    def geometric(self, shape : Union[int, Tuple[int, ...]], p : float, dtype : Any, device : Any = None) -> Any:
+        # Number of trials until the first success, in {1, 2, ...}
+        xp = self.backend
+        u = self._uniform01(_size(shape), True)
+        log_q = math.log1p(-float(p)) if p < 1.0 else -math.inf
+        trials = xp.floor(xp.log1p(-u) / log_q) + 1.0
+        return self._finalize(trials, shape, dtype, device)
+
+    def discrete_uniform(self, shape : Union[int, Tuple[int, ...]], from_num : int, to_num : int, dtype : Any, device : Any = None) -> Any:
+        xp = self.backend
+        n = _size(shape)
+        num_values = int(to_num) - int(from_num)
+        if num_values <= 0:
+            raise ValueError(f"from_num must be smaller than to_num, got [{from_num}, {to_num}).")
+        if num_values <= (1 << 31):
+            # Multiply-shift (Lemire) on one 32-bit word, the product fits in int64
+            values = ((self._next_words(n) * num_values) >> 32) + int(from_num)
+        else:
+            values = xp.astype(xp.floor(self._uniform01(n, True) * float(num_values)), xp.int64) + int(from_num)
+        return self._finalize(values, shape, dtype, device)
+
+    def permutation(self, n : int, dtype : Any, device : Any = None) -> Any:
+        u = self._uniform01(int(n), True)
+        return self._finalize(self.backend.argsort(u, axis=-1), int(n), dtype, device)
+
+def _size(shape : Union[int, Tuple[int, ...]]) -> int:
+    return int(shape) if isinstance(shape, int) else math.prod(shape)
+
+def _rebuild_random_stream(backend_name : str, device : Any, buffer_size : int, key : Tuple[int, int], position : int) -> RandomStream:
+    stream = RandomStream(importlib.import_module(backend_name), device=device, buffer_size=buffer_size, key=key)
+    stream.position = position
+    return stream
+
+class RandomStreamBatch(RandomStream):
+    """
+    A batch of independent counter-based random streams (e.g. one per parallel environment), sampled in lockstep.
+    Every draw of shape `shape` returns an array of shape (batch_size, *shape) in one vectorized call,
+    whose i-th row is the same as the draw from the single stream with the i-th seed.
+    """
+    def __init__(
+        self,
+        backend : ModuleType,
+        seeds : Optional[Sequence[int]] = None,
+        *,
+        device : Any = None,
+        buffer_size : int = DEFAULT_BUFFER_SIZE,
+        keys : Optional[Tuple[Any, Any]] = None,
+    ):
+        """
+        Args:
+            backend: The array-api-compatible namespace the arrays are generated with.
+            seeds: Seeds of the streams in [0, 2**63), ignored if `keys` is given.
+            device: Device the arrays are generated on.
+            buffer_size: Number of 32-bit words generated at once for the whole batch.
+            keys: The two 32-bit key words of every stream, as int64 arrays of shape (batch_size, 1) on `device`.
+        """
+        if keys is None:
+            seeds_np = np.asarray(seeds, dtype=np.int64).reshape(-1, 1)
+            if np.any(seeds_np < 0):
+                raise ValueError("Seeds must be non-negative.")
+            keys = (
+                backend.asarray(seeds_np & _MASK32, device=device),
+                backend.asarray(seeds_np >> 32, device=device),
+            )
+        batch_size = keys[0].shape[0]
+        super().__init__(backend, device=device, buffer_size=max(4, int(buffer_size) // max(batch_size, 1) // 4 * 4), key=(0, 0))
+        self.key = keys
+        self.batch_size = batch_size
+        self._batch_shape = (batch_size,)
+
+    def _with_key(self, key : Tuple[Any, Any]) -> "RandomStreamBatch":
+        return RandomStreamBatch(self.backend, device=self.device, buffer_size=self.buffer_size * self.batch_size, keys=key)
+
+    def __reduce__(self):
+        return (_rebuild_random_stream_batch, (self.backend.__name__, self.device, self.buffer_size * self.batch_size, self.key, self.position))
+
+    def __repr__(self) -> str:
+        return f"RandomStreamBatch(backend={self.backend.__name__}, batch_size={self.batch_size}, position={self.position}, device={self.device})"
+
+    def __len__(self) -> int:
+        return self.batch_size
+
+def _rebuild_random_stream_batch(backend_name : str, device : Any, buffer_size : int, keys : Tuple[Any, Any], position : int) -> RandomStreamBatch:
+    stream = RandomStreamBatch(importlib.import_module(backend_name), device=device, buffer_size=buffer_size, keys=keys)
+    stream.position = position
+    return stream
@@ -0,0 +1,145 @@
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+from array_api_typing.typing_compat import ArrayAPIArray as CompatArray
+from xbarray.backends.base import ComputeBackend, TransferInfo
+
+__all__ = [
+    "TransferPath",
+    "BITCAST_INTEGER_DTYPE_NAMES",
+    "dtype_name",
+    "device_key",
+    "get_from_other_backend_with_info_function",
+]
+
+# A transfer path takes (other_backend, data) and returns the converted array, or raises if it is not applicable
+TransferPath = Callable[[ComputeBackend, Any], Any]
+
+# Dtypes that DLPack / NumPy cannot always describe, mapped to the integer dtype of the same width used to reinterpret them
+BITCAST_INTEGER_DTYPE_NAMES = {
+    "bfloat16": "int16",
+    "float8_e4m3fn": "uint8",
+    "float8_e5m2": "uint8",
+}
+
+def dtype_name(dtype : Any) -> str:
+    """
+    Backend-independent name of a dtype (e.g. both `torch.bfloat16` and `jax.numpy.bfloat16` map to "bfloat16").
+    """
+    name = getattr(dtype, "name", None)
+    if isinstance(name, str):
+        return name
+    name = str(dtype)
+    if name.startswith("torch."):
+        name = name[len("torch."):]
+    return name
+
+def device_key(device : Any) -> Tuple[str, int]:
+    """
+    Backend-independent (platform, index) of a device (e.g. both `torch.device("cuda:1")` and the JAX CUDA device 1 map to ("cuda", 1)).
+    """
+    platform = getattr(device, "type", None)
+    if isinstance(platform, str): # torch
+        return platform, device.index or 0
+    platform = getattr(device, "platform", None)
+    if isinstance(platform, str): # jax
+        return ("cuda" if platform == "gpu" else platform), device.id
+    return str(device), 0 # numpy
+
+def _data_pointer(data : Any) -> Optional[int]:
+    try:
+        if hasattr(data, "data_ptr"): # torch
+            return data.data_ptr()
+        if hasattr(data, "unsafe_buffer_pointer"): # jax
+            # `unsafe_buffer_pointer` can deadlock on buffers that are still being imported, wait for them first
+            return data.block_until_ready().unsafe_buffer_pointer()
+        if hasattr(data, "__array_interface__"): # numpy
+            return data.__array_interface__["data"][0]
+    except Exception:
+        pass
+    return None
+
+def _is_contiguous(data : Any) -> bool:
+    if hasattr(data, "is_contiguous"): # torch
+        return data.is_contiguous()
+    flags = getattr(data, "flags", None)
+    if flags is not None: # numpy
+        return flags.c_contiguous
+    return True
+
+def get_from_other_backend_with_info_function(
+    is_backendarray : Callable[[Any], bool],
+    paths : Sequence[Tuple[str, TransferPath]],
+    func_expected_dtype_name : Callable[[str], str] = lambda name: name,
+    func_device : Optional[Callable[[Any], Any]] = None,
+):
+    """
+    Build the `from_other_backend_with_info` function of a backend.
+
+    Args:
+        is_backendarray: Whether the data already belongs to the target backend.
+        paths: Candidate transfer paths as (method, path) pairs, ordered from the cheapest to the most expensive.
+        func_expected_dtype_name: Maps the source dtype name to the dtype name the target backend is expected to produce
+            (e.g. jax canonicalizes float64 to float32 unless x64 is enabled). Any other result is rejected as a dtype change.
+        func_device: Returns the device of a target backend array, used to report `TransferInfo.device_changed`.
+    """
+    # (source backend, dtype, device, contiguity) -> index of the first path known to work
+    path_cache : Dict[Tuple[str, str, str, bool], int] = {}
+
+    def _try_path(path_idx : int, other_backend : ComputeBackend, data : Any, expected_dtype : str) -> Tuple[Any, Optional[str], bool]:
+        """
+        Returns (result, error message, whether the path failed because it changed the dtype).
+        """
+        method, path = paths[path_idx]
+        try:
+            result = path(other_backend, data)
+        except Exception as e:
+            return None, f"{method}: {type(e).__name__}: {e}", False
+        result_dtype = dtype_name(result.dtype)
+        if result_dtype != expected_dtype:
+            return None, f"{method}: would change the dtype from {expected_dtype} to {result_dtype}", True
+        return result, None, False
+
+    def from_other_backend_with_info(
+        other_backend : ComputeBackend,
+        data : CompatArray,
+        /,
+    ) -> Tuple[CompatArray, TransferInfo]:
+        """
+        Convert an array from another backend, using the cheapest path that preserves the dtype.
+        """
+        if is_backendarray(data):
+            return data, TransferInfo(method="identity", zero_copy=True)
+
+        source_dtype = dtype_name(data.dtype)
+        expected_dtype = func_expected_dtype_name(source_dtype)
+        source_device = other_backend.device(data)
+        key = (
+            str(other_backend.simplified_name),
+            source_dtype,
+            str(source_device),
+            _is_contiguous(data)
+        )
+        cached_idx = path_cache.get(key)
+        candidate_idxs = list(range(len(paths)))
+        if cached_idx is not None:
+            candidate_idxs.remove(cached_idx)
+            candidate_idxs.insert(0, cached_idx)
+
+        errors = []
+        dtype_changed = False
+        for path_idx in candidate_idxs:
+            result, error, path_changed_dtype = _try_path(path_idx, other_backend, data, expected_dtype)
+            if error is not None:
+                errors.append(error)
+                dtype_changed = dtype_changed or path_changed_dtype
+                continue
+            path_cache[key] = path_idx
+            source_ptr = _data_pointer(data)
+            zero_copy = source_ptr is not None and source_ptr == _data_pointer(result)
+            device_changed = func_device is not None and device_key(source_device) != device_key(func_device(result))
+            return result, TransferInfo(method=paths[path_idx][0], zero_copy=zero_copy, device_changed=device_changed)
+        raise (TypeError if dtype_changed else RuntimeError)(
+            f"Cannot transfer an array of dtype {source_dtype} from the {other_backend.simplified_name} backend"
+            + (" without changing its dtype" if dtype_changed else "") + ":\n  "
+            + "\n  ".join(errors)
+        )
+    return from_other_backend_with_info
@@ -0,0 +1,205 @@
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List, Tuple
+from collections.abc import Mapping, Sequence
+import dataclasses
+import itertools
+
+__all__ = [
+    "TreeDef",
+    "get_tree_functions",
+]
+
+# Maximum number of distinct tree structures whose rebuild functions are cached per backend
+MAX_CACHED_STRUCTURES = 4096
+
+# Node kinds
+_LEAF = 0 # backend array
+_STATIC = 1 # any other non-container value, kept as-is
+_MAPPING = 2
+_SEQUENCE = 3
+_NAMEDTUPLE = 4
+_DATACLASS = 5
+
+@dataclasses.dataclass(frozen=True, eq=False)
+class TreeDef:
+    """
+    Structure of a nested data structure of arrays, as returned by `tree_flatten`.
+
+    Attributes:
+        structure: Hashable description of the containers (types, keys and lengths), used as a cache key.
+        statics: The non-array, non-container values found in the tree, in traversal order.
+        num_leaves: Number of arrays in the tree.
+    """
+    structure : Hashable
+    statics : Tuple[Any, ...]
+    num_leaves : int
+
+    def __eq__(self, other : Any) -> bool:
+        return isinstance(other, TreeDef) and self.structure == other.structure and self.num_leaves == other.num_leaves
+
+    def __hash__(self) -> int:
+        return hash(self.structure)
+
+def _container_kind(tp : type) -> int:
+    if issubclass(tp, (str, bytes, bytearray)):
+        return _STATIC
+    if issubclass(tp, Mapping):
+        return _MAPPING
+    if issubclass(tp, tuple) and hasattr(tp, "_fields"):
+        return _NAMEDTUPLE
+    if issubclass(tp, Sequence):
+        return _SEQUENCE
+    if dataclasses.is_dataclass(tp):
+        return _DATACLASS
+    return _STATIC
+
+def get_tree_functions(
+    is_backendarray : Callable[[Any], bool],
+):
+    """
+    Build the tree utilities of a backend, returned as (`tree_flatten`, `tree_unflatten`, `tree_map`, `map_fn_over_arrays`).
+    Backend arrays are the leaves; mappings, sequences, namedtuples and dataclasses are traversed; any other value is kept as-is.
+
+    The container kind of every type and the rebuild function of every tree structure are cached,
+    so repeated calls on data with the same layout (e.g. observation dicts) skip the structure discovery.
+    """
+    kind_cache : Dict[type, int] = {}
+    dataclass_fields_cache : Dict[type, Tuple[str, ...]] = {}
+    builder_cache : Dict[Hashable, Callable[[Iterator[Any], Iterator[Any]], Any]] = {}
+
+    def _kind(data : Any) -> int:
+        tp = type(data)
+        kind = kind_cache.get(tp)
+        if kind is None:
+            kind = _LEAF if is_backendarray(data) else _container_kind(tp)
+            kind_cache[tp] = kind
+        return kind
+
+    def _dataclass_fields(tp : type) -> Tuple[str, ...]:
+        names = dataclass_fields_cache.get(tp)
+        if names is None:
+            names = tuple(f.name for f in dataclasses.fields(tp) if f.init)
+            dataclass_fields_cache[tp] = names
+        return names
+
+    def _flatten_children(values : Iterable[Any], leaves : List[Any], statics : List[Any]) -> Tuple[Hashable, ...]:
+        children = []
+        append_child, append_leaf, get_kind = children.append, leaves.append, kind_cache.get
+        for v in values:
+            if get_kind(type(v)) == _LEAF: # fast path for arrays
+                append_leaf(v)
+                append_child(_LEAF)
+            else:
+                append_child(_flatten(v, leaves, statics))
+        return tuple(children)
+
+    def _flatten(data : Any, leaves : List[Any], statics : List[Any]) -> Hashable:
+        kind = _kind(data)
+        if kind == _LEAF:
+            leaves.append(data)
+            return _LEAF
+        elif kind == _MAPPING:
+            return (_MAPPING, type(data), tuple(data.keys()), _flatten_children(data.values(), leaves, statics))
+        elif kind == _SEQUENCE or kind == _NAMEDTUPLE:
+            return (kind, type(data), _flatten_children(data, leaves, statics))
+        elif kind == _DATACLASS:
+            names = _dataclass_fields(type(data))
+            return (_DATACLASS, type(data), names, _flatten_children([getattr(data, n) for n in names], leaves, statics))
+        else:
+            statics.append(data)
+            return _STATIC
+
+    def _compile(structure : Hashable) -> Callable[[Iterator[Any], Iterator[Any]], Any]:
+        if structure == _LEAF:
+            return lambda leaves, statics: next(leaves)
+        if structure == _STATIC:
+            return lambda leaves, statics: next(statics)
+
+        kind, tp, children = structure[0], structure[1], structure[-1]
+        child_builders = tuple(_get_builder(child) for child in children)
+        all_leaves = all(child == _LEAF for child in children)
+        if kind == _MAPPING:
+            keys = structure[2]
+            keep_type = tp is not dict
+            def build_mapping(leaves, statics):
+                nonlocal keep_type
+                if all_leaves:
+                    ret = dict(zip(keys, leaves)) # zip stops on `keys` before consuming an extra leaf
+                else:
+                    ret = {k: b(leaves, statics) for k, b in zip(keys, child_builders)}
+                if keep_type:
+                    try:
+                        return tp(**ret) # try to keep the same mapping type
+                    except Exception:
+                        keep_type = False # fall back to a dict from now on
+                return ret
+            return build_mapping
+        elif kind == _NAMEDTUPLE:
+            return lambda leaves, statics: tp(*[b(leaves, statics) for b in child_builders])
+        elif kind == _SEQUENCE:
+            keep_type = tp is not list
+            num_children = len(children)
+            def build_sequence(leaves, statics):
+                nonlocal keep_type
+                if all_leaves:
+                    ret = list(itertools.islice(leaves, num_children))
+                else:
+                    ret = [b(leaves, statics) for b in child_builders]
+                if keep_type:
+                    try:
+                        return tp(ret) # try to keep the same sequence type
+                    except Exception:
+                        keep_type = False # fall back to a list from now on
+                return ret
+            return build_sequence
+        else:
+            names = structure[2]
+            return lambda leaves, statics: tp(**{n: b(leaves, statics) for n, b in zip(names, child_builders)})
+
+    def _get_builder(structure : Hashable) -> Callable[[Iterator[Any], Iterator[Any]], Any]:
+        builder = builder_cache.get(structure)
+        if builder is None:
+            builder = _compile(structure)
+            if len(builder_cache) >= MAX_CACHED_STRUCTURES:
+                builder_cache.clear()
+            builder_cache[structure] = builder
+        return builder
+
+    def tree_flatten(data : Any) -> Tuple[List[Any], TreeDef]:
+        """
+        Flatten a nested structure of mappings, sequences and dataclasses into its arrays (in traversal order) and its structure.
+        """
+        leaves, statics = [], []
+        structure = _flatten(data, leaves, statics)
+        return leaves, TreeDef(structure=structure, statics=tuple(statics), num_leaves=len(leaves))
+
+    def tree_unflatten(treedef : TreeDef, leaves : Sequence[Any]) -> Any:
+        """
+        Rebuild a nested structure from its structure and arrays, inverse of `tree_flatten`.
+        """
+        if len(leaves) != treedef.num_leaves:
+            raise ValueError(f"Expected {treedef.num_leaves} leaves, got {len(leaves)}.")
+        return _get_builder(treedef.structure)(iter(leaves), iter(treedef.statics))
+
+    def tree_map(func : Callable[..., Any], tree : Any, *rest : Any) -> Any:
+        """
+        Map a function over the arrays of one or several trees with the same structure.
+        `func` receives one array from each tree; non-array values are taken from the first tree.
+        """
+        leaves, treedef = tree_flatten(tree)
+        if len(rest) == 0:
+            return tree_unflatten(treedef, [func(leaf) for leaf in leaves])
+        all_leaves = [leaves]
+        for other in rest:
+            other_leaves, other_treedef = tree_flatten(other)
+            if other_treedef != treedef:
+                raise ValueError(f"All trees must have the same structure, got {treedef.structure} and {other_treedef.structure}.")
+            all_leaves.append(other_leaves)
+        return tree_unflatten(treedef, [func(*args) for args in zip(*all_leaves)])
+
+    def map_fn_over_arrays(data : Any, func : Callable[[Any], Any]) -> Any:
+        """
+        Map a function to the data.
+        """
+        return tree_map(func, data)
+
+    return tree_flatten, tree_unflatten, tree_map, map_fn_over_arrays
@@ -4,6 +4,7 @@ import jax.numpy as jnp
 import numpy as np
 from ._typing import ARRAY_TYPE, DTYPE_TYPE, DEVICE_TYPE, RNG_TYPE
 from xbarray.backends.base import ComputeBackend, SupportsDLPack
+from .._common.transfer import get_from_other_backend_with_info_function, dtype_name, device_key, BITCAST_INTEGER_DTYPE_NAMES
 
 __all__ = [
     "default_integer_dtype",
@@ -12,6 +13,7 @@ __all__ = [
     "is_backendarray",
     "from_numpy",
     "from_other_backend",
+    "from_other_backend_with_info",
     "to_numpy",
     "to_dlpack",
     "dtype_is_real_integer",
@@ -19,6 +21,13 @@ __all__ = [
     "dtype_is_boolean",
     "abbreviate_array",
     "map_fn_over_arrays",
+    "map_fn_over_arrays_batched",
+    "tree_flatten",
+    "tree_unflatten",
+    "tree_map",
+    "async_to_device",
+    "prefetch",
+    "jit",
 ]
 
 default_integer_dtype = int
@@ -37,17 +46,59 @@ def from_numpy(
 ) -> ARRAY_TYPE:
     return jax.numpy.asarray(data, dtype=dtype, device=device)
 
+def _transfer_dlpack(other_backend : ComputeBackend, data : Any) -> ARRAY_TYPE:
+    return jax.dlpack.from_dlpack(other_backend.to_dlpack(data))
+
+def _matching_device(other_backend : ComputeBackend, data : Any) -> Optional[Any]:
+    # The jax device of an accelerator source array for the paths through host memory,
+    # None (the default device, as for host arrays) if jax has no such device
+    key = device_key(other_backend.device(data))
+    if key[0] == "cpu":
+        return None
+    try:
+        devices = jax.devices("gpu" if key[0] == "cuda" else key[0])
+    except RuntimeError:
+        return None
+    return next((device for device in devices if device_key(device) == key), None)
+
+def _transfer_buffer(other_backend : ComputeBackend, data : Any) -> ARRAY_TYPE:
+    return jnp.asarray(np.asarray(data), device=_matching_device(other_backend, data))
+
+def _transfer_bitcast(other_backend : ComputeBackend, data : Any) -> ARRAY_TYPE:
+    # e.g. bfloat16 tensors on a device jax cannot import from
+    name = dtype_name(data.dtype)
+    int_data = data.view(getattr(other_backend, BITCAST_INTEGER_DTYPE_NAMES[name]))
+    return jnp.asarray(other_backend.to_numpy(int_data).view(getattr(jnp, name)), device=_matching_device(other_backend, data))
+
+def _transfer_copy(other_backend : ComputeBackend, data : Any) -> ARRAY_TYPE:
+    # jax sometimes has tiling issues with dlpack converted data
+    return jnp.asarray(other_backend.to_numpy(data), device=_matching_device(other_backend, data))
+
+def _expected_dtype_name(name : str) -> str:
+    # jax canonicalizes 64-bit dtypes to 32-bit ones unless `jax_enable_x64` is set
+    try:
+        return jax.dtypes.canonicalize_dtype(getattr(jnp, name)).name
+    except Exception:
+        return name
+
+from_other_backend_with_info = get_from_other_backend_with_info_function(
+    is_backendarray=is_backendarray,
+    paths=[
+        ("dlpack", _transfer_dlpack),
+        ("buffer", _transfer_buffer),
+        ("bitcast", _transfer_bitcast),
+        ("copy", _transfer_copy),
+    ],
+    func_expected_dtype_name=_expected_dtype_name,
+    func_device=lambda data: next(iter(data.devices())),
+)
+
 def from_other_backend(
     other_backend: ComputeBackend,
     data: Any,
     /,
 ) -> ARRAY_TYPE:
-    data_dlpack = other_backend.to_dlpack(data)
-    return jax.dlpack.from_dlpack(data_dlpack)
-    # except Exception as e:
-    #     # jax sometimes has tiling issues with dlpack converted data
-    #     np = other_backend.to_numpy(data)
-    #     return from_numpy(np)
+    return from_other_backend_with_info(other_backend, data)[0]
 
 def to_numpy(
     data : ARRAY_TYPE
@@ -78,16 +129,21 @@ def dtype_is_boolean(
     return dtype == np.bool_ or dtype == bool
 
 from .._common.implementations import *
+from .._common.tree import get_tree_functions
+from array_api_compat import device as compat_device
+from .._common.jit import get_jit_function
+from .._common.async_transfer import TransferFuture, get_prefetch_function
 if hasattr(jax.numpy, "__array_api_version__"):
     compat_module = jax.numpy
 else:
     import jax.experimental.array_api as compat_module
 abbreviate_array = get_abbreviate_array_function(
     backend=compat_module,
-    default_integer_dtype=default_integer_dtype,
+    func_to_numpy=to_numpy,
     func_dtype_is_real_floating=dtype_is_real_floating,
     func_dtype_is_real_integer=dtype_is_real_integer,
-    func_dtype_is_boolean=dtype_is_boolean
+    func_dtype_is_boolean=dtype_is_boolean,
+    func_compile=jax.jit,
 )
 def map_fn_over_arrays(
     data : Any, func : Callable[[ARRAY_TYPE], ARRAY_TYPE]
@@ -96,3 +152,51 @@ def map_fn_over_arrays(
         func,
         data
     )
+tree_flatten, tree_unflatten, tree_map, _ = get_tree_functions(
+    is_backendarray=is_backendarray,
+)
+map_fn_over_arrays_batched = get_map_fn_over_arrays_batched_function(
+    backend=compat_module,
+    func_device=compat_device,
+    func_tree_flatten=tree_flatten,
+    func_tree_unflatten=tree_unflatten,
+    func_compile=jax.jit,
+)
+
+# Transfers also move host (numpy) arrays, which the backend tree functions keep as static values
+_transfer_tree_flatten, _transfer_tree_unflatten, _, _ = get_tree_functions(
+    is_backendarray=lambda data: isinstance(data, (jax.Array, np.ndarray)),
+)
+
+def async_to_device(
+    data : Any,
+    device : DEVICE_TYPE,
+    /,
+    *,
+    stream : Optional[Any] = None,
+) -> TransferFuture:
+    """
+    Start copying every array (jax or numpy) of `data` to `device` in the background.
+    `jax.device_put` is already asynchronous, so all arrays are dispatched in one call and `result()` blocks until they are ready.
+    Numpy source arrays must not be modified until the transfer is done.
+    """
+    if stream is not None:
+        raise ValueError("The stream argument is not supported by the jax backend")
+    leaves, treedef = _transfer_tree_flatten(data)
+    new_leaves = jax.device_put(leaves, device)
+    return TransferFuture(
+        func_done=lambda: all(leaf.is_ready() for leaf in new_leaves),
+        func_wait=lambda: _transfer_tree_unflatten(treedef, jax.block_until_ready(new_leaves)),
+    )
+
+prefetch = get_prefetch_function(async_to_device)
+
+jit = get_jit_function(
+    backend=compat_module,
+    func_device=compat_device,
+    func_tree_flatten=tree_flatten,
+    func_tree_map=tree_map,
+    func_compile=lambda fn, static_argnames, **compile_kwargs: jax.jit(fn, static_argnames=static_argnames, **compile_kwargs),
+    trace_python_scalars=True,
+    func_compile_padding=lambda pad: jax.jit(pad, static_argnums=1),
+)
@@ -1,5 +1,6 @@
-from typing import Union, Optional, Tuple, Any
+from typing import Union, Optional, Tuple, Any, Sequence, Callable
 from ._typing import ARRAY_TYPE, DTYPE_TYPE, DEVICE_TYPE, RNG_TYPE
+import functools
 import numpy as np
 import jax
 
@@ -10,7 +11,8 @@ __all__ = [
     "random_exponential",
     "random_normal",
     "random_geometric",
-    "random_permutation"
+    "random_permutation",
+    "random_number_generator_batch",
 ]
 
 def random_number_generator(
@@ -24,6 +26,63 @@ def random_number_generator(
     )
     return rng
 
+def random_number_generator_batch(
+    seeds : Sequence[int],
+    *,
+    device : Optional[DEVICE_TYPE] = None
+) -> RNG_TYPE:
+    """
+    Create a batch of independent keys, one per seed.
+    Passed as `rng` to the sampling functions, a draw of shape `shape` returns an array of shape (len(seeds), *shape) in one vmapped call,
+    whose i-th row is the same as the draw with `random_number_generator(seeds[i])`.
+    """
+    rng = jax.vmap(jax.random.key)(jax.numpy.asarray(seeds))
+    if device is not None:
+        rng = jax.device_put(rng, device)
+    return rng
+
+def _is_key_batch(rng : RNG_TYPE) -> bool:
+    # Typed keys (`jax.random.key`) are scalars, legacy uint32 keys (`jax.random.PRNGKey`) have shape (2,)
+    return rng.ndim > (0 if jax.dtypes.issubdtype(rng.dtype, jax.dtypes.prng_key) else 1)
+
+@functools.partial(jax.jit, static_argnums=(0, 2))
+def _sample_batch(
+    sampler : Callable[..., ARRAY_TYPE],
+    rng : RNG_TYPE,
+    static_args : Tuple[Any, ...],
+    *args : Any
+) -> Tuple[RNG_TYPE, ARRAY_TYPE]:
+    # Same key handling as the unbatched functions, for every key of the batch
+    new_rng, rng = jax.vmap(jax.random.split, out_axes=1)(rng)
+    data = jax.vmap(lambda key: sampler(key, *static_args, *args))(rng)
+    return new_rng, data
+
+def _static_shape(shape : Union[int, Tuple[int, ...]]) -> Union[int, Tuple[int, ...]]:
+    return shape if isinstance(shape, int) else tuple(shape)
+
+def _maybe_device_put(rng_and_data : Tuple[RNG_TYPE, ARRAY_TYPE], device : Optional[DEVICE_TYPE]) -> Tuple[RNG_TYPE, ARRAY_TYPE]:
+    if device is None:
+        return rng_and_data
+    return rng_and_data[0], jax.device_put(rng_and_data[1], device)
+
+def _randint_sampler(key, shape, dtype, minval, maxval):
+    return jax.random.randint(key, shape, minval=minval, maxval=maxval, dtype=dtype)
+
+def _uniform_sampler(key, shape, dtype, minval, maxval):
+    return jax.random.uniform(key, shape, dtype=dtype, minval=minval, maxval=maxval)
+
+def _exponential_sampler(key, shape, dtype, lambd):
+    return jax.random.exponential(key, shape, dtype=dtype) / lambd
+
+def _normal_sampler(key, shape, dtype, mean, std):
+    return jax.random.normal(key, shape, dtype=dtype) * std + mean
+
+def _geometric_sampler(key, shape, dtype, p):
+    return jax.random.geometric(key, p=p, shape=shape, dtype=dtype)
+
+def _permutation_sampler(key, n, dtype):
+    return jax.random.permutation(key, n).astype(dtype)
+
 def random_discrete_uniform(
     shape : Union[int, Tuple[int, ...]], 
     /,
@@ -34,6 +93,8 @@ def random_discrete_uniform(
     dtype : Optional[DTYPE_TYPE] = None, 
     device : Optional[DEVICE_TYPE] = None
 ) -> Tuple[RNG_TYPE, ARRAY_TYPE]:
+    if _is_key_batch(rng):
+        return _maybe_device_put(_sample_batch(_randint_sampler, rng, (_static_shape(shape), dtype or int), int(from_num), int(to_num)), device)
     new_rng, rng = jax.random.split(rng)
     t = jax.random.randint(rng, shape, minval=int(from_num), maxval=int(to_num), dtype=dtype or int)
     if device is not None:
@@ -49,6 +110,8 @@ def random_uniform(
     dtype : Optional[DTYPE_TYPE] = None, 
     device : Optional[DEVICE_TYPE] = None
 ) -> Tuple[RNG_TYPE, ARRAY_TYPE]:
+    if _is_key_batch(rng):
+        return _maybe_device_put(_sample_batch(_uniform_sampler, rng, (_static_shape(shape), dtype or float), low, high), device)
     new_rng, rng = jax.random.split(rng)
     data = jax.random.uniform(rng, shape, dtype=dtype or float, minval=low, maxval=high)
     if device is not None:
@@ -64,6 +127,8 @@ def random_exponential(
     dtype : Optional[DTYPE_TYPE] = None, 
     device : Optional[DEVICE_TYPE] = None
 ) -> Tuple[RNG_TYPE, ARRAY_TYPE]:
+    if _is_key_batch(rng):
+        return _maybe_device_put(_sample_batch(_exponential_sampler, rng, (_static_shape(shape), dtype or float), lambd), device)
     new_rng, rng = jax.random.split(rng)
     data = jax.random.exponential(rng, shape, dtype=dtype or float) / lambd
     if device is not None:
@@ -79,6 +144,8 @@ def random_normal(
     dtype : Optional[DTYPE_TYPE] = None, 
     device : Optional[Any] = None
 ) -> Tuple[RNG_TYPE, ARRAY_TYPE]:
+    if _is_key_batch(rng):
+        return _maybe_device_put(_sample_batch(_normal_sampler, rng, (_static_shape(shape), dtype or float), mean, std), device)
     new_rng, rng = jax.random.split(rng)
     data = jax.random.normal(rng, shape, dtype=dtype or float) * std + mean
     if device is not None:
@@ -94,6 +161,8 @@ def random_geometric(
     dtype: Optional[DTYPE_TYPE] = None, 
     device: Optional[Any] = None
 ) -> Tuple[RNG_TYPE, ARRAY_TYPE]:
+    if _is_key_batch(rng):
+        return _maybe_device_put(_sample_batch(_geometric_sampler, rng, (_static_shape(shape), dtype or int), p), device)
     new_rng, rng = jax.random.split(rng)
     data = jax.random.geometric(rng, p=p, shape=shape, dtype=dtype or int)
     if device is not None:
@@ -108,8 +177,10 @@ def random_permutation(
     dtype: Optional[DTYPE_TYPE] = None,
     device: Optional[DEVICE_TYPE] = None
 ) -> Tuple[RNG_TYPE, ARRAY_TYPE]:
+    if _is_key_batch(rng):
+        return _maybe_device_put(_sample_batch(_permutation_sampler, rng, (int(n), dtype or int)), device)
     new_rng, rng = jax.random.split(rng)
-    data = jax.random.permutation(rng, n, dtype=dtype or int)
+    data = jax.random.permutation(rng, n).astype(dtype or int)
     if device is not None:
         data = jax.device_put(data, device)
     return new_rng, data
\ No newline at end of file
@@ -2,6 +2,7 @@ from typing import Any, Union, Optional
 import numpy as np
 from ._typing import ARRAY_TYPE, DTYPE_TYPE, DEVICE_TYPE, RNG_TYPE
 from xbarray.backends.base import ComputeBackend, SupportsDLPack
+from .._common.transfer import get_from_other_backend_with_info_function, dtype_name, BITCAST_INTEGER_DTYPE_NAMES
 
 __all__ = [
     "default_integer_dtype",
@@ -10,6 +11,7 @@ __all__ = [
     "is_backendarray",
     "from_numpy",
     "from_other_backend",
+    "from_other_backend_with_info",
     "to_numpy",
     "to_dlpack",
     "dtype_is_real_integer",
@@ -17,6 +19,13 @@ __all__ = [
     "dtype_is_boolean",
     "abbreviate_array",
     "map_fn_over_arrays",
+    "map_fn_over_arrays_batched",
+    "tree_flatten",
+    "tree_unflatten",
+    "tree_map",
+    "async_to_device",
+    "prefetch",
+    "jit",
 ]
 
 default_integer_dtype = int
@@ -35,12 +44,39 @@ def from_numpy(
 ) -> ARRAY_TYPE:
     return data
 
+def _transfer_dlpack(other_backend : ComputeBackend, data : Any) -> ARRAY_TYPE:
+    return np.from_dlpack(other_backend.to_dlpack(data))
+
+def _transfer_buffer(other_backend : ComputeBackend, data : Any) -> ARRAY_TYPE:
+    return np.asarray(data)
+
+def _transfer_bitcast(other_backend : ComputeBackend, data : Any) -> ARRAY_TYPE:
+    # NumPy only knows bfloat16 / float8 through ml_dtypes (shipped with jax)
+    import ml_dtypes
+    name = dtype_name(data.dtype)
+    int_data = data.view(getattr(other_backend, BITCAST_INTEGER_DTYPE_NAMES[name]))
+    return other_backend.to_numpy(int_data).view(getattr(ml_dtypes, name))
+
+def _transfer_copy(other_backend : ComputeBackend, data : Any) -> ARRAY_TYPE:
+    return other_backend.to_numpy(data)
+
+from_other_backend_with_info = get_from_other_backend_with_info_function(
+    is_backendarray=is_backendarray,
+    paths=[
+        ("dlpack", _transfer_dlpack),
+        ("buffer", _transfer_buffer),
+        ("bitcast", _transfer_bitcast),
+        ("copy", _transfer_copy),
+    ],
+    func_device=lambda data: "cpu",
+)
+
 def from_other_backend(
     other_backend: ComputeBackend,
     data: Any,
     /,
 ) -> ARRAY_TYPE:
-    return other_backend.to_numpy(data)
+    return from_other_backend_with_info(other_backend, data)[0]
 
 def to_numpy(
     data : ARRAY_TYPE
@@ -68,16 +104,53 @@ def dtype_is_boolean(
 ) -> bool:
     return dtype == np.bool_ or dtype == bool
 
-from .._common.implementations import get_abbreviate_array_function, get_map_fn_over_arrays_function
+from .._common.implementations import get_abbreviate_array_function, get_map_fn_over_arrays_batched_function
+from .._common.tree import get_tree_functions
+from array_api_compat import device as compat_device
+from .._common.jit import get_jit_function
+from .._common.async_transfer import TransferFuture, submit_host_transfer, get_prefetch_function
 from array_api_compat import numpy as compat_module
 abbreviate_array = get_abbreviate_array_function(
     backend=compat_module,
-    default_integer_dtype=default_integer_dtype,
+    func_to_numpy=to_numpy,
     func_dtype_is_real_floating=dtype_is_real_floating,
     func_dtype_is_real_integer=dtype_is_real_integer,
     func_dtype_is_boolean=dtype_is_boolean,
 )
 
-map_fn_over_arrays = get_map_fn_over_arrays_function(
+tree_flatten, tree_unflatten, tree_map, map_fn_over_arrays = get_tree_functions(
     is_backendarray=is_backendarray,
-)
\ No newline at end of file
+)
+map_fn_over_arrays_batched = get_map_fn_over_arrays_batched_function(
+    backend=compat_module,
+    func_device=compat_device,
+    func_tree_flatten=tree_flatten,
+    func_tree_unflatten=tree_unflatten,
+)
+
+def async_to_device(
+    data : Any,
+    device : DEVICE_TYPE,
+    /,
+    *,
+    stream : Optional[Any] = None,
+) -> TransferFuture:
+    """
+    Start copying every array of `data` to `device` in the background.
+    NumPy only has the CPU device, so the copy runs on a background thread (the CPU stand-in for a device transfer).
+    The source arrays must not be modified until the transfer is done.
+    """
+    if device != "cpu":
+        raise ValueError(f"Unsupported device {device!r}")
+    if stream is not None:
+        raise ValueError("The stream argument is not supported by the numpy backend")
+    return submit_host_transfer(lambda: map_fn_over_arrays(data, np.copy))
+
+prefetch = get_prefetch_function(async_to_device)
+
+jit = get_jit_function(
+    backend=compat_module,
+    func_device=compat_device,
+    func_tree_flatten=tree_flatten,
+    func_tree_map=tree_map,
+)
@@ -1,6 +1,8 @@
-from typing import Union, Optional, Tuple, Any
+from typing import Union, Optional, Tuple, Any, Sequence
 from ._typing import ARRAY_TYPE, DTYPE_TYPE, DEVICE_TYPE, RNG_TYPE
 import numpy as np
+from array_api_compat import numpy as compat_module
+from .._common.random_stream import RandomStream, RandomStreamBatch, DEFAULT_BUFFER_SIZE
 
 __all__ = [
     "random_number_generator",
@@ -9,7 +11,11 @@ __all__ = [
     "random_exponential",
     "random_normal",
     "random_geometric",
-    "random_permutation"
+    "random_permutation",
+    "random_stream",
+    "random_number_generator_batch",
+    "RandomStream",
+    "RandomStreamBatch",
 ]
 
 def random_number_generator(
@@ -19,6 +25,30 @@ def random_number_generator(
 ) -> RNG_TYPE:
     return np.random.default_rng(seed)
 
+def random_stream(
+    seed : Optional[int] = None,
+    *,
+    device : Optional[DEVICE_TYPE] = None,
+    buffer_size : int = DEFAULT_BUFFER_SIZE,
+) -> RandomStream:
+    """
+    Create a counter-based (Philox4x32) random stream, which can be passed as `rng` to all sampling functions.
+    """
+    return RandomStream(compat_module, seed, device="cpu", buffer_size=buffer_size)
+
+def random_number_generator_batch(
+    seeds : Sequence[int],
+    *,
+    device : Optional[DEVICE_TYPE] = None,
+    buffer_size : int = DEFAULT_BUFFER_SIZE,
+) -> RandomStreamBatch:
+    """
+    Create a batch of independent counter-based random streams, one per seed.
+    Passed as `rng` to the sampling functions, a draw of shape `shape` returns an array of shape (len(seeds), *shape) in one vectorized call,
+    whose i-th row is the same as the draw from `random_stream(seeds[i])`.
+    """
+    return RandomStreamBatch(compat_module, seeds, device="cpu", buffer_size=buffer_size)
+
 def random_discrete_uniform(
     shape : Union[int, Tuple[int, ...]], 
     /,
@@ -29,6 +59,8 @@ def random_discrete_uniform(
     dtype : Optional[DTYPE_TYPE] = None, 
     device : Optional[DEVICE_TYPE] = None
 ) -> Tuple[RNG_TYPE, ARRAY_TYPE]:
+    if isinstance(rng, RandomStream):
+        return rng, rng.discrete_uniform(shape, from_num, to_num, dtype=np.dtype(dtype or np.int64))
     t = rng.integers(int(from_num), int(to_num), size=shape)
     if dtype is not None:
         t = t.astype(dtype)
@@ -43,6 +75,8 @@ def random_uniform(
     dtype : Optional[DTYPE_TYPE] = None, 
     device : Optional[DEVICE_TYPE] = None
 ) -> Tuple[RNG_TYPE, ARRAY_TYPE]:
+    if isinstance(rng, RandomStream):
+        return rng, rng.uniform(shape, low, high, dtype=np.dtype(dtype or np.float64))
     t = rng.uniform(float(low), float(high), size=shape)
     if dtype is not None:
         t = t.astype(dtype)
@@ -57,6 +91,8 @@ def random_exponential(
     dtype : Optional[DTYPE_TYPE] = None, 
     device : Optional[DEVICE_TYPE] = None
 ) -> Tuple[RNG_TYPE, ARRAY_TYPE]:
+    if isinstance(rng, RandomStream):
+        return rng, rng.exponential(shape, lambd, dtype=np.dtype(dtype or np.float64))
     t = rng.exponential(1.0 / float(lambd), size=shape)
     if dtype is not None:
         t = t.astype(dtype)
@@ -71,6 +107,8 @@ def random_normal(
     dtype : Optional[DTYPE_TYPE] = None, 
     device : Optional[Any] = None
 ) -> Tuple[RNG_TYPE, ARRAY_TYPE]:
+    if isinstance(rng, RandomStream):
+        return rng, rng.normal(shape, mean, std, dtype=np.dtype(dtype or np.float64))
     t = rng.normal(mean, std, size=shape)
     if dtype is not None:
         t = t.astype(dtype)
@@ -86,6 +124,8 @@ def random_geometric(
     dtype: Optional[DTYPE_TYPE] = None, 
     device: Optional[Any] = None
 ) -> Tuple[RNG_TYPE, ARRAY_TYPE]:
+    if isinstance(rng, RandomStream):
+        return rng, rng.geometric(shape, p, dtype=np.dtype(dtype or np.int64))
     t = rng.geometric(p, size=shape)
     if dtype is not None:
         t = t.astype(dtype)
@@ -99,6 +139,8 @@ def random_permutation(
     dtype: Optional[DTYPE_TYPE] = None,
     device: Optional[DEVICE_TYPE] = None
 ) -> Tuple[RNG_TYPE, ARRAY_TYPE]:
+    if isinstance(rng, RandomStream):
+        return rng, rng.permutation(n, dtype=np.dtype(dtype or np.int64))
     t = rng.permutation(n)
     if dtype is not None:
         t = t.astype(dtype)
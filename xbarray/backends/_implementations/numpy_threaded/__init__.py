@@ -0,0 +1,15 @@
+from ..numpy import *
+from ..numpy import __array_api_version__, __array_namespace_info__
+
+simplified_name = "numpy"
+
+from array_api_compat import numpy as compat_module
+# Bind all functions from array_api_extra before exposing them (lazily unless XBARRAY_LAZY_BINDING=0)
+from .._common.lazy import install_array_api_extra as _install_array_api_extra
+_install_array_api_extra(globals(), compat_module)
+
+from ..numpy._typing import *
+from ..numpy._extra import *
+# Threaded overrides of the elementwise functions, reductions and matmul
+from ._threaded import *
+__import__(__package__ + ".random")
@@ -0,0 +1,233 @@
+"""
+Multi-threaded versions of the NumPy backend functions.
+
+Large arrays are partitioned along their leading axis and every part is computed on a thread of a shared pool
+(NumPy releases the GIL inside its loops), writing into one preallocated output.
+Arrays with fewer than `get_threading_threshold()` elements (or a leading axis of length 1) are computed by the plain NumPy functions.
+"""
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+import builtins
+import concurrent.futures
+import functools
+import math
+import os
+import threading
+import numpy as np
+from .._common.elementwise import ELEMENTWISE_FUNCTIONS
+from .. import numpy as numpy_impl
+
+__all__ = [
+    "get_num_threads",
+    "set_num_threads",
+    "get_threading_threshold",
+    "set_threading_threshold",
+    "astype",
+    "sum",
+    "prod",
+    "max",
+    "min",
+    "any",
+    "all",
+    "mean",
+    "matmul",
+]
+
+# Number of threads of the pool, `XBARRAY_NUM_THREADS` or the number of CPUs available to the process
+DEFAULT_NUM_THREADS = int(os.environ.get("XBARRAY_NUM_THREADS", "0")) or (
+    len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else (os.cpu_count() or 1)
+)
+# Minimum number of elements (of the output, or of the input of a reduction) per thread
+DEFAULT_THREADING_THRESHOLD = 1 << 17
+
+_num_threads = builtins.max(1, DEFAULT_NUM_THREADS)
+_threshold = DEFAULT_THREADING_THRESHOLD
+_executor : Optional[concurrent.futures.ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+_worker = threading.local()
+
+def get_num_threads() -> int:
+    return _num_threads
+
+def set_num_threads(num_threads : int) -> None:
+    """
+    Set the number of threads used by the backend (1 to only use the calling thread).
+    """
+    global _num_threads, _executor
+    if num_threads < 1:
+        raise ValueError(f"num_threads must be at least 1, got {num_threads}.")
+    with _executor_lock:
+        _num_threads = num_threads
+        if _executor is not None:
+            _executor.shutdown(wait=False)
+            _executor = None
+
+def get_threading_threshold() -> int:
+    return _threshold
+
+def set_threading_threshold(threshold : int) -> None:
+    """
+    Set the minimum number of elements per thread, smaller arrays are computed by the plain NumPy functions.
+    """
+    global _threshold
+    if threshold < 1:
+        raise ValueError(f"threshold must be at least 1, got {threshold}.")
+    _threshold = threshold
+
+def _mark_worker() -> None:
+    _worker.active = True
+
+def _get_executor() -> concurrent.futures.ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # The calling thread computes one part itself
+            _executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=builtins.max(1, _num_threads - 1), thread_name_prefix="xbarray-numpy", initializer=_mark_worker,
+            )
+        return _executor
+
+def _partition(length : int, size : int, max_parts : Optional[int] = None) -> Optional[List[slice]]:
+    # Slices of a leading axis of `length` for `size` elements of work, None if it is not worth splitting
+    max_parts = _num_threads if max_parts is None else max_parts
+    num_parts = builtins.min(max_parts, length, size // _threshold)
+    if num_parts < 2:
+        return None
+    return [slice(length * i // num_parts, length * (i + 1) // num_parts) for i in range(num_parts)]
+
+def _parallel(tasks : Sequence[Callable[[], None]]) -> None:
+    # Tasks submitted from a pool thread (or with a single thread) run in order on the calling thread, which also avoids deadlocks
+    if _num_threads == 1 or getattr(_worker, "active", False):
+        for task in tasks:
+            task()
+        return
+    futures = [_get_executor().submit(task) for task in tasks[1:]]
+    try:
+        tasks[0]()
+    finally:
+        concurrent.futures.wait(futures)
+    for future in futures:
+        future.result()
+
+def _is_threadable(array : Any) -> bool:
+    # Object arrays hold the GIL in every loop
+    return isinstance(array, np.ndarray) and array.ndim > 0 and not array.dtype.hasobject
+
+def _slice_operand(value : Any, ndim : int, part : slice) -> Any:
+    # The part of a (broadcast) operand for a part of the leading axis of the output
+    if isinstance(value, np.ndarray) and value.ndim == ndim and value.shape[0] != 1:
+        return value[part]
+    return value
+
+def _threaded_elementwise(func : Callable) -> Callable:
+    writes_out = isinstance(func, np.ufunc) and func.nout == 1
+
+    @functools.wraps(func)
+    def threaded(*args : Any, **kwargs : Any) -> Any:
+        if _num_threads == 1 or "out" in kwargs:
+            return func(*args, **kwargs)
+        operands = [value for value in args + tuple(kwargs.values()) if isinstance(value, np.ndarray)]
+        parts = None
+        if len(operands) > 0 and builtins.all(not operand.dtype.hasobject for operand in operands):
+            shape = np.broadcast_shapes(*(operand.shape for operand in operands))
+            parts = _partition(shape[0], math.prod(shape)) if len(shape) > 0 else None
+        if parts is None:
+            return func(*args, **kwargs)
+        ndim = len(shape)
+        def call(part : slice, **out_kwargs : Any) -> Any:
+            return func(
+                *(_slice_operand(value, ndim, part) for value in args),
+                **{key: _slice_operand(value, ndim, part) for key, value in kwargs.items()},
+                **out_kwargs,
+            )
+        # The function applied to empty parts gives the dtype of the output
+        out = np.empty(shape, dtype=call(slice(0, 0)).dtype)
+        if writes_out:
+            tasks = [functools.partial(call, part, out=out[part]) for part in parts]
+        else:
+            def assign(part : slice) -> None:
+                out[part] = call(part)
+            tasks = [functools.partial(assign, part) for part in parts]
+        _parallel(tasks)
+        return out
+    return threaded
+
+def astype(x : np.ndarray, dtype : Any, /, *, copy : bool = True, device : Any = None) -> np.ndarray:
+    if not copy and x.dtype == dtype:
+        return x
+    return _threaded_astype(x, dtype, device=device)
+
+def _reduction_axes(ndim : int, axis : Any) -> Tuple[int, ...]:
+    if axis is None:
+        return tuple(range(ndim))
+    return tuple(sorted(a % ndim for a in (axis if isinstance(axis, tuple) else (axis,))))
+
+def _threaded_reduction(func : Callable, combine : Callable) -> Callable:
+    @functools.wraps(func)
+    def threaded(x : Any, /, *, axis : Any = None, keepdims : bool = False, **kwargs : Any) -> Any:
+        parts = _partition(x.shape[0], x.size) if _num_threads > 1 and _is_threadable(x) else None
+        if parts is None:
+            return func(x, axis=axis, keepdims=keepdims, **kwargs)
+        axes = _reduction_axes(x.ndim, axis)
+        if 0 not in axes:
+            # The rows are reduced independently
+            empty = func(x[0:0], axis=axis, keepdims=keepdims, **kwargs)
+            out = np.empty((x.shape[0],) + empty.shape[1:], dtype=empty.dtype)
+            def reduce_rows(part : slice) -> None:
+                out[part] = func(x[part], axis=axis, keepdims=keepdims, **kwargs)
+            _parallel([functools.partial(reduce_rows, part) for part in parts])
+            return out
+        # Partial reductions of the parts, combined on the calling thread
+        partials = [None] * len(parts)
+        def reduce_part(index : int, part : slice) -> None:
+            partials[index] = func(x[part], axis=axes, keepdims=True, **kwargs)
+        _parallel([functools.partial(reduce_part, index, part) for index, part in enumerate(parts)])
+        result = combine(np.concatenate(partials, axis=0), axis=0, keepdims=True)
+        if keepdims:
+            return result
+        result = np.squeeze(result, axis=axes)
+        # Full reductions return NumPy scalars, like the plain functions
+        return result[()] if result.ndim == 0 else result
+    return threaded
+
+_threaded_astype = _threaded_elementwise(lambda x, dtype, device=None: numpy_impl.astype(x, dtype, device=device))
+sum = _threaded_reduction(numpy_impl.sum, np.sum)
+prod = _threaded_reduction(numpy_impl.prod, np.prod)
+max = _threaded_reduction(numpy_impl.max, np.max)
+min = _threaded_reduction(numpy_impl.min, np.min)
+any = _threaded_reduction(numpy_impl.any, np.any)
+all = _threaded_reduction(numpy_impl.all, np.all)
+_mean_rows = _threaded_reduction(numpy_impl.mean, np.mean)
+
+def mean(x : Any, /, *, axis : Any = None, keepdims : bool = False) -> Any:
+    if not _is_threadable(x) or 0 not in _reduction_axes(x.ndim, axis):
+        return _mean_rows(x, axis=axis, keepdims=keepdims)
+    # The mean over the leading axis is a threaded sum divided by the number of reduced elements
+    # (the means of the parts, of unequal lengths, cannot be averaged); like `np.mean`, integers and booleans are summed in float64
+    # and float16 in float32
+    count = math.prod(x.shape[a] for a in _reduction_axes(x.ndim, axis))
+    if x.dtype == np.float16:
+        return (sum(x, axis=axis, keepdims=keepdims, dtype=np.float32) / np.float32(count)).astype(np.float16)
+    if np.issubdtype(x.dtype, np.inexact):
+        return sum(x, axis=axis, keepdims=keepdims) / x.dtype.type(count)
+    return sum(x, axis=axis, keepdims=keepdims, dtype=np.float64) / np.float64(count)
+
+def matmul(x1 : Any, x2 : Any, /) -> Any:
+    # Only stacks of matrices are split (along their leading batch axis), NumPy loops over them on one thread;
+    # single matrix products go to BLAS, which has its own threads
+    if not (_is_threadable(x1) and _is_threadable(x2)) or x1.ndim < 2 or x2.ndim < 2 or builtins.max(x1.ndim, x2.ndim) < 3:
+        return numpy_impl.matmul(x1, x2)
+    shape = np.broadcast_shapes(x1.shape[:-2], x2.shape[:-2]) + (x1.shape[-2], x2.shape[-1])
+    parts = _partition(shape[0], math.prod(shape) * x1.shape[-1])
+    if parts is None:
+        return numpy_impl.matmul(x1, x2)
+    operands = lambda part: (_slice_operand(x1, len(shape), part), _slice_operand(x2, len(shape), part))
+    out = np.empty(shape, dtype=np.matmul(*operands(slice(0, 0))).dtype)
+    _parallel([functools.partial(lambda part: np.matmul(*operands(part), out=out[part]), part) for part in parts])
+    return out
+
+# The elementwise functions of the array API, threaded
+for _name in ELEMENTWISE_FUNCTIONS:
+    if _name != "astype":
+        globals()[_name] = _threaded_elementwise(getattr(numpy_impl, _name))
+        __all__.append(_name)
+del _name
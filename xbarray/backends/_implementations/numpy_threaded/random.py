@@ -0,0 +1,109 @@
+from typing import Union, Optional, Tuple, Any, Callable
+import functools
+import numpy as np
+from ..numpy.random import *
+from ..numpy import random as numpy_random
+from ..numpy._typing import ARRAY_TYPE, DTYPE_TYPE, DEVICE_TYPE, RNG_TYPE
+from . import _threaded
+
+__all__ = list(numpy_random.__all__)
+
+# Maximum number of parts of a threaded draw, the parts (and so the drawn values) do not depend on the number of threads
+MAX_RANDOM_PARTS = 64
+
+def _threaded_draw(
+    shape : Union[int, Tuple[int, ...]],
+    rng : Any,
+    dtype : Optional[DTYPE_TYPE],
+    supported_dtypes : Tuple[type, ...],
+    fill : Callable[[np.random.Generator, np.ndarray], None],
+) -> Optional[ARRAY_TYPE]:
+    # Every part is filled by its own child generator (spawned from `rng`) on a thread of the pool,
+    # None if the draw is too small, or cannot be threaded, and is left to the NumPy backend
+    if not isinstance(rng, np.random.Generator):
+        return None
+    shape = (shape,) if isinstance(shape, int) else tuple(shape)
+    dtype = np.dtype(supported_dtypes[0] if dtype is None else dtype)
+    if len(shape) == 0 or dtype.type not in supported_dtypes:
+        return None
+    parts = _threaded._partition(shape[0], int(np.prod(shape)), max_parts=MAX_RANDOM_PARTS)
+    if parts is None:
+        return None
+    try:
+        generators = rng.spawn(len(parts))
+    except (TypeError, AttributeError):
+        # Generators whose bit generator was not seeded from a SeedSequence cannot spawn
+        return None
+    out = np.empty(shape, dtype=dtype)
+    _threaded._parallel([functools.partial(fill, generator, out[part]) for generator, part in zip(generators, parts)])
+    return out
+
+def random_discrete_uniform(
+    shape : Union[int, Tuple[int, ...]],
+    /,
+    from_num : int,
+    to_num : int,
+    *,
+    rng : RNG_TYPE,
+    dtype : Optional[DTYPE_TYPE] = None,
+    device : Optional[DEVICE_TYPE] = None
+) -> Tuple[RNG_TYPE, ARRAY_TYPE]:
+    def fill(generator : np.random.Generator, out : np.ndarray) -> None:
+        out[...] = generator.integers(int(from_num), int(to_num), size=out.shape, dtype=out.dtype)
+    t = _threaded_draw(shape, rng, dtype, (np.int64, np.int32, np.int16, np.int8, np.uint64, np.uint32, np.uint16, np.uint8), fill)
+    if t is None:
+        return numpy_random.random_discrete_uniform(shape, from_num, to_num, rng=rng, dtype=dtype, device=device)
+    return rng, t
+
+def random_uniform(
+    shape: Union[int, Tuple[int, ...]],
+    /,
+    *,
+    rng : RNG_TYPE,
+    low : float = 0.0, high : float = 1.0,
+    dtype : Optional[DTYPE_TYPE] = None,
+    device : Optional[DEVICE_TYPE] = None
+) -> Tuple[RNG_TYPE, ARRAY_TYPE]:
+    def fill(generator : np.random.Generator, out : np.ndarray) -> None:
+        generator.random(out=out, dtype=out.dtype)
+        out *= float(high) - float(low)
+        out += float(low)
+    t = _threaded_draw(shape, rng, dtype, (np.float64, np.float32), fill)
+    if t is None:
+        return numpy_random.random_uniform(shape, rng=rng, low=low, high=high, dtype=dtype, device=device)
+    return rng, t
+
+def random_exponential(
+    shape: Union[int, Tuple[int, ...]],
+    /,
+    *,
+    rng : RNG_TYPE,
+    lambd : float = 1.0,
+    dtype : Optional[DTYPE_TYPE] = None,
+    device : Optional[DEVICE_TYPE] = None
+) -> Tuple[RNG_TYPE, ARRAY_TYPE]:
+    def fill(generator : np.random.Generator, out : np.ndarray) -> None:
+        generator.standard_exponential(out=out, dtype=out.dtype)
+        out /= float(lambd)
+    t = _threaded_draw(shape, rng, dtype, (np.float64, np.float32), fill)
+    if t is None:
+        return numpy_random.random_exponential(shape, rng=rng, lambd=lambd, dtype=dtype, device=device)
+    return rng, t
+
+def random_normal(
+    shape: Union[int, Tuple[int, ...]],
+    /,
+    *,
+    rng : RNG_TYPE,
+    mean : float = 0.0, std : float = 1.0,
+    dtype : Optional[DTYPE_TYPE] = None,
+    device : Optional[Any] = None
+) -> Tuple[RNG_TYPE, ARRAY_TYPE]:
+    def fill(generator : np.random.Generator, out : np.ndarray) -> None:
+        generator.standard_normal(out=out, dtype=out.dtype)
+        out *= float(std)
+        out += float(mean)
+    t = _threaded_draw(shape, rng, dtype, (np.float64, np.float32), fill)
+    if t is None:
+        return numpy_random.random_normal(shape, rng=rng, mean=mean, std=std, dtype=dtype, device=device)
+    return rng, t
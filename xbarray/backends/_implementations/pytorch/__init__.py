@@ -6,20 +6,9 @@ simplified_name = "pytorch"
 
 from array_api_compat import torch as compat_module
 
-# Import and bind all functions from array_api_extra before exposing them
-import array_api_extra
-from functools import partial
-for api_name in dir(array_api_extra):
-    if api_name.startswith('_'):
-        continue
-
-    if api_name in ['at', 'broadcast_shapes']:
-        globals()[api_name] = getattr(array_api_extra, api_name)
-    else:
-        globals()[api_name] = partial(
-            getattr(array_api_extra, api_name),
-            xp=compat_module
-        )
+# Bind all functions from array_api_extra before exposing them (lazily unless XBARRAY_LAZY_BINDING=0)
+from .._common.lazy import install_array_api_extra as _install_array_api_extra
+_install_array_api_extra(globals(), compat_module)
 
 from ._typing import *
 from ._extra import *
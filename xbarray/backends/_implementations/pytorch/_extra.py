@@ -1,8 +1,11 @@
-from typing import Any, Union, Optional
+from typing import Any, Dict, List, Tuple, Union, Optional
+import contextlib
+import threading
 import numpy as np
 import torch
 from ._typing import ARRAY_TYPE, DTYPE_TYPE, DEVICE_TYPE, RNG_TYPE
 from xbarray.backends.base import ComputeBackend, SupportsDLPack
+from .._common.transfer import get_from_other_backend_with_info_function, dtype_name, device_key, BITCAST_INTEGER_DTYPE_NAMES
 
 PYTORCH_DTYPE_CAST_MAP = {
     torch.uint16: torch.int16,
@@ -19,6 +22,7 @@ __all__ = [
     "is_backendarray",
     "from_numpy",
     "from_other_backend",
+    "from_other_backend_with_info",
     "to_numpy",
     "to_dlpack",
     "dtype_is_real_integer",
@@ -26,6 +30,13 @@ __all__ = [
     "dtype_is_boolean",
     "abbreviate_array",
     "map_fn_over_arrays",
+    "map_fn_over_arrays_batched",
+    "tree_flatten",
+    "tree_unflatten",
+    "tree_map",
+    "async_to_device",
+    "prefetch",
+    "jit",
 ]
 
 default_integer_dtype = torch.int32
@@ -48,13 +59,45 @@ def from_numpy(
         t = t.to(device=device, dtype=target_dtype)
     return t
 
+def _transfer_dlpack(other_backend : ComputeBackend, data : Any) -> ARRAY_TYPE:
+    return torch.from_dlpack(other_backend.to_dlpack(data))
+
+def _matching_device(other_backend : ComputeBackend, data : Any) -> Optional[torch.device]:
+    # The torch device of the source array for the paths through host memory, None (CPU) if there is none
+    platform, index = device_key(other_backend.device(data))
+    if platform == "cuda" and torch.cuda.is_available() and index < torch.cuda.device_count():
+        return torch.device("cuda", index)
+    return None
+
+def _transfer_buffer(other_backend : ComputeBackend, data : Any) -> ARRAY_TYPE:
+    return torch.as_tensor(np.asarray(data), device=_matching_device(other_backend, data))
+
+def _transfer_bitcast(other_backend : ComputeBackend, data : Any) -> ARRAY_TYPE:
+    # e.g. numpy arrays with ml_dtypes.bfloat16, which DLPack cannot describe
+    name = dtype_name(data.dtype)
+    int_data = data.view(getattr(other_backend, BITCAST_INTEGER_DTYPE_NAMES[name]))
+    return torch.from_dlpack(other_backend.to_dlpack(int_data)).view(getattr(torch, name))
+
+def _transfer_copy(other_backend : ComputeBackend, data : Any) -> ARRAY_TYPE:
+    return torch.tensor(other_backend.to_numpy(data), device=_matching_device(other_backend, data))
+
+from_other_backend_with_info = get_from_other_backend_with_info_function(
+    is_backendarray=is_backendarray,
+    paths=[
+        ("dlpack", _transfer_dlpack),
+        ("buffer", _transfer_buffer),
+        ("bitcast", _transfer_bitcast),
+        ("copy", _transfer_copy),
+    ],
+    func_device=lambda data: data.device,
+)
+
 def from_other_backend(
     other_backend: ComputeBackend,
     data: Any,
     /,
 ) -> ARRAY_TYPE:
-    dat_dlpack = other_backend.to_dlpack(data)
-    return torch.from_dlpack(dat_dlpack)
+    return from_other_backend_with_info(other_backend, data)[0]
 
 def to_numpy(
     data : ARRAY_TYPE
@@ -68,7 +111,8 @@ def to_dlpack(
     data: ARRAY_TYPE,
     /,
 ) -> SupportsDLPack:
-    return data
+    # Tensors that require grad cannot be exported through DLPack, detaching does not copy
+    return data.detach()
 
 def dtype_is_real_integer(
     dtype: DTYPE_TYPE
@@ -95,15 +139,131 @@ def dtype_is_boolean(
 ) -> bool:
     return dtype == torch.bool
 
-from .._common.implementations import get_abbreviate_array_function, get_map_fn_over_arrays_function
+from .._common.implementations import get_abbreviate_array_function, get_map_fn_over_arrays_batched_function
+from .._common.tree import get_tree_functions
+from array_api_compat import device as compat_device
+from .._common.jit import get_jit_function
+from .._common.async_transfer import TransferFuture, submit_host_transfer, get_prefetch_function
 from array_api_compat import torch as compat_module
 abbreviate_array = get_abbreviate_array_function(
-    compat_module, 
-    default_integer_dtype=default_integer_dtype, 
+    backend=compat_module,
+    func_to_numpy=to_numpy,
     func_dtype_is_real_floating=dtype_is_real_floating,
     func_dtype_is_real_integer=dtype_is_real_integer,
-    func_dtype_is_boolean=dtype_is_boolean
+    func_dtype_is_boolean=dtype_is_boolean,
 )
-map_fn_over_arrays = get_map_fn_over_arrays_function(
+tree_flatten, tree_unflatten, tree_map, map_fn_over_arrays = get_tree_functions(
     is_backendarray=is_backendarray,
-)
\ No newline at end of file
+)
+map_fn_over_arrays_batched = get_map_fn_over_arrays_batched_function(
+    backend=compat_module,
+    func_device=compat_device,
+    func_tree_flatten=tree_flatten,
+    func_tree_unflatten=tree_unflatten,
+)
+
+# Transfers also move host (numpy) arrays, which the backend tree functions keep as static values
+_transfer_tree_flatten, _transfer_tree_unflatten, _, _ = get_tree_functions(
+    is_backendarray=lambda data: isinstance(data, (torch.Tensor, np.ndarray)),
+)
+
+# Maximum number of free pinned staging buffers kept per (dtype, number of elements)
+MAX_PINNED_STAGING_BUFFERS = 8
+
+class _PinnedStagingPool:
+    """
+    Reusable pinned host buffers for the CUDA transfers of pageable tensors.
+    Pinning memory is a slow synchronous call, so it only happens the first time a buffer of a given size is needed;
+    later transfers copy into a free buffer (which also snapshots the source) and issue a non-blocking copy from it.
+    """
+    def __init__(self) -> None:
+        self._free : Dict[Tuple[torch.dtype, int], List[torch.Tensor]] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, dtype : torch.dtype, numel : int) -> torch.Tensor:
+        with self._lock:
+            buffers = self._free.get((dtype, numel))
+            if buffers:
+                return buffers.pop()
+        return torch.empty(numel, dtype=dtype, pin_memory=True)
+
+    def release(self, buffers : List[torch.Tensor]) -> None:
+        with self._lock:
+            for buffer in buffers:
+                free = self._free.setdefault((buffer.dtype, buffer.numel()), [])
+                if len(free) < MAX_PINNED_STAGING_BUFFERS:
+                    free.append(buffer)
+
+_staging_pool = _PinnedStagingPool()
+
+def _as_tensor(data : Any) -> ARRAY_TYPE:
+    return from_numpy(data) if isinstance(data, np.ndarray) else data
+
+def _to_cuda_non_blocking(data : ARRAY_TYPE, device : torch.device, staging_buffers : List[torch.Tensor]) -> ARRAY_TYPE:
+    if data.device.type == "cpu" and not data.is_pinned():
+        # Copies from pageable memory are synchronous, stage them through a pinned buffer
+        staging = _staging_pool.acquire(data.dtype, data.numel())
+        staging_buffers.append(staging)
+        data = staging.view(data.shape).copy_(data)
+    return data.to(device, non_blocking=True, copy=True)
+
+def async_to_device(
+    data : Any,
+    device : DEVICE_TYPE,
+    /,
+    *,
+    stream : Optional[torch.cuda.Stream] = None,
+) -> TransferFuture:
+    """
+    Start copying every tensor (and numpy array) of `data` to `device` in the background.
+    CUDA transfers copy pageable tensors into reused pinned buffers and issue them with `non_blocking=True` (on `stream` if given),
+    completion is tracked with a CUDA event; the source arrays can be modified as soon as this function returns.
+    Transfers to other devices run on a background thread (the CPU stand-in for a device transfer),
+    the source arrays must not be modified until the transfer is done.
+    """
+    device = torch.device(device)
+    leaves, treedef = _transfer_tree_flatten(data)
+    if device.type != "cuda":
+        if stream is not None:
+            raise ValueError(f"The stream argument is only supported for CUDA devices, got {device}")
+        return submit_host_transfer(lambda: _transfer_tree_unflatten(treedef, [_as_tensor(leaf).to(device, copy=True) for leaf in leaves]))
+
+    staging_buffers : List[torch.Tensor] = []
+    with (torch.cuda.stream(stream) if stream is not None else contextlib.nullcontext()):
+        new_leaves = [_to_cuda_non_blocking(_as_tensor(leaf), device, staging_buffers) for leaf in leaves]
+        event = torch.cuda.Event()
+        event.record()
+
+    def release_staging() -> None:
+        # The staging buffers can be reused once the copies out of them are done
+        if staging_buffers:
+            _staging_pool.release(staging_buffers)
+            staging_buffers.clear()
+
+    def done() -> bool:
+        finished = event.query()
+        if finished:
+            release_staging()
+        return finished
+
+    def wait() -> Any:
+        event.synchronize()
+        release_staging()
+        if stream is not None:
+            # The tensors were allocated on `stream` but will be used on the current stream
+            consumer_stream = torch.cuda.current_stream(device)
+            for leaf in new_leaves:
+                leaf.record_stream(consumer_stream)
+        return _transfer_tree_unflatten(treedef, new_leaves)
+    return TransferFuture(func_done=done, func_wait=wait)
+
+prefetch = get_prefetch_function(async_to_device)
+
+# Static shapes, so that a new batch size is a new compilation (bounded with `bucket_sizes`) instead of a dynamic-shape graph
+jit = get_jit_function(
+    backend=compat_module,
+    func_device=compat_device,
+    func_tree_flatten=tree_flatten,
+    func_tree_map=tree_map,
+    func_compile=lambda fn, static_argnames, **compile_kwargs: torch.compile(fn, **{"dynamic": False, **compile_kwargs}),
+)
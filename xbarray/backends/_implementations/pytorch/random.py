@@ -1,6 +1,8 @@
-from typing import Union, Optional, Tuple, Any
+from typing import Union, Optional, Tuple, Any, Sequence
 from ._typing import ARRAY_TYPE, DTYPE_TYPE, DEVICE_TYPE, RNG_TYPE
 import torch
+from array_api_compat import torch as compat_module
+from .._common.random_stream import RandomStream, RandomStreamBatch, DEFAULT_BUFFER_SIZE
 
 __all__ = [
     "random_number_generator",
@@ -9,7 +11,11 @@ __all__ = [
     "random_exponential",
     "random_normal",
     "random_geometric",
-    "random_permutation"
+    "random_permutation",
+    "random_stream",
+    "random_number_generator_batch",
+    "RandomStream",
+    "RandomStreamBatch",
 ]
 
 def random_number_generator(
@@ -25,6 +31,31 @@ def random_number_generator(
     return rng
 
 
+def random_stream(
+    seed : Optional[int] = None,
+    *,
+    device : Optional[DEVICE_TYPE] = None,
+    buffer_size : int = DEFAULT_BUFFER_SIZE,
+) -> RandomStream:
+    """
+    Create a counter-based (Philox4x32) random stream, which can be passed as `rng` to all sampling functions.
+    The random words are generated on `device`, and are the same as on every other device and backend.
+    """
+    return RandomStream(compat_module, seed, device=torch.device("cpu" if device is None else device), buffer_size=buffer_size)
+
+def random_number_generator_batch(
+    seeds : Sequence[int],
+    *,
+    device : Optional[DEVICE_TYPE] = None,
+    buffer_size : int = DEFAULT_BUFFER_SIZE,
+) -> RandomStreamBatch:
+    """
+    Create a batch of independent counter-based random streams, one per seed.
+    Passed as `rng` to the sampling functions, a draw of shape `shape` returns an array of shape (len(seeds), *shape) in one vectorized call,
+    whose i-th row is the same as the draw from `random_stream(seeds[i])`.
+    """
+    return RandomStreamBatch(compat_module, seeds, device=torch.device("cpu" if device is None else device), buffer_size=buffer_size)
+
 def random_discrete_uniform(
     shape : Union[int, Tuple[int, ...]], 
     /,
@@ -35,6 +66,8 @@ def random_discrete_uniform(
     dtype : Optional[DTYPE_TYPE] = None, 
     device : Optional[DEVICE_TYPE] = None
 ) -> Tuple[RNG_TYPE, ARRAY_TYPE]:
+    if isinstance(rng, RandomStream):
+        return rng, rng.discrete_uniform(shape, from_num, to_num, dtype=dtype or torch.int64, device=device)
     t = torch.randint(int(from_num), int(to_num), shape, generator=rng, dtype=dtype, device=device)
     return rng, t
 
@@ -47,6 +80,8 @@ def random_uniform(
     dtype : Optional[DTYPE_TYPE] = None, 
     device : Optional[DEVICE_TYPE] = None
 ) -> Tuple[RNG_TYPE, ARRAY_TYPE]:
+    if isinstance(rng, RandomStream):
+        return rng, rng.uniform(shape, low, high, dtype=dtype or torch.get_default_dtype(), device=device)
     t = torch.rand(shape, generator=rng, dtype=dtype, device=device)
     t = t * (high - low) + low
     return rng, t
@@ -60,6 +95,8 @@ def random_exponential(
     dtype : Optional[DTYPE_TYPE] = None, 
     device : Optional[DEVICE_TYPE] = None
 ) -> Tuple[RNG_TYPE, ARRAY_TYPE]:
+    if isinstance(rng, RandomStream):
+        return rng, rng.exponential(shape, lambd, dtype=dtype or torch.get_default_dtype(), device=device)
     t = torch.empty(shape, dtype=dtype, device=device)
     t = t.exponential_(lambd, generator=rng)
     return rng, t
@@ -73,6 +110,8 @@ def random_normal(
     dtype : Optional[DTYPE_TYPE] = None, 
     device : Optional[Any] = None
 ) -> Tuple[RNG_TYPE, ARRAY_TYPE]:
+    if isinstance(rng, RandomStream):
+        return rng, rng.normal(shape, mean, std, dtype=dtype or torch.get_default_dtype(), device=device)
     t = torch.normal(mean, std, shape, generator=rng, dtype=dtype, device=device)
     return rng, t
 
@@ -85,6 +124,8 @@ def random_geometric(
     dtype: Optional[DTYPE_TYPE] = None, 
     device: Optional[Any] = None
 ) -> Tuple[RNG_TYPE, ARRAY_TYPE]:
+    if isinstance(rng, RandomStream):
+        return rng, rng.geometric(shape, p, dtype=dtype or torch.get_default_dtype(), device=device)
     t = torch.empty(shape, dtype=dtype, device=device)
     t = t.geometric_(p, generator=rng)
     return rng, t
@@ -97,5 +138,7 @@ def random_permutation(
     dtype: Optional[DTYPE_TYPE] = None,
     device: Optional[DEVICE_TYPE] = None
 ) -> Tuple[RNG_TYPE, ARRAY_TYPE]:
+    if isinstance(rng, RandomStream):
+        return rng, rng.permutation(n, dtype=dtype or torch.int64, device=device)
     t = torch.randperm(n, generator=rng, dtype=dtype, device=device)
     return rng, t
\ No newline at end of file
@@ -1,7 +1,11 @@
-from typing import Optional, Generic, TypeVar, Dict, Union, Any, Sequence, SupportsFloat, Tuple, Type, Callable, Mapping, Protocol
+from typing import Optional, Generic, TypeVar, Dict, Union, Any, Sequence, SupportsFloat, Tuple, Type, Callable, Mapping, Protocol, List, Iterable, Iterator
 import abc
+import dataclasses
 from array_api_typing.typing_extra import *
 import numpy as np
+from ._implementations._common.tree import TreeDef
+from ._implementations._common.async_transfer import TransferFuture
+from ._implementations._common.jit import JitFunction, JitCacheInfo
 
 ArrayAPISetIndex = SetIndex
 ArrayAPIGetIndex = GetIndex
@@ -9,6 +13,11 @@ ArrayAPIGetIndex = GetIndex
 __all__ = [
     "RNGBackend",
     "ComputeBackend",
+    "TransferInfo",
+    "TreeDef",
+    "TransferFuture",
+    "JitFunction",
+    "JitCacheInfo",
     "BArrayType",
     "BDeviceType",
     "BDtypeType",
@@ -26,6 +35,27 @@ BArrayType = TypeVar("BArrayType", covariant=True, bound=ArrayAPIArray)
 BDeviceType = TypeVar("BDeviceType", covariant=True, bound=ArrayAPIDevice)
 BDtypeType = TypeVar("BDtypeType", covariant=True, bound=ArrayAPIDType)
 BRNGType = TypeVar("BRNGType", covariant=True)
+
+@dataclasses.dataclass(frozen=True)
+class TransferInfo:
+    """
+    Describes how an array was moved from one backend to another.
+
+    Attributes:
+        method: The transfer path that was used, one of
+            "identity" (the array already belongs to the target backend),
+            "dlpack" (DLPack capsule exchange),
+            "buffer" (buffer sharing through `__array__`),
+            "bitcast" (DLPack / buffer exchange of a same-width integer view, for dtypes DLPack or NumPy cannot describe such as bfloat16),
+            or "copy" (a copy through host memory).
+        zero_copy: Whether the resulting array shares memory with the source array.
+        device_changed: Whether the resulting array is on another device than the source array, e.g. a GPU array
+            copied through host memory into a backend without a matching device (which then uses its default device).
+    """
+    method : str
+    zero_copy : bool
+    device_changed : bool = False
+
 class RNGBackend(Protocol[BArrayType, BDeviceType, BDtypeType, BRNGType]):
     @abc.abstractmethod
     def random_number_generator(
@@ -35,6 +65,20 @@ class RNGBackend(Protocol[BArrayType, BDeviceType, BDtypeType, BRNGType]):
         device : Optional[BDeviceType] = None
     ) -> BRNGType:
         raise NotImplementedError
+
+    @abc.abstractmethod
+    def random_number_generator_batch(
+        self,
+        seeds : Sequence[int],
+        *,
+        device : Optional[BDeviceType] = None
+    ) -> Any:
+        """
+        Create a batch of independent generators, one per seed (a batch of keys on JAX, a batch of counter-based streams on NumPy / PyTorch).
+        Passed as `rng` to the sampling functions below, a draw of shape `shape` returns an array of shape (len(seeds), *shape) in one vectorized call,
+        whose i-th row matches the draw from the generator seeded with `seeds[i]` (`random_number_generator` on JAX, `random_stream` on NumPy / PyTorch).
+        """
+        raise NotImplementedError
     
     @abc.abstractmethod
     def random_discrete_uniform(
@@ -153,6 +197,19 @@ class ComputeBackend(ArrayAPINamespace[BArrayType, BDeviceType, BDtypeType], Pro
         """
         Convert an array from another backend to this backend.
         The other backend must be compatible with the ArrayAPI.
+        The cheapest available path is used (DLPack, then buffer sharing, then a copy), and the dtype is always preserved.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def from_other_backend_with_info(
+        self,
+        other_backend : "ComputeBackend",
+        data : ArrayAPIArray,
+        /
+    ) -> Tuple[BArrayType, TransferInfo]:
+        """
+        Same as `from_other_backend`, but also reports which transfer path was used and whether the transfer was zero-copy.
         """
         raise NotImplementedError
 
@@ -197,3 +254,93 @@ class ComputeBackend(ArrayAPINamespace[BArrayType, BDeviceType, BDtypeType], Pro
         Map a function over arrays in a data structure and produce a new data structure with the same shape.
         This is useful for applying a function to all arrays in a nested structure.
         """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def map_fn_over_arrays_batched(self, data : Any, func : Callable[[BArrayType], BArrayType]) -> Any:
+        """
+        Same as `map_fn_over_arrays` for an elementwise `func` (e.g. a dtype cast, scaling, clipping or `to_device`),
+        but arrays with the same dtype and device are concatenated into one flat buffer so that `func` is only called once per group.
+        Arrays in the result may share memory.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def tree_flatten(self, data : Any) -> Tuple[List[BArrayType], TreeDef]:
+        """
+        Flatten a nested data structure (mappings, sequences, namedtuples and dataclasses) into its arrays and its structure.
+        Non-array values are kept in the structure.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def tree_unflatten(self, treedef : TreeDef, leaves : Sequence[BArrayType]) -> Any:
+        """
+        Rebuild a nested data structure from the structure and arrays returned by `tree_flatten`.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def tree_map(self, func : Callable[..., BArrayType], tree : Any, *rest : Any) -> Any:
+        """
+        Map a function over the arrays of one or several nested data structures with the same structure.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def async_to_device(
+        self,
+        data : Any,
+        device : BDeviceType,
+        /,
+        *,
+        stream : Optional[Any] = None,
+    ) -> TransferFuture:
+        """
+        Start copying every array of a (nested) data structure to `device` without blocking, and return a handle to the transfer.
+        Host numpy arrays in the structure are transferred too (converted to arrays of this backend).
+        `handle.result()` waits for the transfer and returns the data structure with the copied arrays, `handle.done()` polls it.
+        Backends without native asynchronous transfers (e.g. NumPy or CPU targets) copy on a background thread.
+        Unless the backend documents otherwise, the source arrays must not be modified until the transfer is done.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def prefetch(
+        self,
+        iterable : Iterable[Any],
+        device : BDeviceType,
+        /,
+        *,
+        buffer_size : int = 2,
+        stream : Optional[Any] = None,
+    ) -> Iterator[Any]:
+        """
+        Iterate over (nested) data structures with their arrays moved to `device`,
+        transferring the next `buffer_size` items in the background while the current one is being used.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def jit(
+        self,
+        fn : Callable,
+        /,
+        *,
+        static_argnames : Union[str, Sequence[str]] = (),
+        bucket_sizes : Optional[Union[str, Sequence[int]]] = None,
+        batch_argnames : Optional[Union[str, Sequence[str]]] = None,
+        **compile_kwargs : Any,
+    ) -> JitFunction:
+        """
+        Compile a function written against this backend: `jax.jit` on JAX, `torch.compile` (static shapes) on PyTorch,
+        the function itself on NumPy. `compile_kwargs` are forwarded to the compiler.
+        The function is compiled again for every new signature (argument structure, array shapes / dtypes / devices,
+        values of `static_argnames`), counted by `jitted.cache_info()` as misses.
+
+        With `bucket_sizes` (sorted sizes, or "pow2" for powers of two), the leading (batch) axis of the array arguments
+        (`batch_argnames`, all non-static ones by default) is padded up to the next bucket by repeating its last row,
+        and the outputs with the padded batch size are sliced back, so that only one signature is compiled per bucket.
+        This requires a function that is independent along the batch axis.
+        """
+        raise NotImplementedError
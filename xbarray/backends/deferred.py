@@ -0,0 +1,856 @@
+"""
+A compute backend wrapper that defers the array operations of another backend into an expression graph.
+
+`LazyComputeBackend(inner_backend)` exposes the same names as `inner_backend`, but its arrays are `LazyArray`s:
+the elementwise operations (arithmetic, comparisons, `where`, `clip`, `astype`, the math functions, ...) and the structural ones
+(basic indexing, reshapes, axis permutations, `stack` / `concat`, reductions, `matmul`, ...) are only recorded, with the shape
+and dtype of their result. The graph is evaluated on demand, when an array is materialized by `backend.to_numpy(x)`,
+`bool(x)` (and the other Python scalar conversions), `x.compute()` or `backend.compute(*arrays)`.
+Only the operations the materialized arrays depend on are evaluated, as one program lowered to the inner backend:
+    - jax: the whole program in one `jax.jit`,
+    - pytorch: the whole program in one `torch.compile`,
+    - numpy: consecutive elementwise operations with the same output shape are evaluated block by block (`block_size` elements
+      at a time), so that their intermediates stay in cache and are never allocated at full size.
+Compiled programs are cached per graph structure (operations, constants by type and value, and static arguments), so a function called in a loop
+is only compiled once per input shapes.
+
+The other functions (e.g. `take`, `linalg.svd`, the creation functions and the samplers) are fusion barriers: their lazy arguments
+are materialized and they run eagerly on the inner backend.
+`LazyArray`s are immutable values, like JAX arrays: `x[key] = value` rebinds `x` to an updated copy instead of writing into memory
+shared with other arrays.
+"""
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from types import ModuleType
+import collections
+import dataclasses
+import itertools
+import math
+import operator
+import numpy as np
+from .base import ComputeBackend
+from ._implementations._common.elementwise import ELEMENTWISE_FUNCTIONS
+
+__all__ = [
+    "ELEMENTWISE_FUNCTIONS",
+    "STRUCTURAL_FUNCTIONS",
+    "DEFAULT_BLOCK_SIZE",
+    "LazyArray",
+    "LazyComputeBackend",
+]
+
+_ELEMENTWISE = frozenset(ELEMENTWISE_FUNCTIONS)
+
+# Number of elements evaluated at a time by the NumPy lowering (256 KiB of float64, so the intermediates of a block stay in L2 cache)
+DEFAULT_BLOCK_SIZE : int = 32768
+
+@dataclasses.dataclass(frozen=True)
+class _SliceKey:
+    # Hashable stand-in for a slice of a recorded index (slices are not hashable before Python 3.12)
+    start : Optional[int]
+    stop : Optional[int]
+    step : Optional[int]
+
+@dataclasses.dataclass(frozen=True)
+class _Ref:
+    # Reference to a value of a program (an input or the output of an instruction)
+    slot : int
+
+def _encode_key(key : Any) -> Optional[Tuple[Any, ...]]:
+    # Hashable form of a basic index (integers, slices, None and Ellipsis), None for any other index
+    items = key if isinstance(key, tuple) else (key,)
+    encoded = []
+    for item in items:
+        if isinstance(item, slice):
+            bounds = (item.start, item.stop, item.step)
+            if not all(bound is None or (isinstance(bound, int) and not isinstance(bound, bool)) for bound in bounds):
+                return None
+            encoded.append(_SliceKey(*bounds))
+        elif item is None or item is Ellipsis or (isinstance(item, int) and not isinstance(item, bool)):
+            encoded.append(item)
+        else:
+            return None
+    return tuple(encoded)
+
+def _decode_key(key : Tuple[Any, ...]) -> Tuple[Any, ...]:
+    return tuple(slice(item.start, item.stop, item.step) if isinstance(item, _SliceKey) else item for item in key)
+
+def _getitem(x : Any, key : Tuple[Any, ...]) -> Any:
+    return x[_decode_key(key)]
+
+def _dummy(shape : Tuple[int, ...]) -> np.ndarray:
+    # Zero-stride array of any shape without memory, its views give the shapes of the view functions
+    return np.broadcast_to(np.empty((), dtype=np.bool_), shape)
+
+def _normalize_axis(axis : int, ndim : int) -> int:
+    if not -ndim <= axis < ndim:
+        raise ValueError(f"Axis {axis} is out of bounds for an array with {ndim} dimensions.")
+    return axis % ndim
+
+def _reduced_shape(shape : Tuple[int, ...], axis : Any = None, keepdims : bool = False, **_ : Any) -> Tuple[int, ...]:
+    if axis is None:
+        axes = set(range(len(shape)))
+    else:
+        axes = {_normalize_axis(a, len(shape)) for a in (axis if isinstance(axis, (tuple, list)) else (axis,))}
+    return tuple(1 if i in axes else size for i, size in enumerate(shape) if keepdims or i not in axes)
+
+def _reshaped_shape(shape : Tuple[int, ...], new_shape : Any, **_ : Any) -> Tuple[int, ...]:
+    new_shape = tuple(new_shape) if isinstance(new_shape, (tuple, list)) else (new_shape,)
+    size = math.prod(shape)
+    known = math.prod(s for s in new_shape if s != -1)
+    if new_shape.count(-1) > 1 or (-1 in new_shape and (known == 0 or size % known != 0)) or (-1 not in new_shape and known != size):
+        raise ValueError(f"Cannot reshape an array of shape {shape} into shape {new_shape}.")
+    return tuple(size // known if s == -1 else s for s in new_shape)
+
+def _stacked_shape(shapes : Sequence[Tuple[int, ...]], axis : int = 0) -> Tuple[int, ...]:
+    if len(shapes) == 0 or any(shape != shapes[0] for shape in shapes):
+        raise ValueError(f"Cannot stack arrays of shapes {list(shapes)}, they must all have the same shape.")
+    axis = _normalize_axis(axis, len(shapes[0]) + 1)
+    return shapes[0][:axis] + (len(shapes),) + shapes[0][axis:]
+
+def _concatenated_shape(shapes : Sequence[Tuple[int, ...]], axis : Optional[int] = 0) -> Tuple[int, ...]:
+    if axis is None:
+        return (sum(math.prod(shape) for shape in shapes),)
+    if len(shapes) == 0:
+        raise ValueError("Cannot concatenate an empty sequence of arrays.")
+    axis = _normalize_axis(axis, len(shapes[0]))
+    if any(len(shape) != len(shapes[0]) or shape[:axis] + shape[axis + 1:] != shapes[0][:axis] + shapes[0][axis + 1:] for shape in shapes):
+        raise ValueError(f"Cannot concatenate arrays of shapes {list(shapes)} along axis {axis}.")
+    return shapes[0][:axis] + (sum(shape[axis] for shape in shapes),) + shapes[0][axis + 1:]
+
+def _matmul_shape(shape1 : Tuple[int, ...], shape2 : Tuple[int, ...]) -> Tuple[int, ...]:
+    if len(shape1) == 0 or len(shape2) == 0:
+        raise ValueError("matmul does not accept 0-dimensional arrays.")
+    a = (1,) + shape1 if len(shape1) == 1 else shape1
+    b = shape2 + (1,) if len(shape2) == 1 else shape2
+    if a[-1] != b[-2]:
+        raise ValueError(f"matmul shapes {shape1} and {shape2} do not match.")
+    shape = np.broadcast_shapes(a[:-2], b[:-2]) + (a[-2], b[-1])
+    if len(shape2) == 1:
+        shape = shape[:-1]
+    if len(shape1) == 1:
+        shape = shape[:-2] + shape[-1:] if len(shape2) != 1 else shape[:-1]
+    return shape
+
+def _vecdot_shape(shape1 : Tuple[int, ...], shape2 : Tuple[int, ...], axis : int = -1) -> Tuple[int, ...]:
+    shape = np.broadcast_shapes(shape1, shape2)
+    axis = _normalize_axis(axis, len(shape))
+    return shape[:axis] + shape[axis + 1:]
+
+def _cross_shape(shape1 : Tuple[int, ...], shape2 : Tuple[int, ...], axis : int = -1) -> Tuple[int, ...]:
+    return np.broadcast_shapes(shape1, shape2)
+
+# Deferred functions that are not elementwise, with the rule giving their output shape
+# (called like the function, with the arrays replaced by their shapes)
+STRUCTURAL_FUNCTIONS : Dict[str, Callable[..., Tuple[int, ...]]] = {
+    "getitem": lambda shape, key: _dummy(shape)[_decode_key(key)].shape,
+    "reshape": lambda shape, new_shape, **kwargs: _reshaped_shape(shape, new_shape),
+    "expand_dims": lambda shape, axis=0: np.expand_dims(_dummy(shape), axis).shape,
+    "squeeze": lambda shape, axis: np.squeeze(_dummy(shape), axis).shape,
+    "permute_dims": lambda shape, axes: np.transpose(_dummy(shape), axes).shape,
+    "moveaxis": lambda shape, source, destination: np.moveaxis(_dummy(shape), source, destination).shape,
+    "broadcast_to": lambda shape, new_shape: np.broadcast_to(_dummy(shape), new_shape).shape,
+    "matrix_transpose": lambda shape: np.swapaxes(_dummy(shape), -1, -2).shape,
+    "linalg.matrix_transpose": lambda shape: np.swapaxes(_dummy(shape), -1, -2).shape,
+    "stack": _stacked_shape,
+    "concat": _concatenated_shape,
+    "sum": _reduced_shape,
+    "prod": _reduced_shape,
+    "mean": _reduced_shape,
+    "max": _reduced_shape,
+    "min": _reduced_shape,
+    "any": _reduced_shape,
+    "all": _reduced_shape,
+    "linalg.vector_norm": _reduced_shape,
+    "matmul": _matmul_shape,
+    "linalg.matmul": _matmul_shape,
+    "vecdot": _vecdot_shape,
+    "linalg.vecdot": _vecdot_shape,
+    "linalg.cross": _cross_shape,
+}
+
+# Structural functions whose output has the dtype of their first argument
+_SAME_DTYPE_FUNCTIONS = (
+    "getitem", "reshape", "expand_dims", "squeeze", "permute_dims", "moveaxis", "broadcast_to",
+    "matrix_transpose", "linalg.matrix_transpose",
+)
+# Structural functions whose output has the promoted dtype of their arguments
+# (the others get it from a probe, the function applied to 1-element arrays of the same dtypes)
+_PROMOTED_DTYPE_FUNCTIONS = ("stack", "concat", "matmul", "linalg.matmul", "vecdot", "linalg.vecdot", "linalg.cross")
+# Positional name of the shape argument of the structural functions that take one, renamed for the shape rules
+_SHAPE_ARGNAMES = {"reshape": "shape", "broadcast_to": "shape"}
+
+class _Node:
+    """
+    A value of the expression graph, either computed (`value` is set) or the output of a deferred function of other nodes.
+    """
+    __slots__ = ("op", "args", "kwargs", "inputs", "shape", "dtype", "device", "value")
+
+    def __init__(
+        self, op : str, args : Tuple[Any, ...], kwargs : Dict[str, Any], inputs : Tuple["_Node", ...],
+        shape : Tuple[int, ...], dtype : Any, device : Any, value : Any = None,
+    ) -> None:
+        self.op = op
+        self.args = args
+        self.kwargs = kwargs
+        # The distinct nodes among the arguments
+        self.inputs = inputs
+        self.shape = shape
+        self.dtype = dtype
+        self.device = device
+        self.value = value
+
+    def set_value(self, value : Any) -> None:
+        # A computed node no longer references its inputs, so the rest of the graph can be released
+        self.value = value
+        self.op = "leaf"
+        self.args = ()
+        self.kwargs = {}
+        self.inputs = ()
+
+def _map_structure(value : Any, func : Callable[[Any], Any]) -> Any:
+    # Apply `func` to the leaves of nested lists / tuples (namedtuples included) / dicts
+    if isinstance(value, (list, tuple)):
+        items = [_map_structure(item, func) for item in value]
+        if isinstance(value, list):
+            return items
+        return type(value)(*items) if hasattr(value, "_fields") else tuple(items)
+    if isinstance(value, dict):
+        return type(value)((key, _map_structure(item, func)) for key, item in value.items())
+    return func(value)
+
+def _iter_structure(value : Any) -> Any:
+    if isinstance(value, (list, tuple)):
+        for item in value:
+            yield from _iter_structure(item)
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _iter_structure(item)
+    else:
+        yield value
+
+def _bind(value : Any, lookup : Callable[[int], Any]) -> Any:
+    # Replace the references of (nested tuples of) recorded arguments with their values
+    if type(value) is _Ref:
+        return lookup(value.slot)
+    if isinstance(value, tuple):
+        items = [_bind(item, lookup) for item in value]
+        return type(value)(*items) if hasattr(value, "_fields") else tuple(items)
+    return value
+
+def _resolve(inner : ComputeBackend, op : str) -> Callable:
+    if op == "getitem":
+        return _getitem
+    value = inner
+    for name in op.split("."):
+        value = getattr(value, name)
+    return value
+
+def _hashable(value : Any) -> Any:
+    # Lists (e.g. a reshape shape) are recorded as tuples, so that programs can be cached by their structure
+    if isinstance(value, list) or type(value) is tuple:
+        return tuple(_hashable(item) for item in value)
+    return value
+
+def _constant_key(value : Any) -> Any:
+    # Key of a recorded argument in the signature of a program: constants that compare equal can still give different
+    # programs (`2`, `2.0` and `True` promote differently, `0.0` and `-0.0` have different signs), so their types and signs are kept
+    if type(value) is _Ref:
+        return value
+    if isinstance(value, tuple):
+        return (type(value), tuple(_constant_key(item) for item in value))
+    if isinstance(value, (float, np.floating)):
+        return (type(value), value, math.copysign(1.0, value))
+    if isinstance(value, (complex, np.complexfloating)):
+        return (type(value), value, math.copysign(1.0, value.real), math.copysign(1.0, value.imag))
+    return (type(value), value)
+
+def _schedule(nodes : List[_Node]) -> List[_Node]:
+    # Reorder nodes (given in dependency order) so that elementwise operations with the same output shape are consecutive:
+    # a run of them is continued while possible, then the other operations whose inputs are ready go first
+    position = {id(node): index for index, node in enumerate(nodes)}
+    num_dependencies = {}
+    consumers = collections.defaultdict(list)
+    for node in nodes:
+        dependencies = [child for child in node.inputs if id(child) in position]
+        num_dependencies[id(node)] = len(dependencies)
+        for dependency in dependencies:
+            consumers[id(dependency)].append(node)
+    ready = [node for node in nodes if num_dependencies[id(node)] == 0]
+    order = []
+    shape = None
+    def priority(node : _Node) -> Tuple[int, int]:
+        if node.op in _ELEMENTWISE:
+            return (0 if node.shape == shape else 2, position[id(node)])
+        return (1, position[id(node)])
+    while ready:
+        node = min(ready, key=priority)
+        ready.remove(node)
+        order.append(node)
+        shape = node.shape if node.op in _ELEMENTWISE else None
+        for consumer in consumers[id(node)]:
+            num_dependencies[id(consumer)] -= 1
+            if num_dependencies[id(consumer)] == 0:
+                ready.append(consumer)
+    return order
+
+class _Program:
+    """
+    The operations needed to compute some nodes, in dependency order, with the computed nodes they depend on as inputs.
+    """
+    def __init__(self, roots : Sequence[_Node]) -> None:
+        order = []
+        visited = set()
+        # Iterative post-order depth first search, long chains of operations would exceed the recursion limit
+        stack = [(root, False) for root in reversed(roots)]
+        while stack:
+            node, expanded = stack.pop()
+            if expanded:
+                order.append(node)
+                continue
+            if id(node) in visited:
+                continue
+            visited.add(id(node))
+            stack.append((node, True))
+            stack.extend((child, False) for child in reversed(node.inputs))
+        self.inputs = [node for node in order if node.value is not None]
+        self.nodes = _schedule([node for node in order if node.value is None])
+        slots = {id(node): slot for slot, node in enumerate(self.inputs + self.nodes)}
+        to_ref = lambda value: _Ref(slots[id(value)]) if isinstance(value, _Node) else value
+        self.instructions = [
+            (node.op, _map_structure(node.args, to_ref), tuple(sorted(_map_structure(node.kwargs, to_ref).items())))
+            for node in self.nodes
+        ]
+        self.outputs = tuple(slots[id(root)] for root in roots)
+        # Slots whose last use is each instruction, dropped after it (except the outputs)
+        self.last_use = {}
+        for index, node in enumerate(self.nodes):
+            for child in node.inputs:
+                self.last_use[slots[id(child)]] = index
+        self.released : List[List[int]] = [[] for _ in self.instructions]
+        for slot, index in self.last_use.items():
+            if slot not in self.outputs:
+                self.released[index].append(slot)
+
+    @property
+    def signature(self) -> Tuple[Any, ...]:
+        return (len(self.inputs), tuple((op, _constant_key(args), _constant_key(kwargs)) for op, args, kwargs in self.instructions), self.outputs)
+
+    def run(self, inner : ComputeBackend, inputs : Sequence[Any]) -> Tuple[Any, ...]:
+        env = list(inputs) + [None] * len(self.instructions)
+        num_inputs = len(self.inputs)
+        for index, (op, args, kwargs) in enumerate(self.instructions):
+            env[num_inputs + index] = _resolve(inner, op)(*_bind(args, env.__getitem__), **{key: _bind(item, env.__getitem__) for key, item in kwargs})
+            for slot in self.released[index]:
+                env[slot] = None
+        return tuple(env[slot] for slot in self.outputs)
+
+    def run_blocked(self, inner : ComputeBackend, block_size : int) -> Tuple[Any, ...]:
+        # Like `run`, but every run of consecutive elementwise instructions with the same (large) output shape is evaluated block by block
+        env = [node.value for node in self.inputs] + [None] * len(self.instructions)
+        num_inputs = len(self.inputs)
+        index = 0
+        while index < len(self.instructions):
+            shape = self.nodes[index].shape
+            end = index + 1
+            if self.instructions[index][0] in _ELEMENTWISE and math.prod(shape) > block_size:
+                while end < len(self.instructions) and self.instructions[end][0] in _ELEMENTWISE and self.nodes[end].shape == shape:
+                    end += 1
+            if end - index > 1:
+                self._run_blocks(inner, env, index, end, block_size)
+            else:
+                op, args, kwargs = self.instructions[index]
+                env[num_inputs + index] = _resolve(inner, op)(*_bind(args, env.__getitem__), **{key: _bind(item, env.__getitem__) for key, item in kwargs})
+            for released in self.released[index:end]:
+                for slot in released:
+                    env[slot] = None
+            index = end
+        return tuple(env[slot] for slot in self.outputs)
+
+    def _run_blocks(self, inner : ComputeBackend, env : List[Any], start : int, stop : int, block_size : int) -> None:
+        num_inputs = len(self.inputs)
+        shape = self.nodes[start].shape
+        run_slots = range(num_inputs + start, num_inputs + stop)
+        # Only the values used after the run (or returned) are written out at full size
+        kept = {
+            slot for slot in run_slots
+            if slot in self.outputs or self.last_use.get(slot, -1) >= stop
+        }
+        for slot in kept:
+            env[slot] = np.empty(shape, dtype=self.nodes[slot - num_inputs].dtype)
+        calls = [
+            (slot, _resolve(inner, op), args, kwargs, self.released[slot - num_inputs])
+            for slot, (op, args, kwargs) in zip(run_slots, self.instructions[start:stop])
+        ]
+        external = {
+            child_slot for _, _, args, kwargs, _ in calls
+            for child_slot in (item.slot for item in _iter_structure((args, kwargs)) if type(item) is _Ref)
+            if child_slot not in run_slots
+        }
+        # Blocks along the first axis whose trailing axes fit in a block, with all the indices of the leading axes
+        axis = next(axis for axis in range(len(shape)) if math.prod(shape[axis + 1:]) <= block_size)
+        chunk = max(1, block_size // math.prod(shape[axis + 1:]))
+        for lead in itertools.product(*(range(size) for size in shape[:axis])):
+            for begin in range(0, shape[axis], chunk):
+                block = slice(begin, begin + chunk)
+                # The parts of the inputs of the run needed by the block, then the block of every instruction
+                local = {}
+                for slot in external:
+                    array = env[slot]
+                    local[slot] = array[_block_index(array.shape, len(shape), lead, axis, block)] if getattr(array, "ndim", 0) > 0 else array
+                for slot, func, args, kwargs, released in calls:
+                    value = func(*_bind(args, local.__getitem__), **{key: _bind(item, local.__getitem__) for key, item in kwargs})
+                    if slot in kept:
+                        env[slot][lead + (block,)] = value
+                    local[slot] = value
+                    # Dropping the dead intermediates of the block lets the next operations reuse their (cached) memory
+                    for released_slot in released:
+                        local.pop(released_slot, None)
+
+def _block_index(array_shape : Tuple[int, ...], ndim : int, lead : Tuple[int, ...], axis : int, block : slice) -> Tuple[Any, ...]:
+    # Index of the part of a (broadcast) input array needed by one block of the output
+    index = []
+    for input_axis, size in enumerate(array_shape):
+        output_axis = input_axis + ndim - len(array_shape)
+        if output_axis < axis:
+            index.append(0 if size == 1 else lead[output_axis])
+        elif output_axis == axis:
+            index.append(slice(None) if size == 1 else block)
+        else:
+            index.append(slice(None))
+    return tuple(index)
+
+def _binary_method(op : str, reflected : bool = False) -> Callable[["LazyArray", Any], "LazyArray"]:
+    def method(self : "LazyArray", other : Any) -> "LazyArray":
+        return self._backend._record(op, (other, self) if reflected else (self, other), {})
+    method.__name__ = op
+    return method
+
+def _unary_method(op : str) -> Callable[["LazyArray"], "LazyArray"]:
+    def method(self : "LazyArray") -> "LazyArray":
+        return self._backend._record(op, (self,), {})
+    method.__name__ = op
+    return method
+
+def _reduction_method(op : str) -> Callable[..., "LazyArray"]:
+    def method(self : "LazyArray", axis : Any = None, keepdims : bool = False) -> "LazyArray":
+        return self._backend._record(op, (self,), {"axis": axis, "keepdims": keepdims})
+    method.__name__ = op
+    return method
+
+class LazyArray:
+    """
+    An array of a `LazyComputeBackend`: a node of its expression graph, computed when materialized.
+    `shape`, `dtype` and `device` are known without computing it.
+    """
+    # NumPy defers the operators with NumPy arrays / scalars to the reflected operators below
+    __array_ufunc__ = None
+    __array_priority__ = 1000
+    __hash__ = None
+
+    def __init__(self, backend : "LazyComputeBackend", node : _Node) -> None:
+        self._backend = backend
+        self._node = node
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        return self._node.shape
+
+    @property
+    def dtype(self) -> Any:
+        return self._node.dtype
+
+    @property
+    def device(self) -> Any:
+        return self._node.device
+
+    @property
+    def ndim(self) -> int:
+        return len(self._node.shape)
+
+    @property
+    def size(self) -> int:
+        return math.prod(self._node.shape)
+
+    @property
+    def is_computed(self) -> bool:
+        return self._node.value is not None
+
+    @property
+    def T(self) -> "LazyArray":
+        return self._backend._record("permute_dims", (self,), {"axes": tuple(reversed(range(self.ndim)))})
+
+    @property
+    def mT(self) -> "LazyArray":
+        return self._backend._record("matrix_transpose", (self,), {})
+
+    def compute(self) -> Any:
+        """
+        Evaluate the array (if not done yet) and return it as an array of the inner backend.
+        """
+        return self._backend.compute(self)
+
+    def reshape(self, *shape : Any) -> "LazyArray":
+        return self._backend._record("reshape", (self, shape[0] if len(shape) == 1 else shape), {})
+
+    def astype(self, dtype : Any) -> "LazyArray":
+        return self._backend._record("astype", (self, dtype), {})
+
+    sum = _reduction_method("sum")
+    prod = _reduction_method("prod")
+    mean = _reduction_method("mean")
+    max = _reduction_method("max")
+    min = _reduction_method("min")
+    any = _reduction_method("any")
+    all = _reduction_method("all")
+
+    __add__ = _binary_method("add")
+    __radd__ = _binary_method("add", reflected=True)
+    __sub__ = _binary_method("subtract")
+    __rsub__ = _binary_method("subtract", reflected=True)
+    __mul__ = _binary_method("multiply")
+    __rmul__ = _binary_method("multiply", reflected=True)
+    __truediv__ = _binary_method("divide")
+    __rtruediv__ = _binary_method("divide", reflected=True)
+    __floordiv__ = _binary_method("floor_divide")
+    __rfloordiv__ = _binary_method("floor_divide", reflected=True)
+    __mod__ = _binary_method("remainder")
+    __rmod__ = _binary_method("remainder", reflected=True)
+    __pow__ = _binary_method("pow")
+    __rpow__ = _binary_method("pow", reflected=True)
+    __matmul__ = _binary_method("matmul")
+    __rmatmul__ = _binary_method("matmul", reflected=True)
+    __and__ = _binary_method("bitwise_and")
+    __rand__ = _binary_method("bitwise_and", reflected=True)
+    __or__ = _binary_method("bitwise_or")
+    __ror__ = _binary_method("bitwise_or", reflected=True)
+    __xor__ = _binary_method("bitwise_xor")
+    __rxor__ = _binary_method("bitwise_xor", reflected=True)
+    __lshift__ = _binary_method("bitwise_left_shift")
+    __rlshift__ = _binary_method("bitwise_left_shift", reflected=True)
+    __rshift__ = _binary_method("bitwise_right_shift")
+    __rrshift__ = _binary_method("bitwise_right_shift", reflected=True)
+    __eq__ = _binary_method("equal")
+    __ne__ = _binary_method("not_equal")
+    __lt__ = _binary_method("less")
+    __le__ = _binary_method("less_equal")
+    __gt__ = _binary_method("greater")
+    __ge__ = _binary_method("greater_equal")
+    __neg__ = _unary_method("negative")
+    __pos__ = _unary_method("positive")
+    __abs__ = _unary_method("abs")
+    __invert__ = _unary_method("bitwise_invert")
+
+    def __getitem__(self, key : Any) -> "LazyArray":
+        encoded = _encode_key(key)
+        if encoded is not None:
+            return self._backend._record("getitem", (self, encoded), {})
+        # Advanced indexing (integer / boolean arrays) has a data dependent shape or gather, evaluated eagerly
+        value = self.compute()[self._backend._materialize(key)]
+        return self._backend._wrap_outputs(value)
+
+    def __setitem__(self, key : Any, value : Any) -> None:
+        backend = self._backend
+        array = self.compute()
+        key = backend._materialize(key)
+        value = backend._materialize(value)
+        if backend.inner_backend.simplified_name == "jax":
+            updated = array.at[key].set(value)
+        else:
+            updated = backend.inner_backend.asarray(array, copy=True)
+            updated[key] = value
+        self._node = backend._leaf(updated)
+
+    def __bool__(self) -> bool:
+        return bool(self.compute())
+
+    def __float__(self) -> float:
+        return float(self.compute())
+
+    def __int__(self) -> int:
+        return int(self.compute())
+
+    def __complex__(self) -> complex:
+        return complex(self.compute())
+
+    def __index__(self) -> int:
+        return operator.index(self.compute())
+
+    def __array__(self, dtype : Any = None, copy : Optional[bool] = None) -> np.ndarray:
+        return np.asarray(self._backend.to_numpy(self), dtype=dtype)
+
+    def __dlpack__(self, *args : Any, **kwargs : Any) -> Any:
+        return self.compute().__dlpack__(*args, **kwargs)
+
+    def __dlpack_device__(self) -> Any:
+        return self.compute().__dlpack_device__()
+
+    def __array_namespace__(self, api_version : Optional[str] = None) -> "LazyComputeBackend":
+        return self._backend
+
+    def __len__(self) -> int:
+        if self.ndim == 0:
+            raise TypeError("len() of a 0-d array")
+        return self.shape[0]
+
+    def __iter__(self) -> Any:
+        for index in range(len(self)):
+            yield self[index]
+
+    def __repr__(self) -> str:
+        state = "computed" if self.is_computed else "deferred"
+        return f"LazyArray(shape={self.shape}, dtype={self.dtype}, {state})"
+
+class _LazyNamespace:
+    """
+    Lazy view of a backend or of one of its namespaces (e.g. `linalg`), wrapping its functions on first access.
+    """
+    def __init__(self, backend : "LazyComputeBackend", inner : Any, prefix : str) -> None:
+        self._backend = backend
+        self._inner = inner
+        self._prefix = prefix
+
+    def __getattr__(self, name : str) -> Any:
+        # Only called when the normal lookup fails, wrapped values are then cached on the instance
+        value = getattr(self._inner, name)
+        full_name = self._prefix + name
+        if isinstance(value, ModuleType):
+            value = _LazyNamespace(self._backend, value, full_name + ".")
+        elif full_name in ELEMENTWISE_FUNCTIONS or full_name in STRUCTURAL_FUNCTIONS:
+            value = self._backend._recorder(full_name)
+        elif callable(value) and not isinstance(value, type):
+            value = self._backend._barrier(value)
+        else:
+            return value
+        self.__dict__[name] = value
+        return value
+
+    def __dir__(self) -> List[str]:
+        return sorted(set(dir(self._inner)) | set(self.__dict__.keys()))
+
+_program_ids = itertools.count()
+
+class LazyComputeBackend(_LazyNamespace):
+    """
+    A `ComputeBackend` whose arrays are `LazyArray`s, recording the operations of `inner_backend` into an expression graph
+    that is fused and evaluated on demand, see the module documentation.
+    Constants and dtypes (e.g. `float32`, `simplified_name`) are the ones of the inner backend.
+
+    Example:
+        backend = LazyComputeBackend(PytorchComputeBackend)
+        matrices = quaternion_to_matrix(backend, backend.from_numpy(quaternions))  # only recorded
+        result = matrices.compute()  # one compiled program, a torch.Tensor
+    """
+    ARRAY_TYPE = LazyArray
+
+    def __init__(
+        self,
+        inner_backend : ComputeBackend,
+        compile : bool = True,
+        block_size : int = DEFAULT_BLOCK_SIZE,
+        max_cached_programs : int = 256,
+        **compile_kwargs : Any,
+    ) -> None:
+        """
+        Args:
+            inner_backend: The backend doing the computations.
+            compile: Whether to compile the programs on JAX / PyTorch, evaluate them eagerly (one kernel per operation) otherwise.
+            block_size: Number of elements per block of the elementwise operations on NumPy.
+            max_cached_programs: Maximum number of compiled programs kept, the least recently used ones are dropped first.
+            compile_kwargs: Forwarded to `torch.compile`.
+        """
+        super().__init__(self, inner_backend, "")
+        self.inner_backend = inner_backend
+        self.compile = compile
+        self.block_size = block_size
+        self.max_cached_programs = max_cached_programs
+        self.compile_kwargs = compile_kwargs
+        self._programs : collections.OrderedDict = collections.OrderedDict()
+        self._dtypes : Dict[Any, Any] = {}
+
+    def __str__(self) -> str:
+        return f"lazy({self._inner})"
+
+    def __repr__(self) -> str:
+        return f"LazyComputeBackend({self._inner!r})"
+
+    def compute(self, *arrays : Any) -> Any:
+        """
+        Evaluate the given arrays in one program, sharing their common operations, and return them as arrays of the inner backend
+        (a single array for a single argument, a tuple otherwise). Arguments that are not `LazyArray`s are returned as is.
+        """
+        self._evaluate([array._node for array in arrays if isinstance(array, LazyArray)])
+        values = tuple(array._node.value if isinstance(array, LazyArray) else array for array in arrays)
+        return values[0] if len(values) == 1 else values
+
+    def is_backendarray(self, data : Any) -> bool:
+        return isinstance(data, LazyArray) or self._inner.is_backendarray(data)
+
+    def to_numpy(self, data : Any) -> np.ndarray:
+        return self._inner.to_numpy(self._materialize(data))
+
+    def device(self, x : Any) -> Any:
+        return x.device if isinstance(x, LazyArray) else self._inner.device(x)
+
+    def result_type(self, *arrays_and_dtypes : Any) -> Any:
+        return self._inner.result_type(*(x.dtype if isinstance(x, LazyArray) else x for x in arrays_and_dtypes))
+
+    def can_cast(self, from_ : Any, to : Any, /) -> bool:
+        return self._inner.can_cast(from_.dtype if isinstance(from_, LazyArray) else from_, to)
+
+    def asarray(self, obj : Any, /, *, dtype : Any = None, device : Any = None, copy : Optional[bool] = None) -> Any:
+        if isinstance(obj, LazyArray) and (device is None or device == obj.device) and not copy:
+            return obj if dtype is None or dtype == obj.dtype else self._record("astype", (obj, dtype), {})
+        return self._wrap_outputs(self._inner.asarray(self._materialize(obj), dtype=dtype, device=device, copy=copy))
+
+    # The `*_like` functions only need the shape, dtype and device of their argument
+    def empty_like(self, x : Any, /, *, dtype : Any = None, device : Any = None) -> Any:
+        return self._like("empty", x, dtype, device)
+
+    def zeros_like(self, x : Any, /, *, dtype : Any = None, device : Any = None) -> Any:
+        return self._like("zeros", x, dtype, device)
+
+    def ones_like(self, x : Any, /, *, dtype : Any = None, device : Any = None) -> Any:
+        return self._like("ones", x, dtype, device)
+
+    def full_like(self, x : Any, /, fill_value : Any, *, dtype : Any = None, device : Any = None) -> Any:
+        return self._like("full", x, dtype, device, fill_value)
+
+    def _like(self, name : str, x : Any, dtype : Any, device : Any, *fill_value : Any) -> Any:
+        if not isinstance(x, LazyArray):
+            return self._wrap_outputs(getattr(self._inner, name + "_like")(x, *fill_value, dtype=dtype, device=device))
+        value = getattr(self._inner, name)(
+            x.shape, *fill_value,
+            dtype=x.dtype if dtype is None else dtype,
+            device=x.device if device is None else device,
+        )
+        return LazyArray(self, self._leaf(value))
+
+    def _leaf(self, value : Any) -> _Node:
+        return _Node("leaf", (), {}, (), tuple(value.shape), value.dtype, self._inner.device(value), value)
+
+    def _as_node(self, value : Any) -> Any:
+        if isinstance(value, LazyArray):
+            return value._node
+        if self._inner.is_backendarray(value):
+            return self._leaf(value)
+        return value
+
+    def _record(self, op : str, args : Tuple[Any, ...], kwargs : Dict[str, Any]) -> LazyArray:
+        if len(kwargs) == 0 and not any(isinstance(arg, (list, tuple, dict)) for arg in args):
+            # Fast path of the operators and elementwise functions
+            args = tuple(self._as_node(arg) for arg in args)
+            nodes = [arg for arg in args if isinstance(arg, _Node)]
+        else:
+            args = _hashable(_map_structure(tuple(args), self._as_node))
+            kwargs = {key: _hashable(_map_structure(value, self._as_node)) for key, value in kwargs.items()}
+            nodes = [item for item in _iter_structure((args, kwargs)) if isinstance(item, _Node)]
+        to_shape = lambda value: value.shape if isinstance(value, _Node) else value
+        if op in _ELEMENTWISE:
+            shape = tuple(np.broadcast_shapes(*(node.shape for node in nodes)))
+        else:
+            shape_kwargs = dict(kwargs)
+            if op in _SHAPE_ARGNAMES and _SHAPE_ARGNAMES[op] in shape_kwargs:
+                shape_kwargs["new_shape"] = shape_kwargs.pop(_SHAPE_ARGNAMES[op])
+            shape_args = tuple(_map_structure(arg, to_shape) for arg in args)
+            shape = tuple(STRUCTURAL_FUNCTIONS[op](*shape_args, **shape_kwargs))
+        if op in _SAME_DTYPE_FUNCTIONS:
+            dtype = nodes[0].dtype
+        elif op in _PROMOTED_DTYPE_FUNCTIONS:
+            dtype = self._inner.result_type(*(node.dtype for node in nodes))
+        else:
+            dtype = self._probe_dtype(op, args, kwargs)
+        device = nodes[0].device if len(nodes) > 0 else None
+        inputs = tuple({id(node): node for node in nodes}.values())
+        return LazyArray(self, _Node(op, args, kwargs, inputs, shape, dtype, device))
+
+    def _probe_dtype(self, op : str, args : Tuple[Any, ...], kwargs : Dict[str, Any]) -> Any:
+        # The dtype of the output is the one of the function applied to 1-element arrays with the dtypes (and number of dimensions) of the inputs,
+        # cached per function, input dtypes and types of the Python scalars
+        describe = lambda value: ("array", value.dtype, len(value.shape)) if isinstance(value, _Node) else (type(value) if isinstance(value, (bool, int, float, complex)) else value)
+        try:
+            key = (op, _map_structure(args, describe), tuple(sorted(_map_structure(kwargs, describe).items())))
+            hash(key)
+        except TypeError:
+            key = None
+        if key is not None and key in self._dtypes:
+            return self._dtypes[key]
+        probe = lambda value: self._inner.ones((1,) * len(value.shape), dtype=value.dtype) if isinstance(value, _Node) else value
+        with np.errstate(all="ignore"):
+            result = _resolve(self._inner, op)(*_map_structure(args, probe), **_map_structure(kwargs, probe))
+        if key is not None:
+            self._dtypes[key] = result.dtype
+        return result.dtype
+
+    def _recorder(self, op : str) -> Callable[..., LazyArray]:
+        def deferred(*args : Any, **kwargs : Any) -> LazyArray:
+            return self._record(op, args, kwargs)
+        deferred.__name__ = op.rsplit(".", 1)[-1]
+        deferred.__qualname__ = deferred.__name__
+        deferred.__doc__ = getattr(_resolve(self._inner, op), "__doc__", None)
+        return deferred
+
+    def _barrier(self, func : Callable) -> Callable:
+        def barrier(*args : Any, **kwargs : Any) -> Any:
+            return self._wrap_outputs(func(*self._materialize(args), **self._materialize(kwargs)))
+        barrier.__name__ = getattr(func, "__name__", "barrier")
+        barrier.__qualname__ = barrier.__name__
+        barrier.__doc__ = getattr(func, "__doc__", None)
+        barrier.__wrapped__ = func
+        return barrier
+
+    def _materialize(self, data : Any) -> Any:
+        # Compute all the `LazyArray`s of a (nested) structure together, and replace them with their values
+        nodes = [item._node for item in _iter_structure(data) if isinstance(item, LazyArray)]
+        if len(nodes) == 0:
+            return data
+        self._evaluate(nodes)
+        return _map_structure(data, lambda value: value._node.value if isinstance(value, LazyArray) else value)
+
+    def _wrap_outputs(self, data : Any) -> Any:
+        return _map_structure(data, lambda value: LazyArray(self, self._leaf(value)) if self._inner.is_backendarray(value) and hasattr(value, "shape") else value)
+
+    def _evaluate(self, nodes : Sequence[_Node]) -> None:
+        pending = list({id(node): node for node in nodes if node.value is None}.values())
+        if len(pending) == 0:
+            return
+        program = _Program(pending)
+        inputs = [node.value for node in program.inputs]
+        name = self._inner.simplified_name
+        if name == "numpy":
+            outputs = program.run_blocked(self._inner, self.block_size)
+        elif self.compile and name in ("jax", "pytorch"):
+            outputs = self._compiled(program)(*inputs)
+        else:
+            outputs = program.run(self._inner, inputs)
+        for node, value in zip(pending, outputs):
+            node.set_value(value)
+
+    def _compiled(self, program : _Program) -> Callable:
+        try:
+            signature = program.signature
+            hash(signature)
+        except TypeError:
+            # Unhashable constants, the program cannot be cached
+            signature = None
+        if signature is not None and signature in self._programs:
+            self._programs.move_to_end(signature)
+            return self._programs[signature]
+        inner = self._inner
+        def run(*inputs : Any) -> Tuple[Any, ...]:
+            return program.run(inner, inputs)
+        # torch.compile caches its graphs per code object, so every program gets its own
+        run.__code__ = run.__code__.replace(co_name=f"lazy_program_{next(_program_ids)}")
+        if inner.simplified_name == "jax":
+            import jax
+            compiled = jax.jit(run)
+        else:
+            import torch
+            compiled = torch.compile(run, **self.compile_kwargs)
+        if signature is not None:
+            # The cached program only keeps the structure of the graph, not its nodes and their values
+            program.inputs = [None] * len(program.inputs)
+            program.nodes = []
+            self._programs[signature] = compiled
+            if len(self._programs) > self.max_cached_programs:
+                self._programs.popitem(last=False)
+        return compiled
@@ -0,0 +1,286 @@
+"""
+Debug mode detecting implicit host-device synchronizations of PyTorch / JAX arrays.
+
+Generic code written against `ComputeBackend` easily hides points where an array is forced to the host
+(e.g. `float(x)`, an `if backend.all(...)`, `int(n)` used as a size, `backend.to_numpy(x)`), each of which waits for
+all the queued device work. While a `HostSyncDetector` is active, the conversion methods of `torch.Tensor`
+and of the concrete JAX array class (`__bool__`, `__float__`, `__int__`, `__index__`, `item`, `tolist`, `__array__`,
+`numpy`, `nonzero` and, for non-CPU tensors, `cpu`), indexing with boolean mask arrays (whose result shape depends on
+the mask values) and the functions of the PyTorch / JAX backends that always synchronize (`to_numpy`, `abbreviate_array`)
+are patched to record every such conversion
+with its stack trace, grouped by call site (the innermost frame outside of the frameworks and of the backend implementations):
+
+    with HostSyncDetector() as detector:
+        train_step(batch)
+    print(detector.table())
+
+Only the outermost conversion is recorded (e.g. `to_numpy` and not the `.numpy()` it calls).
+NumPy reads JAX arrays through the buffer protocol, which cannot be patched, so `np.asarray(jax_array)` outside of
+the backend functions is not detected.
+The patches are global to the process and removed when the detector stops, only one detector can be active at a time.
+"""
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import dataclasses
+import importlib
+import importlib.util
+import os
+import sys
+import threading
+import traceback
+import warnings
+
+__all__ = [
+    "HostSyncError",
+    "HostSyncSite",
+    "HostSyncDetector",
+]
+
+# Conversion methods patched on the array classes of each framework
+PATCHED_METHODS : Dict[str, Tuple[str, ...]] = {
+    "pytorch": (
+        "__bool__", "__float__", "__int__", "__index__", "item", "tolist", "__array__", "numpy", "nonzero", "cpu",
+        "__getitem__", "__setitem__",
+    ),
+    "jax": ("__bool__", "__float__", "__int__", "__index__", "item", "tolist", "__array__", "__getitem__"),
+}
+# Backend functions that always synchronize, patched on the backend classes
+SYNCING_BACKEND_FUNCTIONS : Tuple[str, ...] = ("to_numpy", "abbreviate_array")
+# Patched methods that are no-ops (not conversions) on host arrays
+_DEVICE_ONLY_METHODS = ("cpu",)
+# Patched methods that only synchronize when indexing with a boolean mask array, recorded as "mask_index"
+_INDEXING_METHODS = ("__getitem__", "__setitem__")
+# Frames in these packages are skipped when looking for the call site of a synchronization
+_SKIPPED_MODULES = ("torch", "jax", "jaxlib", "numpy", "array_api_compat", "array_api_extra", "xbarray.backends._implementations")
+# (framework module, backend module, backend class) per backend name
+_BACKENDS : Dict[str, Tuple[str, str, str]] = {
+    "pytorch": ("torch", "xbarray.backends.pytorch", "PytorchComputeBackend"),
+    "jax": ("jax", "xbarray.backends.jax", "JaxComputeBackend"),
+}
+_ON_SYNC_ACTIONS = ("record", "warn", "raise")
+
+class HostSyncError(RuntimeError):
+    """
+    Raised on an implicit host synchronization by a `HostSyncDetector` with `on_sync="raise"`.
+    """
+
+@dataclasses.dataclass
+class HostSyncSite:
+    """
+    The host synchronizations recorded at one call site.
+
+    Attributes:
+        filename: File of the call site, the frame that triggered the conversion.
+        lineno: Line of the call site.
+        function: Function of the call site.
+        kind: The conversion, a patched method or backend function name (e.g. "__bool__" or "to_numpy"), or "mask_index".
+        backend: The backend of the converted arrays, "pytorch" or "jax".
+        count: Number of synchronizations at this call site.
+        stack: Stack trace of the first synchronization at this call site, outermost frame first.
+    """
+    filename : str
+    lineno : int
+    function : str
+    kind : str
+    backend : str
+    count : int
+    stack : List[str]
+
+_thread_state = threading.local()
+_active_detector : Optional["HostSyncDetector"] = None
+_active_lock = threading.Lock()
+
+def _array_class(backend_name : str) -> type:
+    if backend_name == "pytorch":
+        import torch
+        return torch.Tensor
+    import jax.numpy as jnp
+    return type(jnp.zeros(()))
+
+def _has_mask_index(array_cls : type, bool_dtype : Any, index : Any) -> bool:
+    items = index if isinstance(index, tuple) else (index,)
+    return any(isinstance(item, array_cls) and item.dtype == bool_dtype for item in items)
+
+def _bool_dtype(backend_name : str) -> Any:
+    if backend_name == "pytorch":
+        import torch
+        return torch.bool
+    import jax.numpy as jnp
+    return jnp.bool_
+
+def _module_directories() -> Tuple[str, ...]:
+    directories = []
+    for module_name in _SKIPPED_MODULES:
+        if importlib.util.find_spec(module_name.split(".")[0]) is None:
+            continue
+        spec = importlib.util.find_spec(module_name)
+        if spec is not None and spec.submodule_search_locations:
+            directories.extend(os.path.join(location, "") for location in spec.submodule_search_locations)
+    return tuple(directories)
+
+def _is_host_array(backend_name : str, array : Any) -> bool:
+    if backend_name == "pytorch":
+        return array.device.type == "cpu"
+    return all(device.platform == "cpu" for device in array.devices())
+
+class HostSyncDetector:
+    """
+    Records (or warns / raises on) every implicit host synchronization of PyTorch / JAX arrays while active,
+    see the module documentation. Use as a context manager, or with `start` / `stop`.
+    """
+    def __init__(
+        self,
+        backends : Tuple[str, ...] = ("pytorch", "jax"),
+        include_cpu_arrays : bool = True,
+        on_sync : str = "record",
+        stack_depth : int = 16,
+    ) -> None:
+        """
+        Args:
+            backends: Backends whose arrays are watched, the ones whose framework is not installed are skipped.
+            include_cpu_arrays: Whether to also record conversions of arrays already on the host (CPU), which do not wait for
+                an accelerator but would on one (so syncs can be found on a CPU-only machine).
+            on_sync: "record" to only record, "warn" to also emit a warning, "raise" to raise a `HostSyncError` at each synchronization.
+            stack_depth: Maximum number of frames of the recorded stack traces.
+        """
+        for backend_name in backends:
+            if backend_name not in _BACKENDS:
+                raise ValueError(f"Unknown backend {backend_name!r}, expected some of {list(_BACKENDS.keys())}.")
+        if on_sync not in _ON_SYNC_ACTIONS:
+            raise ValueError(f"Unknown on_sync action {on_sync!r}, expected one of {_ON_SYNC_ACTIONS}.")
+        self.backends = tuple(backends)
+        self.include_cpu_arrays = include_cpu_arrays
+        self.on_sync = on_sync
+        self.stack_depth = stack_depth
+        self.sites : Dict[Tuple[str, int, str, str, str], HostSyncSite] = {}
+        self._lock = threading.Lock()
+        # (owner, name, had own attribute, original value) of every patch, to undo them
+        self._patches : List[Tuple[Any, str, bool, Any]] = []
+        self._skipped_directories : Tuple[str, ...] = ()
+
+    @property
+    def active(self) -> bool:
+        return _active_detector is self
+
+    @property
+    def total(self) -> int:
+        """
+        Total number of recorded synchronizations.
+        """
+        with self._lock:
+            return sum(site.count for site in self.sites.values())
+
+    def start(self) -> "HostSyncDetector":
+        global _active_detector
+        with _active_lock:
+            if _active_detector is not None:
+                raise RuntimeError("Another HostSyncDetector is already active.")
+            _active_detector = self
+        try:
+            self._skipped_directories = _module_directories()
+            for backend_name in self.backends:
+                framework, backend_module, backend_cls = _BACKENDS[backend_name]
+                if importlib.util.find_spec(framework) is None:
+                    continue
+                array_cls = _array_class(backend_name)
+                for name in PATCHED_METHODS[backend_name]:
+                    if hasattr(array_cls, name):
+                        self._patch(array_cls, name, self._hook(backend_name, name, getattr(array_cls, name), array_cls=array_cls))
+                backend = getattr(importlib.import_module(backend_module), backend_cls)
+                for name in SYNCING_BACKEND_FUNCTIONS:
+                    self._patch(backend, name, self._hook(backend_name, name, getattr(backend, name)))
+        except BaseException:
+            self.stop()
+            raise
+        return self
+
+    def stop(self) -> None:
+        global _active_detector
+        for owner, name, had_attribute, original in reversed(self._patches):
+            if had_attribute:
+                setattr(owner, name, original)
+            else:
+                # Attributes resolved lazily (e.g. backend functions) go back to being resolved on access
+                delattr(owner, name)
+        self._patches = []
+        with _active_lock:
+            if _active_detector is self:
+                _active_detector = None
+
+    def __enter__(self) -> "HostSyncDetector":
+        return self.start()
+
+    def __exit__(self, *exc_info : Any) -> None:
+        self.stop()
+
+    def reset(self) -> None:
+        """
+        Forget all recorded synchronizations.
+        """
+        with self._lock:
+            self.sites = {}
+
+    def table(self, limit : Optional[int] = None, with_stacks : bool = False) -> str:
+        """
+        Format the call sites as a text table, most frequent first.
+
+        Args:
+            limit: Maximum number of call sites, None for all of them.
+            with_stacks: Whether to add the stack trace of every call site below its row.
+        """
+        with self._lock:
+            sites = sorted(self.sites.values(), key=lambda site: site.count, reverse=True)
+        if limit is not None:
+            sites = sites[:limit]
+        header = f"{'count':>7} {'backend':<8} {'kind':<16} call site"
+        lines = [header, "-" * len(header)]
+        for site in sites:
+            lines.append(f"{site.count:>7} {site.backend:<8} {site.kind:<16} {site.filename}:{site.lineno} ({site.function})")
+            if with_stacks:
+                lines.extend("        " + line for frame in site.stack for line in frame.rstrip("\n").split("\n"))
+        return "\n".join(lines)
+
+    def _patch(self, owner : Any, name : str, value : Any) -> None:
+        had_attribute = name in vars(owner)
+        self._patches.append((owner, name, had_attribute, vars(owner).get(name)))
+        setattr(owner, name, value)
+
+    def _hook(self, backend_name : str, kind : str, original : Callable, array_cls : Optional[type] = None) -> Callable:
+        # `array_cls` is given for the methods of the array class, the other hooks are backend functions
+        bool_dtype = _bool_dtype(backend_name)
+        def hook(array : Any, *args : Any, **kwargs : Any) -> Any:
+            depth = getattr(_thread_state, "depth", 0)
+            if depth == 0 and (kind not in _INDEXING_METHODS or _has_mask_index(array_cls, bool_dtype, args[0])):
+                is_host = _is_host_array(backend_name, array)
+                if not (is_host and (kind in _DEVICE_ONLY_METHODS or not self.include_cpu_arrays)):
+                    self._record(backend_name, "mask_index" if kind in _INDEXING_METHODS else kind, sys._getframe(1))
+            _thread_state.depth = depth + 1
+            try:
+                return original(array, *args, **kwargs)
+            finally:
+                _thread_state.depth = depth
+        hook.__name__ = getattr(original, "__name__", kind)
+        hook.__doc__ = getattr(original, "__doc__", None)
+        hook.__wrapped__ = original
+        if array_cls is None:
+            # A plain function set on a class would otherwise become a method
+            return staticmethod(hook)
+        return hook
+
+    def _record(self, backend_name : str, kind : str, frame : Any) -> None:
+        call_site = frame
+        while call_site is not None and call_site.f_code.co_filename.startswith(self._skipped_directories):
+            call_site = call_site.f_back
+        call_site = frame if call_site is None else call_site
+        key = (call_site.f_code.co_filename, call_site.f_lineno, call_site.f_code.co_name, kind, backend_name)
+        with self._lock:
+            site = self.sites.get(key)
+            if site is None:
+                stack = traceback.format_list(traceback.extract_stack(frame, limit=self.stack_depth))
+                site = HostSyncSite(key[0], key[1], key[2], kind, backend_name, 0, stack)
+                self.sites[key] = site
+            site.count += 1
+        if self.on_sync != "record":
+            message = f"Implicit host synchronization ({backend_name} {kind}) at {key[0]}:{key[1]} ({key[2]})"
+            if self.on_sync == "raise":
+                raise HostSyncError(message)
+            warnings.warn(message, stacklevel=3)
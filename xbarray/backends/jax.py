@@ -1,4 +1,4 @@
-from ._cls_base import ComputeBackendImplCls
+from ._cls_base import ComputeBackendImplCls, bind_impl_module
 from ._implementations import jax as jax_impl
 
 class JaxComputeBackend(metaclass=ComputeBackendImplCls[jax_impl.ARRAY_TYPE, jax_impl.DEVICE_TYPE, jax_impl.DTYPE_TYPE, jax_impl.RNG_TYPE]):
@@ -6,13 +6,9 @@ class JaxComputeBackend(metaclass=ComputeBackendImplCls[jax_impl.ARRAY_TYPE, jax
     DTYPE_TYPE = jax_impl.DTYPE_TYPE
     DEVICE_TYPE = jax_impl.DEVICE_TYPE
     RNG_TYPE = jax_impl.RNG_TYPE
+    _impl_module = jax_impl
 
-for name in dir(jax_impl):
-    if not name.startswith('_') or name in [
-        '__array_namespace_info__',
-        '__array_api_version__',
-    ]:
-        setattr(JaxComputeBackend, name, getattr(jax_impl, name))
+bind_impl_module(JaxComputeBackend)
 
 __all__ = [
     'JaxComputeBackend',
@@ -0,0 +1,15 @@
+from ._cls_base import ComputeBackendImplCls, bind_impl_module
+from ._implementations import numpy_threaded as numpy_threaded_impl
+
+class ThreadedNumpyComputeBackend(metaclass=ComputeBackendImplCls[numpy_threaded_impl.ARRAY_TYPE, numpy_threaded_impl.DEVICE_TYPE, numpy_threaded_impl.DTYPE_TYPE, numpy_threaded_impl.RNG_TYPE]):
+    ARRAY_TYPE = numpy_threaded_impl.ARRAY_TYPE
+    DTYPE_TYPE = numpy_threaded_impl.DTYPE_TYPE
+    DEVICE_TYPE = numpy_threaded_impl.DEVICE_TYPE
+    RNG_TYPE = numpy_threaded_impl.RNG_TYPE
+    _impl_module = numpy_threaded_impl
+
+bind_impl_module(ThreadedNumpyComputeBackend)
+
+__all__ = [
+    'ThreadedNumpyComputeBackend',
+]
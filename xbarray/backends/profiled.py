@@ -0,0 +1,248 @@
+"""
+A compute backend wrapper that instruments every function call of another backend.
+
+`ProfiledComputeBackend(inner_backend)` exposes the same names as `inner_backend` (so it can be passed to any code written
+against `ComputeBackend`), but every function call, including the ones of the `random`, `linalg` and `fft` namespaces,
+goes through its `BackendProfiler`, which records per function the number of calls, the wall time,
+the bytes and shapes of the input / output arrays, and a timeline exportable as a Chrome trace
+(`chrome://tracing` / Perfetto).
+
+Wall times are the ones seen by the caller: on asynchronous backends (JAX, PyTorch on GPU) they only cover the dispatch,
+unless the profiler is created with `synchronize=True`, which waits for every output array (and so changes the timings of the program).
+"""
+from typing import Any, Dict, List, Optional, Tuple
+from types import ModuleType
+from collections import Counter
+import dataclasses
+import json
+import os
+import threading
+import time
+from .base import ComputeBackend
+
+__all__ = [
+    "FunctionProfile",
+    "BackendProfiler",
+    "ProfiledComputeBackend",
+]
+
+Shapes = Tuple[Tuple[int, ...], ...]
+
+@dataclasses.dataclass
+class FunctionProfile:
+    """
+    Statistics of the calls of one backend function.
+
+    Attributes:
+        name: Name of the function, with its namespace (e.g. "random.random_normal").
+        calls: Number of calls.
+        total_time: Total wall time of the calls, in seconds.
+        input_bytes: Total bytes of the arrays passed to the function (directly or in a list / tuple).
+        output_bytes: Total bytes of the arrays returned by the function (directly or in a list / tuple).
+        shapes: Number of calls per (input array shapes, output array shapes).
+    """
+    name : str
+    calls : int = 0
+    total_time : float = 0.0
+    input_bytes : int = 0
+    output_bytes : int = 0
+    shapes : Counter = dataclasses.field(default_factory=Counter)
+
+class BackendProfiler:
+    """
+    Collects the calls of `ProfiledComputeBackend`s, it can be shared by several of them (e.g. one per backend of a program).
+    """
+    def __init__(self, synchronize : bool = False, max_events : Optional[int] = 1_000_000) -> None:
+        """
+        Args:
+            synchronize: Whether to wait for the output arrays of every call before stopping its timer (asynchronous backends only).
+            max_events: Maximum number of calls kept for the Chrome trace (the statistics cover every call), None for no limit.
+        """
+        self.synchronize = synchronize
+        self.max_events = max_events
+        self.profiles : Dict[str, FunctionProfile] = {}
+        self.dropped_events = 0
+        self._events : List[Tuple[str, int, int, int, Shapes, Shapes]] = []
+        self._start_ns = time.perf_counter_ns()
+        self._lock = threading.Lock()
+
+    def record(self, name : str, start_ns : int, stop_ns : int, inputs : Tuple[Shapes, int], outputs : Tuple[Shapes, int]) -> None:
+        input_shapes, input_bytes = inputs
+        output_shapes, output_bytes = outputs
+        with self._lock:
+            profile = self.profiles.get(name)
+            if profile is None:
+                profile = FunctionProfile(name)
+                self.profiles[name] = profile
+            profile.calls += 1
+            profile.total_time += (stop_ns - start_ns) * 1e-9
+            profile.input_bytes += input_bytes
+            profile.output_bytes += output_bytes
+            profile.shapes[(input_shapes, output_shapes)] += 1
+            if self.max_events is None or len(self._events) < self.max_events:
+                self._events.append((name, start_ns, stop_ns, threading.get_ident(), input_shapes, output_shapes))
+            else:
+                self.dropped_events += 1
+
+    def reset(self) -> None:
+        """
+        Forget all recorded calls.
+        """
+        with self._lock:
+            self.profiles = {}
+            self._events = []
+            self.dropped_events = 0
+            self._start_ns = time.perf_counter_ns()
+
+    def table(self, sort_by : str = "total_time", limit : Optional[int] = None) -> str:
+        """
+        Format the statistics as a text table, one row per function.
+
+        Args:
+            sort_by: `FunctionProfile` attribute to sort by (descending), "calls", "total_time", "input_bytes", "output_bytes" or "name".
+            limit: Maximum number of rows, None for all the functions.
+        """
+        with self._lock:
+            profiles = [dataclasses.replace(profile, shapes=Counter(profile.shapes)) for profile in self.profiles.values()]
+        profiles.sort(key=lambda profile: getattr(profile, sort_by), reverse=sort_by != "name")
+        if limit is not None:
+            profiles = profiles[:limit]
+        total_time = sum(profile.total_time for profile in profiles) or 1.0
+        header = f"{'function':<36} {'calls':>8} {'total (ms)':>11} {'mean (us)':>10} {'time %':>7} {'in (MB)':>9} {'out (MB)':>9}  most common shapes"
+        lines = [header, "-" * len(header)]
+        for profile in profiles:
+            (input_shapes, output_shapes), _ = profile.shapes.most_common(1)[0]
+            lines.append(
+                f"{profile.name:<36} {profile.calls:>8} {profile.total_time * 1e3:>11.3f} {profile.total_time / profile.calls * 1e6:>10.2f} "
+                f"{profile.total_time / total_time * 100:>6.1f}% {profile.input_bytes / 1e6:>9.3f} {profile.output_bytes / 1e6:>9.3f}  "
+                f"{_format_shapes(input_shapes)} -> {_format_shapes(output_shapes)}"
+            )
+        return "\n".join(lines)
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        """
+        The recorded calls in the Chrome trace event format (one complete "X" event per call).
+        """
+        with self._lock:
+            events = list(self._events)
+            start_ns = self._start_ns
+        pid = os.getpid()
+        return {
+            "traceEvents": [
+                {
+                    "name": name, "cat": "xbarray", "ph": "X",
+                    "ts": (event_start_ns - start_ns) / 1e3, "dur": (event_stop_ns - event_start_ns) / 1e3,
+                    "pid": pid, "tid": tid,
+                    "args": {"inputs": _format_shapes(input_shapes), "outputs": _format_shapes(output_shapes)},
+                }
+                for name, event_start_ns, event_stop_ns, tid, input_shapes, output_shapes in events
+            ],
+            "displayTimeUnit": "ms",
+        }
+
+    def export_chrome_trace(self, path : str) -> None:
+        """
+        Write `chrome_trace()` as JSON to `path`.
+        """
+        with open(path, "w") as f:
+            json.dump(self.chrome_trace(), f)
+
+def _format_shapes(shapes : Shapes) -> str:
+    return ", ".join("(" + ", ".join(str(size) for size in shape) + ")" for shape in shapes) or "-"
+
+def _summarize_arrays(backend : ComputeBackend, values : Any) -> Tuple[Shapes, int]:
+    # Shapes and total bytes of the arrays among `values`, looking one level into lists / tuples (e.g. `stack`, `(rng, array)`)
+    shapes = []
+    nbytes = 0
+    for value in values:
+        items = value if isinstance(value, (list, tuple)) else (value,)
+        for item in items:
+            if backend.is_backendarray(item):
+                shapes.append(tuple(item.shape))
+                nbytes += item.nbytes
+    return tuple(shapes), nbytes
+
+def _synchronize(backend : ComputeBackend, result : Any) -> None:
+    if backend.simplified_name == "jax":
+        import jax
+        jax.block_until_ready(result)
+    elif backend.simplified_name == "pytorch":
+        import torch
+        if torch.cuda.is_available() and torch.cuda.is_initialized():
+            torch.cuda.synchronize()
+
+class _ProfiledNamespace:
+    """
+    Instrumented view of a backend or of one of its namespaces (e.g. `random`), wrapping its functions on first access.
+    """
+    def __init__(self, backend : ComputeBackend, inner : Any, profiler : BackendProfiler, prefix : str) -> None:
+        self._backend = backend
+        self._inner = inner
+        self._profiler = profiler
+        self._prefix = prefix
+
+    def __getattr__(self, name : str) -> Any:
+        # Only called when the normal lookup fails, wrapped values are then cached on the instance
+        value = getattr(self._inner, name)
+        if isinstance(value, ModuleType):
+            value = _ProfiledNamespace(self._backend, value, self._profiler, self._prefix + name + ".")
+        elif callable(value) and not isinstance(value, type):
+            value = self._wrap(self._prefix + name, value)
+        else:
+            return value
+        self.__dict__[name] = value
+        return value
+
+    def __dir__(self) -> List[str]:
+        return sorted(set(dir(self._inner)) | set(self.__dict__.keys()))
+
+    def _wrap(self, name : str, func : Any) -> Any:
+        backend = self._backend
+        profiler = self._profiler
+        def profiled(*args : Any, **kwargs : Any) -> Any:
+            inputs = _summarize_arrays(backend, args + tuple(kwargs.values()))
+            start_ns = time.perf_counter_ns()
+            result = func(*args, **kwargs)
+            if profiler.synchronize:
+                _synchronize(backend, result)
+            stop_ns = time.perf_counter_ns()
+            profiler.record(name, start_ns, stop_ns, inputs, _summarize_arrays(backend, (result,)))
+            return result
+        profiled.__name__ = getattr(func, "__name__", name)
+        profiled.__qualname__ = profiled.__name__
+        profiled.__doc__ = getattr(func, "__doc__", None)
+        profiled.__wrapped__ = func
+        return profiled
+
+class ProfiledComputeBackend(_ProfiledNamespace):
+    """
+    A `ComputeBackend` that forwards everything to `inner_backend` and records every function call in `profiler`.
+    Constants, dtypes and types (e.g. `float32`, `ARRAY_TYPE`, `simplified_name`) are the ones of the inner backend,
+    so code checking them keeps working.
+
+    Example:
+        backend = ProfiledComputeBackend(PytorchComputeBackend)
+        run_generic_code(backend)
+        print(backend.profiler.table())
+        backend.profiler.export_chrome_trace("trace.json")
+    """
+    def __init__(
+        self,
+        inner_backend : ComputeBackend,
+        profiler : Optional[BackendProfiler] = None,
+    ) -> None:
+        """
+        Args:
+            inner_backend: The backend doing the computations.
+            profiler: Where to record the calls, a new `BackendProfiler` if None.
+        """
+        profiler = BackendProfiler() if profiler is None else profiler
+        super().__init__(inner_backend, inner_backend, profiler, "")
+        self.inner_backend = inner_backend
+        self.profiler = profiler
+
+    def __str__(self) -> str:
+        return f"profiled({self._inner})"
+
+    def __repr__(self) -> str:
+        return f"ProfiledComputeBackend({self._inner!r})"
@@ -1,4 +1,4 @@
-from ._cls_base import ComputeBackendImplCls
+from ._cls_base import ComputeBackendImplCls, bind_impl_module
 from ._implementations import pytorch as pytorch_impl
 
 class PytorchComputeBackend(metaclass=ComputeBackendImplCls[pytorch_impl.ARRAY_TYPE, pytorch_impl.DEVICE_TYPE, pytorch_impl.DTYPE_TYPE, pytorch_impl.RNG_TYPE]):
@@ -6,16 +6,9 @@ class PytorchComputeBackend(metaclass=ComputeBackendImplCls[pytorch_impl.ARRAY_T
     DTYPE_TYPE = pytorch_impl.DTYPE_TYPE
     DEVICE_TYPE = pytorch_impl.DEVICE_TYPE
     RNG_TYPE = pytorch_impl.RNG_TYPE
+    _impl_module = pytorch_impl
 
-for name in dir(pytorch_impl):
-    if not name.startswith('_') or name in [
-        '__array_namespace_info__',
-        '__array_api_version__',
-    ]:
-        try:
-            setattr(PytorchComputeBackend, name, getattr(pytorch_impl, name))
-        except AttributeError:
-            pass
+bind_impl_module(PytorchComputeBackend)
 
 __all__ = [
     'PytorchComputeBackend',
@@ -0,0 +1,169 @@
+"""
+Per-backend bindings of the transformation modules.
+
+The functions of a transformation module (e.g. `rotation_conversions/base.py`) take the backend as first argument.
+`bind_transformations(backend, module)` returns them bound to a backend, as `functools.partial` objects
+with the name, docstring and signature (minus `backend`) of the original, cached per backend.
+The per-backend modules (e.g. `rotation_conversions.numpy`) are thin wrappers installed by `install_transformations`,
+which only import the backend (and bind the functions) when a function is first accessed.
+"""
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+import functools
+import importlib
+import inspect
+import types
+from xbarray.backends.base import ComputeBackend
+from xbarray.backends._implementations._common.lazy import LAZY_BINDING
+
+__all__ = [
+    "BACKENDS",
+    "TRANSFORMATION_MODULES",
+    "resolve_backend",
+    "bind_function",
+    "bind_transformations",
+    "install_transformations",
+]
+
+# Backend names accepted in place of backend classes: (module, class name), imported on first use
+BACKENDS : Dict[str, Tuple[str, str]] = {
+    "numpy": ("xbarray.backends.numpy", "NumpyComputeBackend"),
+    "numpy_threaded": ("xbarray.backends.numpy_threaded", "ThreadedNumpyComputeBackend"),
+    "pytorch": ("xbarray.backends.pytorch", "PytorchComputeBackend"),
+    "jax": ("xbarray.backends.jax", "JaxComputeBackend"),
+}
+
+# Transformation modules: (module with the backend-first functions, (module, function) returning the compiled namespace or None)
+TRANSFORMATION_MODULES : Dict[str, Tuple[str, Optional[Tuple[str, str]]]] = {
+    "rotation_conversions": (
+        "xbarray.transformations.rotation_conversions.base",
+        ("xbarray.transformations.rotation_conversions.compiled", "get_compiled_rotation_conversions"),
+    ),
+    "lie": ("xbarray.transformations.lie.base", None),
+}
+
+_bound_cache : Dict[Tuple[Any, str, bool], types.SimpleNamespace] = {}
+
+def resolve_backend(backend : Union[str, ComputeBackend]) -> ComputeBackend:
+    """
+    Get the backend class of a backend name (a key of `BACKENDS`, e.g. "numpy", "pytorch" or "jax"), importing it if needed.
+    Backend classes are returned as is.
+    """
+    if not isinstance(backend, str):
+        return backend
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend {backend!r}, expected one of {list(BACKENDS.keys())}.")
+    module_name, cls_name = BACKENDS[backend]
+    return getattr(importlib.import_module(module_name), cls_name)
+
+def bind_function(
+    backend : ComputeBackend,
+    func : Callable,
+    module_name : Optional[str] = None,
+) -> Callable:
+    """
+    Bind the first argument of `func` to `backend` with a `functools.partial`
+    that has the name, docstring and signature (minus `backend`) of `func`.
+    """
+    bound = functools.partial(func, backend)
+    functools.update_wrapper(bound, func)
+    if module_name is not None:
+        bound.__module__ = module_name
+    signature = inspect.signature(func)
+    # `inspect.signature` stops unwrapping at `__signature__`, so it does not report the bound `backend`
+    bound.__signature__ = signature.replace(parameters=list(signature.parameters.values())[1:])
+    return bound
+
+def bind_transformations(
+    backend : Union[str, ComputeBackend],
+    module : str = "rotation_conversions",
+    compiled : bool = False,
+    **compile_kwargs : Any,
+) -> types.SimpleNamespace:
+    """
+    Get the functions of a transformation module bound to a backend, as a namespace with the same function names.
+
+    Args:
+        backend: A backend class, or its name ("numpy", "pytorch" or "jax").
+        module: Name of the transformation module, a key of `TRANSFORMATION_MODULES`.
+        compiled: Whether to return the compiled versions of the functions (see `rotation_conversions.compiled`).
+        compile_kwargs: Forwarded to the compiler, the namespace is not cached when given.
+
+    Returns:
+        The bound functions, cached per (backend, module, compiled).
+    """
+    if module not in TRANSFORMATION_MODULES:
+        raise ValueError(f"Unknown transformation module {module!r}, expected one of {list(TRANSFORMATION_MODULES.keys())}.")
+    backend = resolve_backend(backend)
+    cache_key = (backend, module, compiled) if len(compile_kwargs) == 0 else None
+    if cache_key is not None and cache_key in _bound_cache:
+        return _bound_cache[cache_key]
+
+    impl_module_name, compiled_getter = TRANSFORMATION_MODULES[module]
+    if compiled:
+        if compiled_getter is None:
+            raise ValueError(f"The {module} module has no compiled version.")
+        getter_module, getter_name = compiled_getter
+        namespace = getattr(importlib.import_module(getter_module), getter_name)(backend, **compile_kwargs)
+    else:
+        impl_module = importlib.import_module(impl_module_name)
+        # Functions of the built-in backends belong to their per-backend module (e.g. `rotation_conversions.numpy`), so they can be pickled
+        module_name = None
+        if backend.simplified_name in BACKENDS:
+            module_name = impl_module_name.rsplit(".", 1)[0] + "." + backend.simplified_name
+        namespace = types.SimpleNamespace(**{
+            name: bind_function(backend, getattr(impl_module, name), module_name)
+            for name in impl_module.__all__
+        })
+    if cache_key is not None:
+        _bound_cache[cache_key] = namespace
+    return namespace
+
+def install_transformations(
+    module_globals : Dict[str, Any],
+    backend_name : str,
+    module : str = "rotation_conversions",
+) -> None:
+    """
+    Expose the functions of a transformation module bound to a backend in a per-backend module
+    (plus `BindingBackend`, the backend class, and `compiled`, the compiled namespace, for modules that have one).
+
+    In lazy binding mode, a module-level `__getattr__` (PEP 562) is installed so that the backend is only imported
+    and the functions bound on first access, and then cached in the module globals.
+    In eager binding mode, every function is bound immediately (`compiled` stays lazy).
+    """
+    impl_module_name, compiled_getter = TRANSFORMATION_MODULES[module]
+    names = list(importlib.import_module(impl_module_name).__all__)
+    module_globals["__all__"] = names
+    module_name = module_globals["__name__"]
+
+    def bind(name : str) -> Any:
+        return getattr(bind_transformations(backend_name, module), name)
+
+    if not LAZY_BINDING:
+        module_globals["BindingBackend"] = resolve_backend(backend_name)
+        for name in names:
+            module_globals[name] = bind(name)
+
+    lazy_names = frozenset(names)
+    def __getattr__(name : str) -> Any:
+        # Only called when the normal lookup fails
+        if name in lazy_names:
+            value = bind(name)
+            module_globals[name] = value
+            return value
+        if name == "BindingBackend":
+            value = resolve_backend(backend_name)
+            module_globals[name] = value
+            return value
+        if name == "compiled" and compiled_getter is not None:
+            value = bind_transformations(backend_name, module, compiled=True)
+            module_globals[name] = value
+            return value
+        raise AttributeError(f"module {module_name!r} has no attribute {name!r}")
+
+    def __dir__() -> List[str]:
+        extra = ["BindingBackend"] + (["compiled"] if compiled_getter is not None else [])
+        return sorted(set(module_globals.keys()) | lazy_names | set(extra))
+
+    module_globals["__getattr__"] = __getattr__
+    module_globals["__dir__"] = __dir__
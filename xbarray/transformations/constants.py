@@ -0,0 +1,115 @@
+"""
+Cache of the constant arrays used by the transformation modules (identity matrices, sign masks, ...).
+
+Without it, every call rebuilds its constants, which on PyTorch is an allocation (and, on an accelerator, a host to device copy) per constant.
+Constants are keyed by (build function, dtype, device) per backend, the backends themselves being held through weak references,
+and every backend keeps at most `max_entries` constants, the least recently used ones being evicted beyond that.
+Cached arrays are shared, they must never be modified in place (NumPy constants are made read-only).
+"""
+from typing import Any, Callable, Hashable, Optional, Tuple
+from collections import OrderedDict
+import threading
+import weakref
+import numpy as np
+from xbarray.backends.base import ComputeBackend, BArrayType, BDeviceType, BDtypeType, BRNGType
+
+__all__ = [
+    "ConstantCache",
+    "CONSTANT_CACHE",
+    "get_constant",
+]
+
+class ConstantCache:
+    """
+    LRU cache of constant arrays, keyed by (build function, dtype, device) per backend, with weak references to the backends.
+    """
+    def __init__(self, max_entries : int = 128) -> None:
+        """
+        Args:
+            max_entries: Maximum number of constants kept per backend.
+        """
+        if max_entries <= 0:
+            raise ValueError(f"max_entries must be positive, got {max_entries}.")
+        self.max_entries = max_entries
+        self._constants : "weakref.WeakKeyDictionary[Any, OrderedDict[Tuple[Hashable, ...], Any]]" = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def get(
+        self,
+        backend : ComputeBackend[BArrayType, BDeviceType, BDtypeType, BRNGType],
+        build : Callable[[ComputeBackend, Optional[BDtypeType], Optional[BDeviceType]], BArrayType],
+        dtype : Optional[BDtypeType] = None,
+        device : Optional[BDeviceType] = None,
+    ) -> BArrayType:
+        """
+        Get the constant built by `build(backend, dtype, device)` with the given dtype and device, building it on the first request.
+        `build` identifies the constant, so it must be a module-level function (not a new lambda on every call).
+        """
+        if _is_tracing(backend):
+            return build(backend, dtype, device)
+        key = (build, dtype, device)
+        with self._lock:
+            constants = self._constants.get(backend)
+            if constants is not None:
+                value = constants.get(key)
+                if value is not None:
+                    constants.move_to_end(key)
+                    return value
+        value = _build_concrete(backend, build, dtype, device)
+        with self._lock:
+            constants = self._constants.get(backend)
+            if constants is None:
+                constants = OrderedDict()
+                self._constants[backend] = constants
+            constants[key] = value
+            if len(constants) > self.max_entries:
+                constants.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        """
+        Release all constants.
+        """
+        with self._lock:
+            self._constants.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(constants) for constants in self._constants.values())
+
+def _is_tracing(backend : ComputeBackend) -> bool:
+    # torch.compile traces the constant creation into its graph, a cached tensor would only add guards
+    if backend.simplified_name == "pytorch":
+        import torch
+        return torch.compiler.is_compiling()
+    return False
+
+def _build_concrete(
+    backend : ComputeBackend,
+    build : Callable[[ComputeBackend, Any, Any], Any],
+    dtype : Any, device : Any,
+) -> Any:
+    if backend.simplified_name == "jax":
+        # Under jax.jit / vmap, the constant would otherwise be a tracer that must not outlive the trace
+        import jax
+        with jax.ensure_compile_time_eval():
+            return build(backend, dtype, device)
+    value = build(backend, dtype, device)
+    # Wrapping backends (e.g. `LazyComputeBackend`) can share the simplified name of NumPy without returning NumPy arrays
+    if isinstance(value, np.ndarray):
+        value.flags.writeable = False
+    return value
+
+# The cache shared by all transformation modules
+CONSTANT_CACHE = ConstantCache()
+
+def get_constant(
+    backend : ComputeBackend[BArrayType, BDeviceType, BDtypeType, BRNGType],
+    build : Callable[[ComputeBackend, Optional[BDtypeType], Optional[BDeviceType]], BArrayType],
+    dtype : Optional[BDtypeType] = None,
+    device : Optional[BDeviceType] = None,
+) -> BArrayType:
+    """
+    Get a constant from the shared `CONSTANT_CACHE`, see `ConstantCache.get`.
+    """
+    return CONSTANT_CACHE.get(backend, build, dtype, device)
@@ -0,0 +1,4 @@
+# The functions of `base.py` bound to the pytorch backend (see `xbarray.transformations.binding`),
+# the backend is imported and the functions bound on first access
+from xbarray.transformations.binding import install_transformations as _install_transformations
+_install_transformations(globals(), "pytorch", "lie")
@@ -1 +1,4 @@
-from .base import *
\ No newline at end of file
+from .base import *
+from .workspace import RotationWorkspace
+from .euler_convention import EulerConvention, get_euler_convention, EULER_CONVENTIONS
+from .quaternion_encoding import QuaternionEncoding, get_quaternion_encoding, QUATERNION_ENCODINGS
@@ -0,0 +1,418 @@
+"""
+In-place (`out=`) implementations of the rotation conversions in `base.py`.
+
+Every intermediate lives in a `RotationWorkspace` buffer and every array operation writes into an existing buffer with `out=`,
+so repeated calls with the same shapes / dtype / device, the same workspace and a given `out` do not allocate.
+Operations are applied per component (on (...,) shaped views) rather than on broadcast (..., n) arrays,
+as NumPy allocates iteration buffers for the latter.
+The arithmetic follows `base.py` (results match up to floating point rounding).
+`out` may be one of the inputs (e.g. `quaternion_multiply(q, dq, out=q)`).
+Only backends with mutable arrays (NumPy, PyTorch) are supported.
+"""
+from typing import Optional, Sequence, Tuple
+from xbarray.backends.base import ComputeBackend, BArrayType, BDeviceType, BDtypeType, BRNGType
+from .workspace import RotationWorkspace
+
+__all__ = [
+    "quaternion_to_matrix",
+    "matrix_to_quaternion",
+    "standardize_quaternion",
+    "quaternion_raw_multiply",
+    "quaternion_multiply",
+    "quaternion_invert",
+    "quaternion_apply",
+    "axis_angle_to_matrix",
+    "axis_angle_to_quaternion",
+    "quaternion_to_axis_angle",
+]
+
+def _prepare(
+    backend : ComputeBackend[BArrayType, BDeviceType, BDtypeType, BRNGType],
+    x : BArrayType,
+    out_shape : Sequence[int],
+    out : Optional[BArrayType],
+    workspace : Optional[RotationWorkspace],
+) -> Tuple[BArrayType, RotationWorkspace]:
+    if backend.simplified_name == "jax":
+        raise ValueError("JAX arrays are immutable, `out=` and `workspace=` are only supported on NumPy and PyTorch.")
+    if workspace is None:
+        workspace = RotationWorkspace(backend)
+    elif workspace.backend is not backend:
+        raise ValueError(f"The workspace belongs to the {workspace.backend.simplified_name} backend, not {backend.simplified_name}.")
+    out_shape = tuple(out_shape)
+    if out is None:
+        out = backend.empty(out_shape, dtype=x.dtype, device=backend.device(x))
+    elif tuple(out.shape) != out_shape:
+        raise ValueError(f"`out` must have shape {out_shape}, got {tuple(out.shape)}.")
+    return out, workspace
+
+def _clip_min(
+    backend : ComputeBackend[BArrayType, BDeviceType, BDtypeType, BRNGType],
+    x : BArrayType,
+    min_value : float,
+    out : BArrayType,
+) -> BArrayType:
+    # `clip` of the NumPy namespace allocates, `maximum` of the PyTorch namespace does not accept python scalars
+    if backend.simplified_name == "numpy":
+        return backend.maximum(x, min_value, out=out)
+    return backend.clip(x, min=min_value, out=out)
+
+def _sin_over_x(
+    backend : ComputeBackend[BArrayType, BDeviceType, BDtypeType, BRNGType],
+    workspace : RotationWorkspace,
+    name : str,
+    x : BArrayType,
+    out : BArrayType,
+) -> BArrayType:
+    """
+    sin(x) / x with the limit 1 at x = 0, i.e. `sinc(x / pi)`, written into `out`.
+    Like `numpy.sinc`, zeros are replaced by a tiny number instead of masking the result.
+    """
+    safe_x = workspace.like(name + ".safe_x", x.shape, x)
+    backend.equal(x, 0, out=safe_x)
+    backend.multiply(safe_x, 1e-20, out=safe_x)
+    backend.add(safe_x, x, out=safe_x)
+    backend.sin(safe_x, out=out)
+    backend.divide(out, safe_x, out=out)
+    return out
+
+def _squared_norm(
+    backend : ComputeBackend[BArrayType, BDeviceType, BDtypeType, BRNGType],
+    workspace : RotationWorkspace,
+    name : str,
+    x : BArrayType,
+    out : BArrayType,
+) -> BArrayType:
+    # Summed in order over the components, like `sum(-1)` of the few components
+    tmp = workspace.like(name + ".squared_norm_tmp", x.shape[:-1], x)
+    backend.multiply(x[..., 0], x[..., 0], out=out)
+    for component in range(1, x.shape[-1]):
+        backend.multiply(x[..., component], x[..., component], out=tmp)
+        backend.add(out, tmp, out=out)
+    return out
+
+def quaternion_to_matrix(
+    backend : ComputeBackend[BArrayType, BDeviceType, BDtypeType, BRNGType],
+    quaternions : BArrayType,
+    out : Optional[BArrayType] = None,
+    workspace : Optional[RotationWorkspace] = None,
+) -> BArrayType:
+    batch_shape = tuple(quaternions.shape[:-1])
+    out, workspace = _prepare(backend, quaternions, batch_shape + (3, 3), out, workspace)
+    r, i, j, k = quaternions[..., 0], quaternions[..., 1], quaternions[..., 2], quaternions[..., 3]
+
+    two_s = _squared_norm(backend, workspace, "quaternion_to_matrix", quaternions, workspace.like("quaternion_to_matrix.two_s", batch_shape, quaternions))
+    backend.divide(2.0, two_s, out=two_s)
+    tmp = workspace.like("quaternion_to_matrix.tmp", batch_shape, quaternions)
+
+    def diagonal(dst : BArrayType, a : BArrayType, b : BArrayType) -> None:
+        # 1 - two_s * (a * a + b * b)
+        backend.multiply(a, a, out=dst)
+        backend.multiply(b, b, out=tmp)
+        backend.add(dst, tmp, out=dst)
+        backend.multiply(two_s, dst, out=dst)
+        backend.subtract(1, dst, out=dst)
+    def off_diagonal(dst : BArrayType, a : BArrayType, b : BArrayType, c : BArrayType, d : BArrayType, sign : int) -> None:
+        # two_s * (a * b +- c * d)
+        backend.multiply(a, b, out=dst)
+        backend.multiply(c, d, out=tmp)
+        if sign > 0:
+            backend.add(dst, tmp, out=dst)
+        else:
+            backend.subtract(dst, tmp, out=dst)
+        backend.multiply(two_s, dst, out=dst)
+
+    diagonal(out[..., 0, 0], j, k)
+    off_diagonal(out[..., 0, 1], i, j, k, r, -1)
+    off_diagonal(out[..., 0, 2], i, k, j, r, 1)
+    off_diagonal(out[..., 1, 0], i, j, k, r, 1)
+    diagonal(out[..., 1, 1], i, k)
+    off_diagonal(out[..., 1, 2], j, k, i, r, -1)
+    off_diagonal(out[..., 2, 0], i, k, j, r, -1)
+    off_diagonal(out[..., 2, 1], j, k, i, r, 1)
+    diagonal(out[..., 2, 2], i, j)
+    return out
+
+def matrix_to_quaternion(
+    backend : ComputeBackend[BArrayType, BDeviceType, BDtypeType, BRNGType],
+    matrix : BArrayType,
+    out : Optional[BArrayType] = None,
+    workspace : Optional[RotationWorkspace] = None,
+) -> BArrayType:
+    if matrix.shape[-1] != 3 or matrix.shape[-2] != 3:
+        raise ValueError(f"Invalid rotation matrix shape {matrix.shape}.")
+    batch_shape = tuple(matrix.shape[:-2])
+    out, workspace = _prepare(backend, matrix, batch_shape + (4,), out, workspace)
+    m00, m01, m02 = matrix[..., 0, 0], matrix[..., 0, 1], matrix[..., 0, 2]
+    m10, m11, m12 = matrix[..., 1, 0], matrix[..., 1, 1], matrix[..., 1, 2]
+    m20, m21, m22 = matrix[..., 2, 0], matrix[..., 2, 1], matrix[..., 2, 2]
+
+    q_abs = workspace.like("matrix_to_quaternion.q_abs", batch_shape + (4,), matrix)
+    for index, (sign0, sign1, sign2) in enumerate(((1, 1, 1), (1, -1, -1), (-1, 1, -1), (-1, -1, 1))):
+        dst = q_abs[..., index]
+        (backend.add if sign0 > 0 else backend.subtract)(1.0, m00, out=dst)
+        (backend.add if sign1 > 0 else backend.subtract)(dst, m11, out=dst)
+        (backend.add if sign2 > 0 else backend.subtract)(dst, m22, out=dst)
+    # sqrt(max(0, x)), the subgradient of `_sqrt_positive_part` does not matter here
+    _clip_min(backend, q_abs, 0.0, out=q_abs)
+    backend.sqrt(q_abs, out=q_abs)
+
+    # quat_by_rijk[..., k, :] / (2 * max(q_abs[..., k], 0.1)) is the candidate computed from q_abs[..., k],
+    # instead of gathering the best-conditioned one, the candidates are summed with weights one_hot(argmax) / denominator.
+    # The one-hot vector is built from comparisons with the maximum (first maximum wins, like argmax),
+    # comparing integer indices into a floating point `out` allocates on PyTorch
+    q_abs_max = workspace.like("matrix_to_quaternion.q_abs_max", batch_shape, matrix)
+    backend.maximum(q_abs[..., 0], q_abs[..., 1], out=q_abs_max)
+    backend.maximum(q_abs_max, q_abs[..., 2], out=q_abs_max)
+    backend.maximum(q_abs_max, q_abs[..., 3], out=q_abs_max)
+    not_found = workspace.like("matrix_to_quaternion.not_found", batch_shape, matrix)
+    weights = workspace.like("matrix_to_quaternion.weights", batch_shape + (4,), matrix)
+    denominator = workspace.like("matrix_to_quaternion.denominator", batch_shape, matrix)
+    for index in range(4):
+        backend.equal(q_abs[..., index], q_abs_max, out=weights[..., index])
+        if index == 0:
+            backend.subtract(1, weights[..., index], out=not_found)
+        else:
+            backend.multiply(weights[..., index], not_found, out=weights[..., index])
+            backend.subtract(not_found, weights[..., index], out=not_found)
+        _clip_min(backend, q_abs[..., index], 0.1, out=denominator)
+        backend.multiply(denominator, 2.0, out=denominator)
+        backend.divide(weights[..., index], denominator, out=weights[..., index])
+
+    terms = workspace.like("matrix_to_quaternion.terms", (10,) + batch_shape, matrix)
+    for index in range(4):
+        backend.multiply(q_abs[..., index], q_abs[..., index], out=terms[index])
+    d21_12, d02_20, d10_01, s10_01, s02_20, s12_21 = (terms[index] for index in range(4, 10))
+    backend.subtract(m21, m12, out=d21_12)
+    backend.subtract(m02, m20, out=d02_20)
+    backend.subtract(m10, m01, out=d10_01)
+    backend.add(m10, m01, out=s10_01)
+    backend.add(m02, m20, out=s02_20)
+    backend.add(m12, m21, out=s12_21)
+    quat_by_rijk = (
+        (terms[0], d21_12, d02_20, d10_01),
+        (d21_12, terms[1], s10_01, s02_20),
+        (d02_20, s10_01, terms[2], s12_21),
+        (d10_01, s02_20, s12_21, terms[3]),
+    )
+
+    quaternion = workspace.like("matrix_to_quaternion.quaternion", batch_shape + (4,), matrix)
+    tmp = workspace.like("matrix_to_quaternion.tmp", batch_shape, matrix)
+    for component in range(4):
+        dst = quaternion[..., component]
+        backend.multiply(weights[..., 0], quat_by_rijk[0][component], out=dst)
+        for index in range(1, 4):
+            backend.multiply(weights[..., index], quat_by_rijk[index][component], out=tmp)
+            backend.add(dst, tmp, out=dst)
+    return standardize_quaternion(backend, quaternion, out=out, workspace=workspace)
+
+def standardize_quaternion(
+    backend : ComputeBackend[BArrayType, BDeviceType, BDtypeType, BRNGType],
+    quaternions : BArrayType,
+    out : Optional[BArrayType] = None,
+    workspace : Optional[RotationWorkspace] = None,
+) -> BArrayType:
+    out, workspace = _prepare(backend, quaternions, quaternions.shape, out, workspace)
+    # 1 - 2 * (real part < 0), the same sign flip as the `where` in `base.py`
+    signs = workspace.like("standardize_quaternion.signs", quaternions.shape[:-1], quaternions)
+    backend.less(quaternions[..., 0], 0, out=signs)
+    backend.multiply(signs, -2.0, out=signs)
+    backend.add(signs, 1.0, out=signs)
+    for component in range(4):
+        backend.multiply(quaternions[..., component], signs, out=out[..., component])
+    return out
+
+def quaternion_raw_multiply(
+    backend : ComputeBackend[BArrayType, BDeviceType, BDtypeType, BRNGType],
+    a : BArrayType, b : BArrayType,
+    out : Optional[BArrayType] = None,
+    workspace : Optional[RotationWorkspace] = None,
+) -> BArrayType:
+    shape = tuple(backend.broadcast_shapes(a.shape, b.shape))
+    out, workspace = _prepare(backend, a, shape, out, workspace)
+    aw, ax, ay, az = a[..., 0], a[..., 1], a[..., 2], a[..., 3]
+    bw, bx, by, bz = b[..., 0], b[..., 1], b[..., 2], b[..., 3]
+
+    # The product is built in a scratch buffer first, since `out` may be `a` or `b`
+    product = workspace.like("quaternion_raw_multiply.product", shape, a)
+    tmp = workspace.like("quaternion_raw_multiply.tmp", shape[:-1], a)
+    for component, terms in enumerate((
+        ((1, aw, bw), (-1, ax, bx), (-1, ay, by), (-1, az, bz)),
+        ((1, aw, bx), (1, ax, bw), (1, ay, bz), (-1, az, by)),
+        ((1, aw, by), (-1, ax, bz), (1, ay, bw), (1, az, bx)),
+        ((1, aw, bz), (1, ax, by), (-1, ay, bx), (1, az, bw)),
+    )):
+        dst = product[..., component]
+        backend.multiply(terms[0][1], terms[0][2], out=dst)
+        for sign, x, y in terms[1:]:
+            backend.multiply(x, y, out=tmp)
+            (backend.add if sign > 0 else backend.subtract)(dst, tmp, out=dst)
+    out[...] = product
+    return out
+
+def quaternion_multiply(
+    backend : ComputeBackend[BArrayType, BDeviceType, BDtypeType, BRNGType],
+    a : BArrayType, b : BArrayType,
+    out : Optional[BArrayType] = None,
+    workspace : Optional[RotationWorkspace] = None,
+) -> BArrayType:
+    out, workspace = _prepare(backend, a, backend.broadcast_shapes(a.shape, b.shape), out, workspace)
+    quaternion_raw_multiply(backend, a, b, out=out, workspace=workspace)
+    return standardize_quaternion(backend, out, out=out, workspace=workspace)
+
+def quaternion_invert(
+    backend : ComputeBackend[BArrayType, BDeviceType, BDtypeType, BRNGType],
+    quaternion : BArrayType,
+    out : Optional[BArrayType] = None,
+    workspace : Optional[RotationWorkspace] = None,
+) -> BArrayType:
+    out, workspace = _prepare(backend, quaternion, quaternion.shape, out, workspace)
+    out[...] = quaternion
+    for component in range(1, 4):
+        # Not `negative`: NumPy 2.x float32 `negative` is wrong in-place on strided views
+        backend.multiply(out[..., component], -1, out=out[..., component])
+    return out
+
+def quaternion_apply(
+    backend : ComputeBackend[BArrayType, BDeviceType, BDtypeType, BRNGType],
+    quaternion : BArrayType, point : BArrayType,
+    out : Optional[BArrayType] = None,
+    workspace : Optional[RotationWorkspace] = None,
+) -> BArrayType:
+    if point.shape[-1] != 3:
+        raise ValueError(f"Points are not in 3D, {point.shape}.")
+    batch_shape = tuple(backend.broadcast_shapes(quaternion.shape[:-1], point.shape[:-1]))
+    out, workspace = _prepare(backend, point, batch_shape + (3,), out, workspace)
+
+    # Vector part of q * (0, point) * q^-1 in closed form: (w^2 - |u|^2) p + 2 (u . p) u + 2 w (u x p)
+    w, u, p = quaternion[..., 0], (quaternion[..., 1], quaternion[..., 2], quaternion[..., 3]), (point[..., 0], point[..., 1], point[..., 2])
+    scale_p = workspace.like("quaternion_apply.scale_p", batch_shape, point)
+    scale_u = workspace.like("quaternion_apply.scale_u", batch_shape, point)
+    two_w = workspace.like("quaternion_apply.two_w", batch_shape, point)
+    tmp = workspace.like("quaternion_apply.tmp", batch_shape, point)
+    backend.multiply(w, w, out=scale_p)
+    backend.multiply(u[0], p[0], out=scale_u)
+    for component in range(3):
+        backend.multiply(u[component], u[component], out=tmp)
+        backend.subtract(scale_p, tmp, out=scale_p)
+        if component > 0:
+            backend.multiply(u[component], p[component], out=tmp)
+            backend.add(scale_u, tmp, out=scale_u)
+    backend.multiply(scale_u, 2.0, out=scale_u)
+    backend.multiply(w, 2.0, out=two_w)
+
+    # Built in a scratch buffer first, since `out` may be `point`
+    rotated = workspace.like("quaternion_apply.rotated", batch_shape + (3,), point)
+    for component in range(3):
+        dst = rotated[..., component]
+        next_component, last_component = (component + 1) % 3, (component + 2) % 3
+        # (u x p)_c = u_{c+1} p_{c+2} - u_{c+2} p_{c+1}
+        backend.multiply(u[next_component], p[last_component], out=dst)
+        backend.multiply(u[last_component], p[next_component], out=tmp)
+        backend.subtract(dst, tmp, out=dst)
+        backend.multiply(two_w, dst, out=dst)
+        backend.multiply(scale_u, u[component], out=tmp)
+        backend.add(dst, tmp, out=dst)
+        backend.multiply(scale_p, p[component], out=tmp)
+        backend.add(dst, tmp, out=dst)
+    out[...] = rotated
+    return out
+
+def axis_angle_to_quaternion(
+    backend : ComputeBackend[BArrayType, BDeviceType, BDtypeType, BRNGType],
+    axis_angle : BArrayType,
+    out : Optional[BArrayType] = None,
+    workspace : Optional[RotationWorkspace] = None,
+) -> BArrayType:
+    batch_shape = tuple(axis_angle.shape[:-1])
+    out, workspace = _prepare(backend, axis_angle, batch_shape + (4,), out, workspace)
+    half_angles = _squared_norm(backend, workspace, "axis_angle_to_quaternion", axis_angle, workspace.like("axis_angle_to_quaternion.half_angles", batch_shape, axis_angle))
+    backend.sqrt(half_angles, out=half_angles)
+    backend.multiply(half_angles, 0.5, out=half_angles)
+
+    # 0.5 * sinc(angles * 0.5 / pi) = 0.5 * sin(half_angles) / half_angles
+    sin_half_angles_over_angles = _sin_over_x(
+        backend, workspace, "axis_angle_to_quaternion", half_angles,
+        workspace.like("axis_angle_to_quaternion.sin_half_angles_over_angles", batch_shape, axis_angle),
+    )
+    backend.multiply(sin_half_angles_over_angles, 0.5, out=sin_half_angles_over_angles)
+    # The vector part is written last, since `out[..., 1:]` may be `axis_angle`
+    cos_half_angles = workspace.like("axis_angle_to_quaternion.cos_half_angles", batch_shape, axis_angle)
+    backend.cos(half_angles, out=cos_half_angles)
+    for component in range(3):
+        backend.multiply(axis_angle[..., component], sin_half_angles_over_angles, out=out[..., component + 1])
+    out[..., 0] = cos_half_angles
+    return out
+
+def quaternion_to_axis_angle(
+    backend : ComputeBackend[BArrayType, BDeviceType, BDtypeType, BRNGType],
+    quaternions : BArrayType,
+    out : Optional[BArrayType] = None,
+    workspace : Optional[RotationWorkspace] = None,
+) -> BArrayType:
+    batch_shape = tuple(quaternions.shape[:-1])
+    out, workspace = _prepare(backend, quaternions, batch_shape + (3,), out, workspace)
+    half_angles = _squared_norm(backend, workspace, "quaternion_to_axis_angle", quaternions[..., 1:], workspace.like("quaternion_to_axis_angle.half_angles", batch_shape, quaternions))
+    backend.sqrt(half_angles, out=half_angles)
+    backend.atan2(half_angles, quaternions[..., 0], out=half_angles)
+
+    # angles/2 are between [-pi/2, pi/2], thus sin_half_angles_over_angles can't be zero
+    sin_half_angles_over_angles = _sin_over_x(
+        backend, workspace, "quaternion_to_axis_angle", half_angles,
+        workspace.like("quaternion_to_axis_angle.sin_half_angles_over_angles", batch_shape, quaternions),
+    )
+    backend.multiply(sin_half_angles_over_angles, 0.5, out=sin_half_angles_over_angles)
+    for component in range(3):
+        backend.divide(quaternions[..., component + 1], sin_half_angles_over_angles, out=out[..., component])
+    return out
+
+def axis_angle_to_matrix(
+    backend : ComputeBackend[BArrayType, BDeviceType, BDtypeType, BRNGType],
+    axis_angle : BArrayType,
+    fast : bool = False,
+    out : Optional[BArrayType] = None,
+    workspace : Optional[RotationWorkspace] = None,
+) -> BArrayType:
+    batch_shape = tuple(axis_angle.shape[:-1])
+    out, workspace = _prepare(backend, axis_angle, batch_shape + (3, 3), out, workspace)
+    if not fast:
+        quaternions = axis_angle_to_quaternion(
+            backend, axis_angle,
+            out=workspace.like("axis_angle_to_matrix.quaternions", batch_shape + (4,), axis_angle), workspace=workspace
+        )
+        return quaternion_to_matrix(backend, quaternions, out=out, workspace=workspace)
+
+    # Rodrigues: R = I + sinc(angle) K + (1 - cos(angle)) / angle^2 K^2, with K^2 = r r^T - angle^2 I
+    angles_sqrd = _squared_norm(backend, workspace, "axis_angle_to_matrix", axis_angle, workspace.like("axis_angle_to_matrix.angles_sqrd", batch_shape, axis_angle))
+    angles = workspace.like("axis_angle_to_matrix.angles", batch_shape, axis_angle)
+    backend.sqrt(angles_sqrd, out=angles)
+    a = _sin_over_x(backend, workspace, "axis_angle_to_matrix", angles, workspace.like("axis_angle_to_matrix.a", batch_shape, axis_angle))
+    b = workspace.like("axis_angle_to_matrix.b", batch_shape, axis_angle)
+    backend.cos(angles, out=b)
+    backend.subtract(1, b, out=b)
+    # (1 - cos(angle)) / angle^2, with angle^2 replaced by 1 where it is 0 (b is 0 there)
+    backend.equal(angles_sqrd, 0, out=angles)
+    backend.add(angles, angles_sqrd, out=angles)
+    backend.divide(b, angles, out=b)
+
+    rx, ry, rz = axis_angle[..., 0], axis_angle[..., 1], axis_angle[..., 2]
+    tmp = workspace.like("axis_angle_to_matrix.tmp", batch_shape, axis_angle)
+    for row, r_row in enumerate((rx, ry, rz)):
+        for col, r_col in enumerate((rx, ry, rz)):
+            dst = out[..., row, col]
+            backend.multiply(r_row, r_col, out=dst)
+            if row == col:
+                # 1 + b * (r_i^2 - angle^2)
+                backend.subtract(dst, angles_sqrd, out=dst)
+                backend.multiply(b, dst, out=dst)
+                backend.add(dst, 1, out=dst)
+            else:
+                # b * r_i r_j +- sinc(angle) * r_k, with the signs of the cross product matrix K
+                backend.multiply(b, dst, out=dst)
+                r_other = (rx, ry, rz)[3 - row - col]
+                backend.multiply(a, r_other, out=tmp)
+                if (col - row) % 3 == 1:
+                    backend.subtract(dst, tmp, out=dst)
+                else:
+                    backend.add(dst, tmp, out=dst)
+    return out
@@ -0,0 +1,168 @@
+"""
+Fused NumPy kernels for the rotation conversions in `base.py`.
+
+The component-wise kernels first copy their inputs into contiguous (n_components, ...) arrays,
+do all the arithmetic with in-place / `out=` ufunc calls on these unit-stride arrays,
+and interleave the result into the (..., n_components) output with a single copy,
+instead of building the result from many small strided arrays that are then stacked / reshaped.
+The arithmetic is the same as in `base.py` (up to floating point rounding), only the memory traffic changes.
+"""
+import numpy as np
+
+__all__ = [
+    "quaternion_to_matrix",
+    "matrix_to_quaternion",
+    "quaternion_invert",
+    "quaternion_apply",
+    "axis_angle_to_matrix",
+    "axis_angle_to_quaternion",
+    "quaternion_to_axis_angle",
+]
+
+def _float_dtype(*arrays : np.ndarray) -> np.dtype:
+    return np.result_type(*arrays, 1.0)
+
+def _standardize_inplace(quaternions : np.ndarray) -> np.ndarray:
+    np.negative(quaternions, out=quaternions, where=quaternions[..., 0:1] < 0)
+    return quaternions
+
+def _components(x : np.ndarray, dtype : np.dtype) -> np.ndarray:
+    # Contiguous (n_components, batch_size) copy with a flattened batch, so the kernels below run on unit-stride 1D arrays
+    return np.ascontiguousarray(x.reshape(-1, x.shape[-1]).T, dtype=dtype)
+
+def _interleave(components : np.ndarray, shape : tuple) -> np.ndarray:
+    # Inverse of `_components`, with a single strided copy into the (..., n_components) output
+    out = np.empty(components.shape[::-1], dtype=components.dtype)
+    out[...] = components.T
+    return out.reshape(shape)
+
+def quaternion_to_matrix(quaternions : np.ndarray) -> np.ndarray:
+    q = np.asarray(quaternions)
+    r, i, j, k = _components(q, _float_dtype(q))
+    two_s = r * r
+    two_s += i * i
+    two_s += j * j
+    two_s += k * k
+    np.divide(2.0, two_s, out=two_s)
+
+    entries = np.empty((9,) + two_s.shape, dtype=two_s.dtype)
+    def diagonal(dst : np.ndarray, a : np.ndarray, b : np.ndarray) -> None:
+        # 1 - two_s * (a * a + b * b)
+        np.multiply(a, a, out=dst)
+        dst += b * b
+        dst *= two_s
+        np.subtract(1, dst, out=dst)
+    def off_diagonal(dst : np.ndarray, a : np.ndarray, b : np.ndarray, c : np.ndarray, d : np.ndarray, sign : float) -> None:
+        # two_s * (a * b +- c * d)
+        np.multiply(a, b, out=dst)
+        if sign > 0:
+            dst += c * d
+        else:
+            dst -= c * d
+        dst *= two_s
+    diagonal(entries[0], j, k)
+    off_diagonal(entries[1], i, j, k, r, -1)
+    off_diagonal(entries[2], i, k, j, r, 1)
+    off_diagonal(entries[3], i, j, k, r, 1)
+    diagonal(entries[4], i, k)
+    off_diagonal(entries[5], j, k, i, r, -1)
+    off_diagonal(entries[6], i, k, j, r, -1)
+    off_diagonal(entries[7], j, k, i, r, 1)
+    diagonal(entries[8], i, j)
+    return _interleave(entries, q.shape[:-1] + (3, 3))
+
+def matrix_to_quaternion(matrix : np.ndarray) -> np.ndarray:
+    m = np.asarray(matrix)
+    if m.shape[-1] != 3 or m.shape[-2] != 3:
+        raise ValueError(f"Invalid rotation matrix shape {m.shape}.")
+    batch_shape = m.shape[:-2]
+    m00, m01, m02, m10, m11, m12, m20, m21, m22 = _components(m.reshape(batch_shape + (9,)), _float_dtype(m))
+
+    q_abs = np.empty((4,) + m00.shape, dtype=m00.dtype)
+    np.add(1.0, m00, out=q_abs[0]); q_abs[0] += m11; q_abs[0] += m22
+    np.add(1.0, m00, out=q_abs[1]); q_abs[1] -= m11; q_abs[1] -= m22
+    np.subtract(1.0, m00, out=q_abs[2]); q_abs[2] += m11; q_abs[2] -= m22
+    np.subtract(1.0, m00, out=q_abs[3]); q_abs[3] -= m11; q_abs[3] += m22
+    np.maximum(q_abs, 0.0, out=q_abs)
+    np.sqrt(q_abs, out=q_abs)
+
+    # Only the best-conditioned candidate (largest q_abs) of every matrix is evaluated,
+    # its components are picked from the shared off-diagonal sums / differences
+    best = np.argmax(q_abs, axis=0)
+    q_sq = q_abs * q_abs
+    d21_12, d02_20, d10_01 = m21 - m12, m02 - m20, m10 - m01
+    s10_01, s02_20, s12_21 = m10 + m01, m02 + m20, m12 + m21
+    out = np.empty((4,) + m00.shape, dtype=m00.dtype)
+    np.choose(best, (q_sq[0], d21_12, d02_20, d10_01), out=out[0])
+    np.choose(best, (d21_12, q_sq[1], s10_01, s02_20), out=out[1])
+    np.choose(best, (d02_20, s10_01, q_sq[2], s12_21), out=out[2])
+    np.choose(best, (d10_01, s02_20, s12_21, q_sq[3]), out=out[3])
+    denominator = np.max(q_abs, axis=0)
+    np.maximum(denominator, 0.1, out=denominator)
+    denominator *= 2.0
+    out /= denominator
+    return _standardize_inplace(_interleave(out, batch_shape + (4,)))
+
+def quaternion_invert(quaternion : np.ndarray) -> np.ndarray:
+    q = np.asarray(quaternion)
+    out = np.negative(q)
+    out[..., 0] = q[..., 0]
+    return out
+
+def quaternion_apply(quaternion : np.ndarray, point : np.ndarray) -> np.ndarray:
+    q, p = np.asarray(quaternion), np.asarray(point)
+    if p.shape[-1] != 3:
+        raise ValueError(f"Points are not in 3D, {p.shape}.")
+    # Vector part of q * (0, p) * q^-1 in closed form: (w^2 - |u|^2) p + 2 (u . p) u + 2 w (u x p)
+    w, u = q[..., 0:1], q[..., 1:]
+    out = np.cross(u, p)
+    out *= 2.0 * w
+    out += (2.0 * (u * p).sum(-1, keepdims=True)) * u
+    out += (w * w - (u * u).sum(-1, keepdims=True)) * p
+    return out
+
+def axis_angle_to_quaternion(axis_angle : np.ndarray) -> np.ndarray:
+    aa = np.asarray(axis_angle)
+    angles = np.sqrt((aa * aa).sum(-1, keepdims=True))
+    out = np.empty(aa.shape[:-1] + (4,), dtype=_float_dtype(aa))
+    half_angles = angles * 0.5
+    np.cos(half_angles, out=out[..., 0:1])
+    np.multiply(aa, 0.5 * np.sinc(half_angles / np.pi), out=out[..., 1:])
+    return out
+
+def quaternion_to_axis_angle(quaternions : np.ndarray) -> np.ndarray:
+    q = np.asarray(quaternions)
+    vector = q[..., 1:]
+    half_angles = np.arctan2(np.sqrt((vector * vector).sum(-1, keepdims=True)), q[..., :1])
+    sin_half_angles_over_angles = np.sinc(half_angles / np.pi)
+    sin_half_angles_over_angles *= 0.5
+    return vector / sin_half_angles_over_angles
+
+def axis_angle_to_matrix(axis_angle : np.ndarray, fast : bool = False) -> np.ndarray:
+    if not fast:
+        return quaternion_to_matrix(axis_angle_to_quaternion(axis_angle))
+
+    # Rodrigues: R = I + sinc(angle) K + (1 - cos(angle)) / angle^2 K^2, with K^2 = r r^T - angle^2 I
+    r = np.asarray(axis_angle)
+    angles_sqrd = (r * r).sum(-1)
+    angles = np.sqrt(angles_sqrd)
+    a = np.sinc(angles / np.pi)
+    b = 1 - np.cos(angles)
+    b /= np.where(angles_sqrd == 0, 1, angles_sqrd)
+    rx, ry, rz = r[..., 0], r[..., 1], r[..., 2]
+
+    out = np.empty(r.shape[:-1] + (3, 3), dtype=_float_dtype(r))
+    # b * r r^T on every entry, then the identity and cross product terms
+    np.multiply((b[..., None] * r)[..., :, None], r[..., None, :], out=out)
+    diagonal = 1 - b * angles_sqrd
+    out[..., 0, 0] += diagonal
+    out[..., 1, 1] += diagonal
+    out[..., 2, 2] += diagonal
+    ax, ay, az = a * rx, a * ry, a * rz
+    out[..., 0, 1] -= az
+    out[..., 0, 2] += ay
+    out[..., 1, 0] += az
+    out[..., 1, 2] -= ax
+    out[..., 2, 0] -= ay
+    out[..., 2, 1] += ax
+    return out
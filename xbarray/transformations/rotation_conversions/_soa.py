@@ -0,0 +1,364 @@
+"""
+Components-first ("structure of arrays") implementations of the rotation conversions in `base.py`.
+
+In the components layout, the component axis comes first: quaternions are (4, ...) arrays, axis-angle vectors,
+Euler angles and points are (3, ...) arrays, 6D representations are (6, ...) arrays and rotation matrices are (9, ...) arrays
+with the entries in row-major order. Every component (e.g. `quaternions[0]`) of a contiguous array is then a contiguous block,
+so the element-wise arithmetic runs on unit-stride data (SIMD on CPU, coalesced accesses on accelerators)
+instead of the strided views of the interleaved (..., 4) / (..., 3, 3) layout.
+The arithmetic is the same as in `base.py` (up to floating point rounding).
+
+`to_components` / `from_components` convert between both layouts with views (no copy). The throughput benefit
+is only there for data that is actually stored in the components layout, not for views of interleaved data.
+"""
+from typing import Optional
+from xbarray.backends.base import ComputeBackend, BArrayType, BDeviceType, BDtypeType, BRNGType
+from xbarray.transformations.constants import get_constant
+from . import base as base_impl
+
+__all__ = [
+    "LAYOUTS",
+    "check_layout",
+    "to_components",
+    "from_components",
+    "quaternion_to_matrix",
+    "matrix_to_quaternion",
+    "euler_angles_to_matrix",
+    "matrix_to_euler_angles",
+    "random_quaternions",
+    "random_rotations",
+    "random_rotation",
+    "standardize_quaternion",
+    "quaternion_raw_multiply",
+    "quaternion_multiply",
+    "quaternion_invert",
+    "quaternion_apply",
+    "axis_angle_to_matrix",
+    "matrix_to_axis_angle",
+    "axis_angle_to_quaternion",
+    "quaternion_to_axis_angle",
+    "rotation_6d_to_matrix",
+    "matrix_to_rotation_6d",
+]
+
+LAYOUTS = ("interleaved", "components")
+
+def check_layout(layout : str) -> None:
+    if layout not in LAYOUTS:
+        raise ValueError(f"Unknown layout {layout!r}, expected one of {LAYOUTS}.")
+
+def _check_components(x : BArrayType, num_components : int, name : str) -> None:
+    if len(x.shape) == 0 or x.shape[0] != num_components:
+        raise ValueError(f"{name} must have shape ({num_components}, ...) in the components layout, got {x.shape}.")
+
+def _scalar_zero(backend, dtype, device):
+    return backend.zeros((), dtype=dtype, device=device)
+
+def _scalar_one(backend, dtype, device):
+    return backend.ones((), dtype=dtype, device=device)
+
+def to_components(
+    backend : ComputeBackend[BArrayType, BDeviceType, BDtypeType, BRNGType],
+    x : BArrayType, is_matrix : bool = False
+) -> BArrayType:
+    """
+    View an interleaved (..., n) array (or (..., 3, 3) matrices if `is_matrix`) in the components layout, (n, ...) (or (9, ...)).
+    """
+    if is_matrix:
+        x = backend.reshape(x, x.shape[:-2] + (9,))
+    return backend.moveaxis(x, -1, 0)
+
+def from_components(
+    backend : ComputeBackend[BArrayType, BDeviceType, BDtypeType, BRNGType],
+    x : BArrayType, is_matrix : bool = False
+) -> BArrayType:
+    """
+    View a (n, ...) array in the components layout (or (9, ...) matrices if `is_matrix`) in the interleaved layout, (..., n) (or (..., 3, 3)).
+    """
+    x = backend.moveaxis(x, 0, -1)
+    if is_matrix:
+        x = backend.reshape(x, x.shape[:-1] + (3, 3))
+    return x
+
+def quaternion_to_matrix(
+    backend : ComputeBackend[BArrayType, BDeviceType, BDtypeType, BRNGType],
+    quaternions : BArrayType
+) -> BArrayType:
+    _check_components(quaternions, 4, "Quaternions")
+    r, i, j, k = quaternions[0], quaternions[1], quaternions[2], quaternions[3]
+    two_s = 2.0 / (r * r + i * i + j * j + k * k)
+    return backend.stack(
+        (
+            1 - two_s * (j * j + k * k),
+            two_s * (i * j - k * r),
+            two_s * (i * k + j * r),
+            two_s * (i * j + k * r),
+            1 - two_s * (i * i + k * k),
+            two_s * (j * k - i * r),
+            two_s * (i * k - j * r),
+            two_s * (j * k + i * r),
+            1 - two_s * (i * i + j * j),
+        ),
+        axis=0,
+    )
+
+def matrix_to_quaternion(
+    backend : ComputeBackend[BArrayType, BDeviceType, BDtypeType, BRNGType],
+    matrix : BArrayType
+) -> BArrayType:
+    _check_components(matrix, 9, "Rotation matrices")
+    m00, m01, m02, m10, m11, m12, m20, m21, m22 = (matrix[n] for n in range(9))
+    a0 = base_impl._sqrt_positive_part(backend, 1.0 + m00 + m11 + m22)
+    a1 = base_impl._sqrt_positive_part(backend, 1.0 + m00 - m11 - m22)
+    a2 = base_impl._sqrt_positive_part(backend, 1.0 - m00 + m11 - m22)
+    a3 = base_impl._sqrt_positive_part(backend, 1.0 - m00 - m11 + m22)
+
+    # The best-conditioned candidate (the first largest q_abs, like `argmax` in `base.py`) is selected with comparisons,
+    # its components are picked from the shared off-diagonal sums / differences
+    use_0 = (a0 >= a1) & (a0 >= a2) & (a0 >= a3)
+    use_1 = (a1 >= a2) & (a1 >= a3)
+    use_2 = a2 >= a3
+    def select(c0 : BArrayType, c1 : BArrayType, c2 : BArrayType, c3 : BArrayType) -> BArrayType:
+        return backend.where(use_0, c0, backend.where(use_1, c1, backend.where(use_2, c2, c3)))
+    d21_12, d02_20, d10_01 = m21 - m12, m02 - m20, m10 - m01
+    s10_01, s02_20, s12_21 = m10 + m01, m02 + m20, m12 + m21
+    # We floor here at 0.1 but the exact level is not important; if q_abs is small, the candidate won't be picked.
+    denominator = 2.0 * backend.clip(select(a0, a1, a2, a3), min=0.1)
+    out = backend.stack(
+        (
+            select(a0 * a0, d21_12, d02_20, d10_01),
+            select(d21_12, a1 * a1, s10_01, s02_20),
+            select(d02_20, s10_01, a2 * a2, s12_21),
+            select(d10_01, s02_20, s12_21, a3 * a3),
+        ),
+        axis=0,
+    ) / denominator
+    return standardize_quaternion(backend, out)
+
+def euler_angles_to_matrix(
+    backend : ComputeBackend[BArrayType, BDeviceType, BDtypeType, BRNGType],
+    euler_angles : BArrayType, convention
+) -> BArrayType:
+    _check_components(euler_angles, 3, "Euler angles")
+    convention = base_impl.get_euler_convention(convention)
+    cos = backend.cos(euler_angles)
+    sin = backend.sin(euler_angles)
+    factors = [(cos[i], sin[i]) for i in range(3)]
+    return backend.stack(
+        tuple(base_impl._evaluate_euler_terms(terms, factors) for terms in convention.matrix_terms),
+        axis=0,
+    )
+
+def matrix_to_euler_angles(
+    backend : ComputeBackend[BArrayType, BDeviceType, BDtypeType, BRNGType],
+    matrix : BArrayType, convention
+) -> BArrayType:
+    _check_components(matrix, 9, "Rotation matrices")
+    convention = base_impl.get_euler_convention(convention)
+    def entry(spec : tuple) -> BArrayType:
+        row, col, sign = spec
+        return matrix[3 * row + col] if sign > 0 else -matrix[3 * row + col]
+    central_entry = backend.clip(entry(convention.central_angle_entry), -1.0, 1.0)
+    central_angle = backend.asin(central_entry) if convention.tait_bryan else backend.acos(central_entry)
+    first_y, first_x = convention.first_angle_entries
+    third_y, third_x = convention.third_angle_entries
+    return backend.stack(
+        (
+            backend.atan2(entry(first_y), entry(first_x)),
+            central_angle,
+            backend.atan2(entry(third_y), entry(third_x)),
+        ),
+        axis=0,
+    )
+
+def random_quaternions(
+    backend : ComputeBackend[BArrayType, BDeviceType, BDtypeType, BRNGType], rng : BRNGType,
+    n : int, dtype : Optional[BDtypeType] = None, device : Optional[BDeviceType] = None,
+) -> BArrayType:
+    # The normal samples are drawn in the (4, n) shape, so they differ from the interleaved ones for the same rng state
+    _, o = backend.random.random_normal((4, n), rng=rng, dtype=dtype, device=device)
+    s = backend.sum(o * o, axis=0)
+    return o / base_impl._copysign(backend, backend.sqrt(s), o[0])
+
+def random_rotations(
+    backend : ComputeBackend[BArrayType, BDeviceType, BDtypeType, BRNGType], rng : BRNGType,
+    n : int, dtype : Optional[BDtypeType] = None, device : Optional[BDeviceType] = None,
+) -> BArrayType:
+    return quaternion_to_matrix(backend, random_quaternions(backend, rng, n, dtype=dtype, device=device))
+
+def random_rotation(
+    backend : ComputeBackend[BArrayType, BDeviceType, BDtypeType, BRNGType], rng : BRNGType,
+    dtype : Optional[BDtypeType] = None, device : Optional[BDeviceType] = None,
+) -> BArrayType:
+    return random_rotations(backend, rng, 1, dtype, device)[:, 0]
+
+def standardize_quaternion(
+    backend : ComputeBackend[BArrayType, BDeviceType, BDtypeType, BRNGType],
+    quaternions : BArrayType
+) -> BArrayType:
+    _check_components(quaternions, 4, "Quaternions")
+    return backend.where(quaternions[0:1] < 0, -quaternions, quaternions)
+
+def quaternion_raw_multiply(
+    backend : ComputeBackend[BArrayType, BDeviceType, BDtypeType, BRNGType],
+    a : BArrayType, b : BArrayType
+) -> BArrayType:
+    _check_components(a, 4, "Quaternions")
+    _check_components(b, 4, "Quaternions")
+    aw, ax, ay, az = a[0], a[1], a[2], a[3]
+    bw, bx, by, bz = b[0], b[1], b[2], b[3]
+    ow = aw * bw - ax * bx - ay * by - az * bz
+    ox = aw * bx + ax * bw + ay * bz - az * by
+    oy = aw * by - ax * bz + ay * bw + az * bx
+    oz = aw * bz + ax * by - ay * bx + az * bw
+    return backend.stack((ow, ox, oy, oz), axis=0)
+
+def quaternion_multiply(
+    backend : ComputeBackend[BArrayType, BDeviceType, BDtypeType, BRNGType],
+    a : BArrayType, b : BArrayType
+) -> BArrayType:
+    return standardize_quaternion(backend, quaternion_raw_multiply(backend, a, b))
+
+def quaternion_invert(
+    backend : ComputeBackend[BArrayType, BDeviceType, BDtypeType, BRNGType],
+    quaternion : BArrayType
+) -> BArrayType:
+    _check_components(quaternion, 4, "Quaternions")
+    return backend.concat((quaternion[0:1], -quaternion[1:]), axis=0)
+
+def quaternion_apply(
+    backend : ComputeBackend[BArrayType, BDeviceType, BDtypeType, BRNGType],
+    quaternion : BArrayType, point : BArrayType
+) -> BArrayType:
+    _check_components(quaternion, 4, "Quaternions")
+    if len(point.shape) == 0 or point.shape[0] != 3:
+        raise ValueError(f"Points are not in 3D, {point.shape}.")
+    # Vector part of q * (0, p) * q^-1 in closed form: (w^2 - |u|^2) p + 2 (u . p) u + 2 w (u x p)
+    w, x, y, z = quaternion[0], quaternion[1], quaternion[2], quaternion[3]
+    px, py, pz = point[0], point[1], point[2]
+    scale = w * w - (x * x + y * y + z * z)
+    dot = 2.0 * (x * px + y * py + z * pz)
+    two_w = 2.0 * w
+    return backend.stack(
+        (
+            scale * px + dot * x + two_w * (y * pz - z * py),
+            scale * py + dot * y + two_w * (z * px - x * pz),
+            scale * pz + dot * z + two_w * (x * py - y * px),
+        ),
+        axis=0,
+    )
+
+def axis_angle_to_matrix(
+    backend : ComputeBackend[BArrayType, BDeviceType, BDtypeType, BRNGType],
+    axis_angle : BArrayType, fast : bool = False
+) -> BArrayType:
+    _check_components(axis_angle, 3, "Axis-angle vectors")
+    if not fast:
+        return quaternion_to_matrix(backend, axis_angle_to_quaternion(backend, axis_angle))
+    # Rodrigues: R = I + sinc(angle) K + (1 - cos(angle)) / angle^2 K^2, with K^2 = r r^T - angle^2 I
+    x, y, z = axis_angle[0], axis_angle[1], axis_angle[2]
+    angles_sqrd = x * x + y * y + z * z
+    angles = backend.sqrt(angles_sqrd)
+    a = backend.sinc(angles / backend.pi)
+    one = get_constant(backend, _scalar_one, angles_sqrd.dtype, backend.device(angles_sqrd))
+    b = (1 - backend.cos(angles)) / backend.where(angles_sqrd == 0, one, angles_sqrd)
+    bx, by, bz = b * x, b * y, b * z
+    ax, ay, az = a * x, a * y, a * z
+    return backend.stack(
+        (
+            1 + bx * x - b * angles_sqrd, by * x - az, bz * x + ay,
+            bx * y + az, 1 + by * y - b * angles_sqrd, bz * y - ax,
+            bx * z - ay, by * z + ax, 1 + bz * z - b * angles_sqrd,
+        ),
+        axis=0,
+    )
+
+def matrix_to_axis_angle(
+    backend : ComputeBackend[BArrayType, BDeviceType, BDtypeType, BRNGType],
+    matrix : BArrayType, fast : bool = False
+) -> BArrayType:
+    _check_components(matrix, 9, "Rotation matrices")
+    if not fast:
+        return quaternion_to_axis_angle(backend, matrix_to_quaternion(backend, matrix))
+    # See `matrix_to_axis_angle` in `base.py`, both branches are evaluated and selected with `where`
+    m00, m01, m02, m10, m11, m12, m20, m21, m22 = (matrix[n] for n in range(9))
+    zero = get_constant(backend, _scalar_zero, matrix.dtype, backend.device(matrix))
+    one = get_constant(backend, _scalar_one, matrix.dtype, backend.device(matrix))
+    wx, wy, wz = m21 - m12, m02 - m20, m10 - m01
+    norms_sqrd = wx * wx + wy * wy + wz * wz
+    nonzero = norms_sqrd > 0
+    norms = backend.where(nonzero, backend.sqrt(backend.where(nonzero, norms_sqrd, one)), zero)
+    traces = m00 + m11 + m22
+    angles = backend.atan2(norms, traces - 1)
+    is_identity = backend.isclose(angles, zero)
+    wx, wy, wz = backend.where(is_identity, zero, wx), backend.where(is_identity, zero, wy), backend.where(is_identity, zero, wz)
+
+    near_pi = backend.isclose(angles, backend.pi)
+    half_over_sinc = 0.5 / backend.where(near_pi, one, backend.sinc(angles / backend.pi))
+
+    cos_angles = (traces - 1) * 0.5
+    d0, d1, d2 = m00 - cos_angles, m11 - cos_angles, m22 - cos_angles
+    s01, s02, s12 = 0.5 * (m01 + m10), 0.5 * (m02 + m20), 0.5 * (m12 + m21)
+    use_row_0 = (d0 >= d1) & (d0 >= d2)
+    use_row_1 = d1 >= d2
+    n0 = backend.where(near_pi, backend.where(use_row_0, d0, backend.where(use_row_1, s01, s02)), one)
+    n1 = backend.where(near_pi, backend.where(use_row_0, s01, backend.where(use_row_1, d1, s12)), one)
+    n2 = backend.where(near_pi, backend.where(use_row_0, s02, backend.where(use_row_1, s12, d2)), one)
+    scale = angles / backend.sqrt(n0 * n0 + n1 * n1 + n2 * n2)
+    scale = backend.where(n0 * wx + n1 * wy + n2 * wz < 0, -scale, scale)
+    return backend.stack(
+        (
+            backend.where(near_pi, scale * n0, wx * half_over_sinc),
+            backend.where(near_pi, scale * n1, wy * half_over_sinc),
+            backend.where(near_pi, scale * n2, wz * half_over_sinc),
+        ),
+        axis=0,
+    )
+
+def axis_angle_to_quaternion(
+    backend : ComputeBackend[BArrayType, BDeviceType, BDtypeType, BRNGType],
+    axis_angle : BArrayType
+) -> BArrayType:
+    _check_components(axis_angle, 3, "Axis-angle vectors")
+    x, y, z = axis_angle[0], axis_angle[1], axis_angle[2]
+    angles = backend.sqrt(x * x + y * y + z * z)
+    sin_half_angles_over_angles = 0.5 * backend.sinc(angles * 0.5 / backend.pi)
+    return backend.stack(
+        (
+            backend.cos(angles * 0.5),
+            x * sin_half_angles_over_angles,
+            y * sin_half_angles_over_angles,
+            z * sin_half_angles_over_angles,
+        ),
+        axis=0,
+    )
+
+def quaternion_to_axis_angle(
+    backend : ComputeBackend[BArrayType, BDeviceType, BDtypeType, BRNGType],
+    quaternions : BArrayType
+) -> BArrayType:
+    _check_components(quaternions, 4, "Quaternions")
+    w, x, y, z = quaternions[0], quaternions[1], quaternions[2], quaternions[3]
+    half_angles = backend.atan2(backend.sqrt(x * x + y * y + z * z), w)
+    # angles/2 are between [-pi/2, pi/2], thus the scale can't be infinite
+    scale = 2.0 / backend.sinc(half_angles / backend.pi)
+    return backend.stack((x * scale, y * scale, z * scale), axis=0)
+
+def rotation_6d_to_matrix(
+    backend : ComputeBackend[BArrayType, BDeviceType, BDtypeType, BRNGType],
+    d6 : BArrayType
+) -> BArrayType:
+    _check_components(d6, 6, "6D rotation representations")
+    a1, a2 = d6[:3], d6[3:]
+    b1 = a1 / backend.linalg.vector_norm(a1, ord=2, axis=0, keepdims=True)
+    b2 = a2 - backend.sum(b1 * a2, axis=0, keepdims=True) * b1
+    b2 = b2 / backend.linalg.vector_norm(b2, ord=2, axis=0, keepdims=True)
+    b3 = backend.linalg.cross(b1, b2, axis=0)
+    return backend.concat((b1, b2, b3), axis=0)
+
+def matrix_to_rotation_6d(
+    backend : ComputeBackend[BArrayType, BDeviceType, BDtypeType, BRNGType],
+    matrix : BArrayType
+) -> BArrayType:
+    _check_components(matrix, 9, "Rotation matrices")
+    return matrix[:6]
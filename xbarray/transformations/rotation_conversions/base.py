@@ -11,8 +11,21 @@
 # Please see https://github.com/facebookresearch/pytorch3d/issues/2002 for some issues involving axis angle rotations
 # --------------------------
 
-from typing import Optional
+"""
+Rotation conversions between quaternions, rotation matrices, Euler angles, axis/angle vectors and 6D representations.
+
+Every conversion takes `layout="interleaved"` (the default, with the component axis last) or `layout="components"`
+for data stored with the component axis first, with rotation matrices as (9, ...) arrays in row-major order,
+see `_soa` and `to_components` / `from_components`.
+"""
+from typing import Optional, Union
 from xbarray.backends.base import ComputeBackend, BArrayType, BDeviceType, BDtypeType, BRNGType
+from .workspace import RotationWorkspace
+from .euler_convention import EulerConvention, get_euler_convention
+from .quaternion_encoding import QuaternionEncoding, get_quaternion_encoding
+from xbarray.transformations.constants import get_constant
+from . import _inplace
+from . import _soa
 
 __all__ = [
     "quaternion_to_matrix",
@@ -23,20 +36,39 @@ __all__ = [
     "random_rotations",
     "random_rotation",
     "standardize_quaternion",
+    "encode_quaternion",
+    "decode_quaternion",
     "quaternion_multiply",
     "quaternion_invert",
     "quaternion_apply",
+    "quaternion_slerp",
+    "squad",
+    "make_quaternions_continuous",
+    "squad_control_points",
+    "resample_quaternion_trajectory",
     "axis_angle_to_matrix",
     "matrix_to_axis_angle",
     "axis_angle_to_quaternion",
     "quaternion_to_axis_angle",
     "rotation_6d_to_matrix",
     "matrix_to_rotation_6d",
+    "to_components",
+    "from_components",
 ]
 
+def _check_components_layout(
+    layout: str,
+    out: Optional[BArrayType] = None, workspace: Optional[RotationWorkspace] = None,
+) -> None:
+    _soa.check_layout(layout)
+    if out is not None or workspace is not None:
+        raise ValueError("`out=` and `workspace=` are only supported with the interleaved layout.")
+
 def quaternion_to_matrix(
     backend : ComputeBackend[BArrayType, BDeviceType, BDtypeType, BRNGType],
     quaternions: BArrayType,
+    out: Optional[BArrayType] = None, workspace: Optional[RotationWorkspace] = None,
+    layout: str = "interleaved",
 ) -> BArrayType:
     """
     Convert rotations given as quaternions to rotation matrices.
@@ -45,9 +77,20 @@ def quaternion_to_matrix(
         backend: The backend to use for the computation.
         quaternions: quaternions with real part first,
             as tensor of shape (..., 4).
+        out: Optional array of shape (..., 3, 3) to write the result into
+            (NumPy and PyTorch only).
+        workspace: Optional `RotationWorkspace` holding the intermediates,
+            reusing it (and `out`) makes repeated calls allocation-free.
+        layout: "interleaved", or "components" for (4, ...) quaternions and (9, ...) matrices.
+
     Returns:
         Rotation matrices as tensor of shape (..., 3, 3).
     """
+    if layout != "interleaved":
+        _check_components_layout(layout, out, workspace)
+        return _soa.quaternion_to_matrix(backend, quaternions)
+    if out is not None or workspace is not None:
+        return _inplace.quaternion_to_matrix(backend, quaternions, out=out, workspace=workspace)
     r, i, j, k = quaternions[..., 0], quaternions[..., 1], quaternions[..., 2], quaternions[..., 3]
     # pyre-fixme[58]: `/` is not supported for operand types `float` and `Tensor`.
     two_s = 2.0 / (quaternions * quaternions).sum(-1)
@@ -98,21 +141,34 @@ def _sqrt_positive_part(backend: ComputeBackend[BArrayType, BDeviceType, BDtypeT
     but with a zero subgradient where x is 0.
     """
     positive_mask = x > 0
-    ret = backend.where(positive_mask, backend.sqrt(x), ret)
+    ret = backend.where(positive_mask, backend.sqrt(backend.clip(x, min=0.0)), backend.zeros_like(x))
     return ret
 
 
-def matrix_to_quaternion(backend: ComputeBackend[BArrayType, BDeviceType, BDtypeType, BRNGType], matrix: BArrayType) -> BArrayType:
+def matrix_to_quaternion(backend: ComputeBackend[BArrayType, BDeviceType, BDtypeType, BRNGType], matrix: BArrayType,
+    out: Optional[BArrayType] = None, workspace: Optional[RotationWorkspace] = None,
+    layout: str = "interleaved",
+) -> BArrayType:
     """
     Convert rotations given as rotation matrices to quaternions.
 
     Args:
         backend: The backend to use for the computation.
         matrix: Rotation matrices as tensor of shape (..., 3, 3).
+        out: Optional array of shape (..., 4) to write the result into
+            (NumPy and PyTorch only).
+        workspace: Optional `RotationWorkspace` holding the intermediates,
+            reusing it (and `out`) makes repeated calls allocation-free.
+        layout: "interleaved", or "components" for (9, ...) matrices and (4, ...) quaternions.
 
     Returns:
         quaternions with real part first, as tensor of shape (..., 4).
     """
+    if layout != "interleaved":
+        _check_components_layout(layout, out, workspace)
+        return _soa.matrix_to_quaternion(backend, matrix)
+    if out is not None or workspace is not None:
+        return _inplace.matrix_to_quaternion(backend, matrix, out=out, workspace=workspace)
     if matrix.shape[-1] != 3 or matrix.shape[-2] != 3:
         raise ValueError(f"Invalid rotation matrix shape {matrix.shape}.")
 
@@ -153,7 +209,7 @@ def matrix_to_quaternion(backend: ComputeBackend[BArrayType, BDeviceType, BDtype
 
     # We floor here at 0.1 but the exact level is not important; if q_abs is small,
     # the candidate won't be picked.
-    quat_candidates = quat_by_rijk / (2.0 * backend.maximum(q_abs[..., None], 0.1))
+    quat_candidates = quat_by_rijk / (2.0 * backend.clip(q_abs[..., None], min=0.1))
 
     # if not for numerical problems, quat_candidates[i] should be same (up to a sign),
     # forall i; we pick the best-conditioned one (with the largest denominator)
@@ -164,45 +220,22 @@ def matrix_to_quaternion(backend: ComputeBackend[BArrayType, BDeviceType, BDtype
     return standardize_quaternion(backend, out)
 
 
-def _axis_angle_rotation(
-    backend: ComputeBackend[BArrayType, BDeviceType, BDtypeType, BRNGType],
-    axis: str, angle: BArrayType
-) -> BArrayType:
-    """
-    Return the rotation matrices for one of the rotations about an axis
-    of which Euler angles describe, for each value of the angle given.
-
-    Args:
-        backend: The backend to use for the computation.
-        axis: Axis label "X" or "Y or "Z".
-        angle: any shape tensor of Euler angles in radians
-
-    Returns:
-        Rotation matrices as tensor of shape (..., 3, 3).
-    """
-
-    cos = backend.cos(angle)
-    sin = backend.sin(angle)
-    one = backend.ones_like(angle)
-    zero = backend.zeros_like(angle)
-
-    if axis == "X":
-        R_flat = (one, zero, zero, zero, cos, -sin, zero, sin, cos)
-    elif axis == "Y":
-        R_flat = (cos, zero, sin, zero, one, zero, -sin, zero, cos)
-    elif axis == "Z":
-        R_flat = (cos, -sin, zero, sin, cos, zero, zero, zero, one)
-    else:
-        raise ValueError("letter must be either X, Y or Z.")
-
-    return backend.reshape(
-        backend.stack(R_flat, axis=-1),
-        angle.shape + (3, 3)
-    )
+def _evaluate_euler_terms(terms: tuple, factors: list) -> BArrayType:
+    value = None
+    for coef, term_factors in terms:
+        product = factors[term_factors[0][0]][term_factors[0][1]]
+        for angle_index, kind in term_factors[1:]:
+            product = product * factors[angle_index][kind]
+        if value is None:
+            value = product if coef > 0 else -product
+        else:
+            value = value + product if coef > 0 else value - product
+    return value
 
 def euler_angles_to_matrix(
     backend: ComputeBackend[BArrayType, BDeviceType, BDtypeType, BRNGType],
-    euler_angles: BArrayType, convention: str
+    euler_angles: BArrayType, convention: Union[str, EulerConvention],
+    layout: str = "interleaved",
 ) -> BArrayType:
     """
     Convert rotations given as Euler angles in radians to rotation matrices.
@@ -211,124 +244,74 @@ def euler_angles_to_matrix(
         backend: The backend to use for the computation.
         euler_angles: Euler angles in radians as tensor of shape (..., 3).
         convention: Convention string of three uppercase letters from
-            {"X", "Y", and "Z"}.
+            {"X", "Y", and "Z"}, or an `EulerConvention`.
+        layout: "interleaved", or "components" for (3, ...) Euler angles and (9, ...) matrices.
 
     Returns:
         Rotation matrices as tensor of shape (..., 3, 3).
     """
-    if euler_angles.dim() == 0 or euler_angles.shape[-1] != 3:
+    if layout != "interleaved":
+        _check_components_layout(layout)
+        return _soa.euler_angles_to_matrix(backend, euler_angles, convention)
+    if len(euler_angles.shape) == 0 or euler_angles.shape[-1] != 3:
         raise ValueError("Invalid input euler angles.")
-    if len(convention) != 3:
-        raise ValueError("Convention must have 3 letters.")
-    if convention[1] in (convention[0], convention[2]):
-        raise ValueError(f"Invalid convention {convention}.")
-    for letter in convention:
-        if letter not in ("X", "Y", "Z"):
-            raise ValueError(f"Invalid letter {letter} in convention string.")
-    matrices = [
-        _axis_angle_rotation(backend, c, e)
-        for c, e in zip(convention, [euler_angles[..., i] for i in range(3)])
-    ]
-    # return functools.reduce(torch.matmul, matrices)
-    return backend.matmul(backend.matmul(matrices[0], matrices[1]), matrices[2])
-
-def _angle_from_tan(
-    backend: ComputeBackend[BArrayType, BDeviceType, BDtypeType, BRNGType],
-    axis: str, other_axis: str, 
-    data : BArrayType, 
-    horizontal: bool, tait_bryan: bool
-) -> BArrayType:
-    """
-    Extract the first or third Euler angle from the two members of
-    the matrix which are positive constant times its sine and cosine.
-
-    Args:
-        backend: The backend to use for the computation.
-        axis: Axis label "X" or "Y or "Z" for the angle we are finding.
-        other_axis: Axis label "X" or "Y or "Z" for the middle axis in the
-            convention.
-        data: Rotation matrices as tensor of shape (..., 3, 3).
-        horizontal: Whether we are looking for the angle for the third axis,
-            which means the relevant entries are in the same row of the
-            rotation matrix. If not, they are in the same column.
-        tait_bryan: Whether the first and third axes in the convention differ.
-
-    Returns:
-        Euler Angles in radians for each matrix in data as a tensor
-        of shape (...).
-    """
-
-    i1, i2 = {"X": (2, 1), "Y": (0, 2), "Z": (1, 0)}[axis]
-    if horizontal:
-        i2, i1 = i1, i2
-    even = (axis + other_axis) in ["XY", "YZ", "ZX"]
-    if horizontal == even:
-        return backend.atan2(data[..., i1], data[..., i2])
-    if tait_bryan:
-        return backend.atan2(-data[..., i2], data[..., i1])
-    return backend.atan2(data[..., i2], -data[..., i1])
-
-
-def _index_from_letter(letter: str) -> int:
-    if letter == "X":
-        return 0
-    if letter == "Y":
-        return 1
-    if letter == "Z":
-        return 2
-    raise ValueError("letter must be either X, Y or Z.")
+    convention = get_euler_convention(convention)
+    # Closed form of R_0(angle_0) @ R_1(angle_1) @ R_2(angle_2), every entry being a sum of products of cos / sin
+    cos = backend.cos(euler_angles)
+    sin = backend.sin(euler_angles)
+    factors = [(cos[..., i], sin[..., i]) for i in range(3)]
+    R_flat = tuple(_evaluate_euler_terms(terms, factors) for terms in convention.matrix_terms)
+    return backend.reshape(
+        backend.stack(R_flat, axis=-1),
+        euler_angles.shape[:-1] + (3, 3)
+    )
 
+def _matrix_entry(matrix : BArrayType, entry : tuple) -> BArrayType:
+    row, col, sign = entry
+    return matrix[..., row, col] if sign > 0 else -matrix[..., row, col]
 
 def matrix_to_euler_angles(
     backend : ComputeBackend[BArrayType, BDeviceType, BDtypeType, BRNGType],    
-    matrix: BArrayType, convention: str
+    matrix: BArrayType, convention: Union[str, EulerConvention],
+    layout: str = "interleaved",
 ) -> BArrayType:
     """
     Convert rotations given as rotation matrices to Euler angles in radians.
 
     Args:
+        backend: The backend to use for the computation.
         matrix: Rotation matrices as tensor of shape (..., 3, 3).
-        convention: Convention string of three uppercase letters.
+        convention: Convention string of three uppercase letters, or an `EulerConvention`.
+        layout: "interleaved", or "components" for (9, ...) matrices and (3, ...) Euler angles.
 
     Returns:
         Euler angles in radians as tensor of shape (..., 3).
     """
-    if len(convention) != 3:
-        raise ValueError("Convention must have 3 letters.")
-    if convention[1] in (convention[0], convention[2]):
-        raise ValueError(f"Invalid convention {convention}.")
-    for letter in convention:
-        if letter not in ("X", "Y", "Z"):
-            raise ValueError(f"Invalid letter {letter} in convention string.")
-    if matrix.size(-1) != 3 or matrix.size(-2) != 3:
+    if layout != "interleaved":
+        _check_components_layout(layout)
+        return _soa.matrix_to_euler_angles(backend, matrix, convention)
+    convention = get_euler_convention(convention)
+    if matrix.shape[-1] != 3 or matrix.shape[-2] != 3:
         raise ValueError(f"Invalid rotation matrix shape {matrix.shape}.")
-    i0 = _index_from_letter(convention[0])
-    i2 = _index_from_letter(convention[2])
-    tait_bryan = i0 != i2
-    if tait_bryan:
-        central_angle = backend.asin(
-            backend.clip(matrix[..., i0, i2], -1.0, 1.0)
-            * (-1.0 if i0 - i2 in [-1, 2] else 1.0)
-        )
+    central_entry = backend.clip(_matrix_entry(matrix, convention.central_angle_entry), -1.0, 1.0)
+    if convention.tait_bryan:
+        central_angle = backend.asin(central_entry)
     else:
-        central_angle = backend.acos(backend.clip(matrix[..., i0, i0], -1.0, 1.0))
+        central_angle = backend.acos(central_entry)
 
+    first_y, first_x = convention.first_angle_entries
+    third_y, third_x = convention.third_angle_entries
     o = (
-        _angle_from_tan(
-            backend,
-            convention[0], convention[1], matrix[..., i2], False, tait_bryan
-        ),
+        backend.atan2(_matrix_entry(matrix, first_y), _matrix_entry(matrix, first_x)),
         central_angle,
-        _angle_from_tan(
-            backend,
-            convention[2], convention[1], matrix[..., i0, :], True, tait_bryan
-        ),
+        backend.atan2(_matrix_entry(matrix, third_y), _matrix_entry(matrix, third_x)),
     )
     return backend.stack(o, -1)
 
 def random_quaternions(
     backend : ComputeBackend[BArrayType, BDeviceType, BDtypeType, BRNGType], rng : BRNGType,
     n: int, dtype: Optional[BDtypeType] = None, device: Optional[BDeviceType] = None,
+    layout: str = "interleaved",
 ) -> BArrayType:
     """
     Generate random quaternions representing rotations,
@@ -341,11 +324,15 @@ def random_quaternions(
         dtype: Type to return.
         device: Desired device of returned tensor. Default:
             uses the current device for the default tensor type.
+        layout: "interleaved", or "components" for (4, N) quaternions.
 
     Returns:
         Quaternions as tensor of shape (N, 4).
     """
-    o = backend.random.random_normal((n, 4), rng=rng, dtype=dtype, device=device)
+    if layout != "interleaved":
+        _check_components_layout(layout)
+        return _soa.random_quaternions(backend, rng, n, dtype=dtype, device=device)
+    _, o = backend.random.random_normal((n, 4), rng=rng, dtype=dtype, device=device)
     s = backend.sum(o * o, axis=1)
     o = o / _copysign(backend, backend.sqrt(s), o[:, 0])[:, None]
     return o
@@ -353,7 +340,8 @@ def random_quaternions(
 
 def random_rotations(
     backend : ComputeBackend[BArrayType, BDeviceType, BDtypeType, BRNGType], rng : BRNGType,
-    n: int, dtype: Optional[BDtypeType] = None, device: Optional[BDeviceType] = None
+    n: int, dtype: Optional[BDtypeType] = None, device: Optional[BDeviceType] = None,
+    layout: str = "interleaved",
 ) -> BArrayType:
     """
     Generate random rotations as 3x3 rotation matrices.
@@ -365,17 +353,22 @@ def random_rotations(
         dtype: Type to return.
         device: Device of returned tensor. Default: if None,
             uses the current device for the default tensor type.
+        layout: "interleaved", or "components" for (9, n) matrices.
 
     Returns:
         Rotation matrices as tensor of shape (n, 3, 3).
     """
+    if layout != "interleaved":
+        _check_components_layout(layout)
+        return _soa.random_rotations(backend, rng, n, dtype=dtype, device=device)
     quaternions = random_quaternions(backend, rng, n, dtype=dtype, device=device)
     return quaternion_to_matrix(backend, quaternions)
 
 
 def random_rotation(
     backend : ComputeBackend[BArrayType, BDeviceType, BDtypeType, BRNGType], rng : BRNGType,
-    dtype: Optional[BDtypeType] = None, device: Optional[BDeviceType] = None
+    dtype: Optional[BDtypeType] = None, device: Optional[BDeviceType] = None,
+    layout: str = "interleaved",
 ) -> BArrayType:
     """
     Generate a single random 3x3 rotation matrix.
@@ -386,16 +379,23 @@ def random_rotation(
         dtype: Type to return
         device: Device of returned tensor. Default: if None,
             uses the current device for the default tensor type
+        layout: "interleaved", or "components" for a (9,) matrix.
 
     Returns:
         Rotation matrix as tensor of shape (3, 3).
     """
+    if layout != "interleaved":
+        _check_components_layout(layout)
+        return _soa.random_rotation(backend, rng, dtype=dtype, device=device)
     return random_rotations(backend, rng, 1, dtype, device)[0]
 
 
 def standardize_quaternion(
     backend : ComputeBackend[BArrayType, BDeviceType, BDtypeType, BRNGType],    
-    quaternions: BArrayType) -> BArrayType:
+    quaternions: BArrayType,
+    out: Optional[BArrayType] = None, workspace: Optional[RotationWorkspace] = None,
+    layout: str = "interleaved",
+) -> BArrayType:
     """
     Convert a unit quaternion to a standard form: one in which the real
     part is non negative.
@@ -404,16 +404,159 @@ def standardize_quaternion(
         backend: The backend to use for the computation.
         quaternions: Quaternions with real part first,
             as tensor of shape (..., 4).
+        out: Optional array of shape (..., 4) to write the result into
+            (NumPy and PyTorch only), it may be one of the inputs.
+        workspace: Optional `RotationWorkspace` holding the intermediates,
+            reusing it (and `out`) makes repeated calls allocation-free.
+        layout: "interleaved", or "components" for (4, ...) quaternions.
 
     Returns:
         Standardized quaternions as tensor of shape (..., 4).
     """
+    if layout != "interleaved":
+        _check_components_layout(layout, out, workspace)
+        return _soa.standardize_quaternion(backend, quaternions)
+    if out is not None or workspace is not None:
+        return _inplace.standardize_quaternion(backend, quaternions, out=out, workspace=workspace)
     return backend.where(quaternions[..., 0:1] < 0, -quaternions, quaternions)
 
 
+# Bound of the three smallest components of a unit quaternion (and scale of their quantization)
+_SQRT_HALF = 0.7071067811865476
+
+
+def _split_components(x: BArrayType, num_components: int, layout: str, name: str) -> list:
+    if layout == "interleaved":
+        if len(x.shape) == 0 or x.shape[-1] != num_components:
+            raise ValueError(f"{name} must have shape (..., {num_components}), got {x.shape}.")
+        return [x[..., i] for i in range(num_components)]
+    _soa._check_components(x, num_components, name)
+    return [x[i] for i in range(num_components)]
+
+
+def encode_quaternion(
+    backend : ComputeBackend[BArrayType, BDeviceType, BDtypeType, BRNGType],
+    quaternions: BArrayType,
+    encoding: Union[str, QuaternionEncoding] = "smallest_three_32",
+    layout: str = "interleaved",
+) -> BArrayType:
+    """
+    Encode unit quaternions in a compact format for storage or transfer, see `QuaternionEncoding`.
+    `decode_quaternion` gives back the same rotations up to the `max_angular_error` of the encoding,
+    but not necessarily with the same sign.
+
+    Args:
+        backend: The backend to use for the computation.
+        quaternions: Unit quaternions with real part first,
+            as tensor of shape (..., 4).
+        encoding: Name of the encoding (one of `QUATERNION_ENCODINGS`)
+            or a `QuaternionEncoding`.
+        layout: "interleaved", or "components" for (4, ...) quaternions and encoded arrays.
+
+    Returns:
+        Encoded quaternions, uint32 tensor of shape (...) for "smallest_three_32",
+        uint16 tensor of shape (..., 3) for "smallest_three_48"
+        and float16 tensor of shape (..., 4) for "float16".
+    """
+    _soa.check_layout(layout)
+    encoding = get_quaternion_encoding(encoding)
+    components = _split_components(quaternions, 4, layout, "Quaternions")
+    if encoding.component_bits is None:
+        return backend.astype(quaternions, backend.float16)
+
+    axis = -1 if layout == "interleaved" else 0
+    index = backend.astype(backend.argmax(backend.abs(quaternions), axis=axis), backend.int32)
+    largest = backend.where(
+        index == 0, components[0],
+        backend.where(index == 1, components[1], backend.where(index == 2, components[2], components[3]))
+    )
+    # q and -q are the same rotation, the sign is chosen to make the dropped (largest) component positive
+    negate = largest < 0
+    levels = 2 ** encoding.component_bits - 1
+    quantized = []
+    for k in range(3):
+        # The k-th remaining component, skipping the largest one
+        component = backend.where(index <= k, components[k + 1], components[k])
+        component = backend.where(negate, -component, component)
+        level = backend.round((component + _SQRT_HALF) * (levels * _SQRT_HALF))
+        quantized.append(backend.astype(backend.clip(level, min=0.0, max=float(levels)), backend.int32))
+
+    if encoding.encoded_size is None:
+        packed = backend.bitwise_or(
+            backend.bitwise_or(backend.bitwise_left_shift(index, 30), backend.bitwise_left_shift(quantized[0], 20)),
+            backend.bitwise_or(backend.bitwise_left_shift(quantized[1], 10), quantized[2]),
+        )
+        return backend.astype(packed, backend.uint32)
+    words = (
+        backend.bitwise_or(quantized[0], backend.bitwise_left_shift(backend.bitwise_and(index, 1), 15)),
+        backend.bitwise_or(quantized[1], backend.bitwise_left_shift(backend.bitwise_right_shift(index, 1), 15)),
+        quantized[2],
+    )
+    return backend.astype(backend.stack(words, axis=axis), backend.uint16)
+
+
+def decode_quaternion(
+    backend : ComputeBackend[BArrayType, BDeviceType, BDtypeType, BRNGType],
+    encoded: BArrayType,
+    encoding: Union[str, QuaternionEncoding] = "smallest_three_32",
+    dtype: Optional[BDtypeType] = None,
+    layout: str = "interleaved",
+) -> BArrayType:
+    """
+    Decode quaternions encoded by `encode_quaternion`.
+
+    Args:
+        backend: The backend to use for the computation.
+        encoded: Encoded quaternions, as returned by `encode_quaternion`.
+        encoding: Name of the encoding (one of `QUATERNION_ENCODINGS`)
+            or a `QuaternionEncoding`.
+        dtype: Floating point dtype of the decoded quaternions,
+            the default floating point dtype of the backend if None.
+        layout: "interleaved", or "components" for (4, ...) quaternions and encoded arrays.
+
+    Returns:
+        Unit quaternions with real part first, as tensor of shape (..., 4).
+    """
+    _soa.check_layout(layout)
+    encoding = get_quaternion_encoding(encoding)
+    dtype = backend.default_floating_dtype if dtype is None else dtype
+    axis = -1 if layout == "interleaved" else 0
+    if encoding.component_bits is None:
+        _split_components(encoded, 4, layout, "Encoded quaternions")
+        quaternions = backend.astype(encoded, dtype)
+        return quaternions / backend.sqrt(backend.sum(quaternions * quaternions, axis=axis, keepdims=True))
+
+    levels = 2 ** encoding.component_bits - 1
+    if encoding.encoded_size is None:
+        packed = backend.astype(encoded, backend.int32)
+        index = backend.bitwise_and(backend.bitwise_right_shift(packed, 30), 3)
+        quantized = [backend.bitwise_and(backend.bitwise_right_shift(packed, shift), levels) for shift in (20, 10, 0)]
+    else:
+        words = [backend.astype(word, backend.int32) for word in _split_components(encoded, 3, layout, "Encoded quaternions")]
+        index = backend.bitwise_or(
+            backend.bitwise_right_shift(words[0], 15),
+            backend.bitwise_left_shift(backend.bitwise_right_shift(words[1], 15), 1),
+        )
+        quantized = [backend.bitwise_and(word, levels) for word in words]
+
+    c0, c1, c2 = (backend.astype(level, dtype) * (1.0 / (levels * _SQRT_HALF)) - _SQRT_HALF for level in quantized)
+    largest = _sqrt_positive_part(backend, 1.0 - c0 * c0 - c1 * c1 - c2 * c2)
+    return backend.stack(
+        (
+            backend.where(index == 0, largest, c0),
+            backend.where(index == 1, largest, backend.where(index < 1, c0, c1)),
+            backend.where(index == 2, largest, backend.where(index < 2, c1, c2)),
+            backend.where(index == 3, largest, c2),
+        ),
+        axis=axis,
+    )
+
+
 def quaternion_raw_multiply(
     backend : ComputeBackend[BArrayType, BDeviceType, BDtypeType, BRNGType],
-    a: BArrayType, b: BArrayType
+    a: BArrayType, b: BArrayType,
+    out: Optional[BArrayType] = None, workspace: Optional[RotationWorkspace] = None,
+    layout: str = "interleaved",
 ) -> BArrayType:
     """
     Multiply two quaternions.
@@ -423,10 +566,20 @@ def quaternion_raw_multiply(
         backend: The backend to use for the computation.
         a: Quaternions as tensor of shape (..., 4), real part first.
         b: Quaternions as tensor of shape (..., 4), real part first.
+        out: Optional array of shape (..., 4) to write the result into
+            (NumPy and PyTorch only), it may be one of the inputs.
+        workspace: Optional `RotationWorkspace` holding the intermediates,
+            reusing it (and `out`) makes repeated calls allocation-free.
+        layout: "interleaved", or "components" for (4, ...) quaternions.
 
     Returns:
         The product of a and b, a tensor of quaternions shape (..., 4).
     """
+    if layout != "interleaved":
+        _check_components_layout(layout, out, workspace)
+        return _soa.quaternion_raw_multiply(backend, a, b)
+    if out is not None or workspace is not None:
+        return _inplace.quaternion_raw_multiply(backend, a, b, out=out, workspace=workspace)
     aw, ax, ay, az = a[..., 0], a[..., 1], a[..., 2], a[..., 3]
     bw, bx, by, bz = b[..., 0], b[..., 1], b[..., 2], b[..., 3]
     ow = aw * bw - ax * bx - ay * by - az * bz
@@ -438,7 +591,9 @@ def quaternion_raw_multiply(
 
 def quaternion_multiply(
     backend : ComputeBackend[BArrayType, BDeviceType, BDtypeType, BRNGType], 
-    a: BArrayType, b: BArrayType
+    a: BArrayType, b: BArrayType,
+    out: Optional[BArrayType] = None, workspace: Optional[RotationWorkspace] = None,
+    layout: str = "interleaved",
 ) -> BArrayType:
     """
     Multiply two quaternions representing rotations, returning the quaternion
@@ -449,17 +604,41 @@ def quaternion_multiply(
         backend: The backend to use for the computation.
         a: Quaternions as tensor of shape (..., 4), real part first.
         b: Quaternions as tensor of shape (..., 4), real part first.
+        out: Optional array of shape (..., 4) to write the result into
+            (NumPy and PyTorch only), it may be one of the inputs.
+        workspace: Optional `RotationWorkspace` holding the intermediates,
+            reusing it (and `out`) makes repeated calls allocation-free.
+        layout: "interleaved", or "components" for (4, ...) quaternions.
 
     Returns:
         The product of a and b, a tensor of quaternions of shape (..., 4).
     """
+    if layout != "interleaved":
+        _check_components_layout(layout, out, workspace)
+        return _soa.quaternion_multiply(backend, a, b)
+    if out is not None or workspace is not None:
+        return _inplace.quaternion_multiply(backend, a, b, out=out, workspace=workspace)
     ab = quaternion_raw_multiply(backend, a, b)
     return standardize_quaternion(backend, ab)
 
 
+def _conjugate_scaling(backend, dtype, device):
+    return backend.asarray([1, -1, -1, -1], dtype=dtype, device=device)
+
+
+def _identity_3x3(backend, dtype, device):
+    return backend.eye(3, dtype=dtype, device=device)
+
+
+def _zeros_3(backend, dtype, device):
+    return backend.zeros(3, dtype=dtype, device=device)
+
+
 def quaternion_invert(
     backend : ComputeBackend[BArrayType, BDeviceType, BDtypeType, BRNGType],    
-    quaternion: BArrayType
+    quaternion: BArrayType,
+    out: Optional[BArrayType] = None, workspace: Optional[RotationWorkspace] = None,
+    layout: str = "interleaved",
 ) -> BArrayType:
     """
     Given a quaternion representing rotation, get the quaternion representing
@@ -469,21 +648,30 @@ def quaternion_invert(
         backend: The backend to use for the computation.
         quaternion: Quaternions as tensor of shape (..., 4), with real part
             first, which must be versors (unit quaternions).
+        out: Optional array of shape (..., 4) to write the result into
+            (NumPy and PyTorch only), it may be one of the inputs.
+        workspace: Optional `RotationWorkspace` holding the intermediates,
+            reusing it (and `out`) makes repeated calls allocation-free.
+        layout: "interleaved", or "components" for (4, ...) quaternions.
 
     Returns:
         The inverse, a tensor of quaternions of shape (..., 4).
     """
+    if layout != "interleaved":
+        _check_components_layout(layout, out, workspace)
+        return _soa.quaternion_invert(backend, quaternion)
+    if out is not None or workspace is not None:
+        return _inplace.quaternion_invert(backend, quaternion, out=out, workspace=workspace)
 
-    scaling = backend.reshape(
-        backend.asarray([1, -1, -1, -1], device=backend.device(quaternion)),
-        [1] * (len(quaternion.shape) - 1) + [4]
-    )
+    scaling = get_constant(backend, _conjugate_scaling, quaternion.dtype, backend.device(quaternion))
     return quaternion * scaling
 
 
 def quaternion_apply(
     backend : ComputeBackend[BArrayType, BDeviceType, BDtypeType, BRNGType],    
-    quaternion: BArrayType, point: BArrayType
+    quaternion: BArrayType, point: BArrayType,
+    out: Optional[BArrayType] = None, workspace: Optional[RotationWorkspace] = None,
+    layout: str = "interleaved",
 ) -> BArrayType:
     """
     Apply the rotation given by a quaternion to a 3D point.
@@ -493,24 +681,249 @@ def quaternion_apply(
         backend: The backend to use for the computation.
         quaternion: Tensor of quaternions, real part first, of shape (..., 4).
         point: Tensor of 3D points of shape (..., 3).
+        out: Optional array of shape (..., 3) to write the result into
+            (NumPy and PyTorch only), it may be one of the inputs.
+        workspace: Optional `RotationWorkspace` holding the intermediates,
+            reusing it (and `out`) makes repeated calls allocation-free.
+        layout: "interleaved", or "components" for (4, ...) quaternions and (3, ...) points.
 
     Returns:
         Tensor of rotated points of shape (..., 3).
     """
+    if layout != "interleaved":
+        _check_components_layout(layout, out, workspace)
+        return _soa.quaternion_apply(backend, quaternion, point)
+    if out is not None or workspace is not None:
+        return _inplace.quaternion_apply(backend, quaternion, point, out=out, workspace=workspace)
     if point.shape[-1] != 3:
         raise ValueError(f"Points are not in 3D, {point.shape}.")
     real_parts = backend.zeros(point.shape[:-1] + (1,), dtype=point.dtype, device=backend.device(point))
     point_as_quaternion = backend.concat((real_parts, point), axis=-1)
     out = quaternion_raw_multiply(
+        backend,
         quaternion_raw_multiply(backend, quaternion, point_as_quaternion),
         quaternion_invert(backend, quaternion),
     )
     return out[..., 1:]
 
 
+# Below this sine of the angle between two quaternions, slerp falls back to (normalized) linear interpolation
+_SLERP_TINY_SIN = 1e-6
+
+
+def _time_slice(x: BArrayType, start: Optional[int], stop: Optional[int], layout: str) -> BArrayType:
+    # Slice along the time axis of a trajectory: the first axis, after the component axis in the components layout
+    if layout == "interleaved":
+        return x[start:stop]
+    return x[:, start:stop]
+
+
+def quaternion_slerp(
+    backend : ComputeBackend[BArrayType, BDeviceType, BDtypeType, BRNGType],
+    q0: BArrayType, q1: BArrayType, t: Union[BArrayType, float],
+    layout: str = "interleaved",
+) -> BArrayType:
+    """
+    Spherical linear interpolation between unit quaternions, along the shortest path
+    (q1 is negated where its dot product with q0 is negative).
+    Usual torch rules for broadcasting apply.
+
+    Args:
+        backend: The backend to use for the computation.
+        q0: Quaternions at t = 0, real part first, of shape (..., 4).
+        q1: Quaternions at t = 1, real part first, of shape (..., 4).
+        t: Interpolation parameters, a float or a tensor of shape (...).
+        layout: "interleaved", or "components" for (4, ...) quaternions.
+
+    Returns:
+        Interpolated unit quaternions of shape (..., 4).
+    """
+    _soa.check_layout(layout)
+    axis = -1 if layout == "interleaved" else 0
+    if not isinstance(t, (int, float)):
+        t = t[..., None] if layout == "interleaved" else t[None]
+    dot = backend.sum(q0 * q1, axis=axis, keepdims=True)
+    q1 = backend.where(dot < 0, -q1, q1)
+    # The angle between q0 and q1, accurate for small angles (unlike acos of the dot product)
+    difference = q0 - q1
+    total = q0 + q1
+    difference_sqrd = backend.sum(difference * difference, axis=axis, keepdims=True)
+    # Masked sqrt, so the gradients stay finite for equal quaternions
+    nonzero = difference_sqrd > 0
+    difference_norm = backend.where(
+        nonzero, backend.sqrt(backend.where(nonzero, difference_sqrd, backend.ones_like(difference_sqrd))), backend.zeros_like(difference_sqrd)
+    )
+    theta = 2.0 * backend.atan2(difference_norm, backend.sqrt(backend.sum(total * total, axis=axis, keepdims=True)))
+    sin_theta = backend.sin(theta)
+    linear = sin_theta < _SLERP_TINY_SIN
+    safe_sin_theta = backend.where(linear, backend.ones_like(sin_theta), sin_theta)
+    w0 = backend.where(linear, 1.0 - t, backend.sin((1.0 - t) * theta) / safe_sin_theta)
+    w1 = backend.where(linear, t, backend.sin(t * theta) / safe_sin_theta)
+    out = w0 * q0 + w1 * q1
+    # Exact for unit inputs away from the linear fallback, keeps the result unit otherwise
+    return out / backend.sqrt(backend.sum(out * out, axis=axis, keepdims=True))
+
+
+def squad(
+    backend : ComputeBackend[BArrayType, BDeviceType, BDtypeType, BRNGType],
+    q0: BArrayType, q1: BArrayType, s0: BArrayType, s1: BArrayType, t: Union[BArrayType, float],
+    layout: str = "interleaved",
+) -> BArrayType:
+    """
+    Spherical quadrangle interpolation between unit quaternions, a C1-continuous spline
+    through a sequence of quaternions when the control points come from `squad_control_points`.
+    Usual torch rules for broadcasting apply.
+
+    Args:
+        backend: The backend to use for the computation.
+        q0: Quaternions at t = 0, real part first, of shape (..., 4).
+        q1: Quaternions at t = 1, real part first, of shape (..., 4).
+        s0: Control points of q0, of shape (..., 4).
+        s1: Control points of q1, of shape (..., 4).
+        t: Interpolation parameters, a float or a tensor of shape (...).
+        layout: "interleaved", or "components" for (4, ...) quaternions.
+
+    Returns:
+        Interpolated unit quaternions of shape (..., 4).
+    """
+    return quaternion_slerp(
+        backend,
+        quaternion_slerp(backend, q0, q1, t, layout=layout),
+        quaternion_slerp(backend, s0, s1, t, layout=layout),
+        2.0 * t * (1.0 - t),
+        layout=layout,
+    )
+
+
+def make_quaternions_continuous(
+    backend : ComputeBackend[BArrayType, BDeviceType, BDtypeType, BRNGType],
+    quaternions: BArrayType,
+    layout: str = "interleaved",
+) -> BArrayType:
+    """
+    Negate quaternions of a sequence (q and -q are the same rotation) so that consecutive quaternions
+    are in the same hemisphere (non-negative dot product), keeping the first one as is.
+    Interpolating such a sequence never takes the long way around.
+
+    Args:
+        backend: The backend to use for the computation.
+        quaternions: Sequences of quaternions, real part first, of shape (T, ..., 4).
+        layout: "interleaved", or "components" for (4, T, ...) quaternions.
+
+    Returns:
+        Quaternions of shape (T, ..., 4).
+    """
+    _soa.check_layout(layout)
+    axis = -1 if layout == "interleaved" else 0
+    time_axis = 0 if layout == "interleaved" else 1
+    dot = backend.sum(
+        _time_slice(quaternions, None, -1, layout) * _time_slice(quaternions, 1, None, layout),
+        axis=axis, keepdims=True,
+    )
+    # The sign of every quaternion is the parity of the number of sign changes before it
+    flips = backend.cumulative_sum(backend.astype(dot < 0, backend.int32), axis=time_axis)
+    negate = backend.bitwise_and(flips, 1) == 1
+    return backend.concat(
+        (
+            _time_slice(quaternions, None, 1, layout),
+            backend.where(negate, -_time_slice(quaternions, 1, None, layout), _time_slice(quaternions, 1, None, layout)),
+        ),
+        axis=time_axis,
+    )
+
+
+def squad_control_points(
+    backend : ComputeBackend[BArrayType, BDeviceType, BDtypeType, BRNGType],
+    quaternions: BArrayType,
+    layout: str = "interleaved",
+) -> BArrayType:
+    """
+    Control points of `squad` for sequences of unit quaternions,
+    s_i = q_i exp(-(log(q_i^-1 q_(i+1)) + log(q_i^-1 q_(i-1))) / 4), with the end points repeated at the ends.
+    The sequences should be continuous (see `make_quaternions_continuous`).
+
+    Args:
+        backend: The backend to use for the computation.
+        quaternions: Sequences of quaternions, real part first, of shape (T, ..., 4).
+        layout: "interleaved", or "components" for (4, T, ...) quaternions.
+
+    Returns:
+        Control points of shape (T, ..., 4).
+    """
+    _soa.check_layout(layout)
+    time_axis = 0 if layout == "interleaved" else 1
+    previous = backend.concat((_time_slice(quaternions, None, 1, layout), _time_slice(quaternions, None, -1, layout)), axis=time_axis)
+    following = backend.concat((_time_slice(quaternions, 1, None, layout), _time_slice(quaternions, -1, None, layout)), axis=time_axis)
+    inverse = quaternion_invert(backend, quaternions, layout=layout)
+    # The axis-angle vector of a unit quaternion is twice its logarithm, and conversely for the exponential
+    tangent = (
+        quaternion_to_axis_angle(backend, quaternion_raw_multiply(backend, inverse, following, layout=layout), layout=layout)
+        + quaternion_to_axis_angle(backend, quaternion_raw_multiply(backend, inverse, previous, layout=layout), layout=layout)
+    )
+    return quaternion_raw_multiply(
+        backend, quaternions, axis_angle_to_quaternion(backend, -0.25 * tangent, layout=layout), layout=layout
+    )
+
+
+def resample_quaternion_trajectory(
+    backend : ComputeBackend[BArrayType, BDeviceType, BDtypeType, BRNGType],
+    times: BArrayType, quaternions: BArrayType, new_times: BArrayType,
+    method: str = "slerp",
+    layout: str = "interleaved",
+) -> BArrayType:
+    """
+    Resample sequences of unit quaternions sampled at `times` at `new_times`, with one vectorized interval lookup
+    (`searchsorted`) and interpolation for all the new times. The sequences are made continuous first
+    (see `make_quaternions_continuous`), new times outside of [times[0], times[-1]] get the end quaternions.
+
+    Args:
+        backend: The backend to use for the computation.
+        times: Strictly increasing sample times, of shape (T,) with T >= 2.
+        quaternions: Sequences of quaternions at these times, real part first, of shape (T, ..., 4).
+        new_times: Times to resample at, of shape (N,).
+        method: "slerp" (piecewise spherical linear interpolation)
+            or "squad" (C1-continuous spherical spline, see `squad`).
+        layout: "interleaved", or "components" for (4, T, ...) quaternions.
+
+    Returns:
+        Resampled quaternions of shape (N, ..., 4).
+    """
+    _soa.check_layout(layout)
+    if method not in ("slerp", "squad"):
+        raise ValueError(f"Unknown interpolation method {method!r}, expected 'slerp' or 'squad'.")
+    time_axis = 0 if layout == "interleaved" else 1
+    num_times = times.shape[0]
+    if len(times.shape) != 1 or num_times < 2:
+        raise ValueError(f"Times must have shape (T,) with T >= 2, got {times.shape}.")
+    if len(quaternions.shape) <= time_axis or quaternions.shape[time_axis] != num_times:
+        raise ValueError(f"Quaternions of shape {quaternions.shape} do not match the {num_times} times.")
+    quaternions = make_quaternions_continuous(backend, quaternions, layout=layout)
+
+    index = backend.searchsorted(times, new_times, side="right") - 1
+    index = backend.clip(index, min=0, max=num_times - 2)
+    next_index = index + 1
+    start_times = backend.take(times, index, axis=0)
+    t = backend.clip((new_times - start_times) / (backend.take(times, next_index, axis=0) - start_times), min=0.0, max=1.0)
+    # (N,) -> (N, 1, ...) to broadcast against the batch axes of the quaternions
+    num_batch_dims = len(quaternions.shape) - 2
+    t = backend.reshape(t, t.shape + (1,) * num_batch_dims)
+
+    q0 = backend.take(quaternions, index, axis=time_axis)
+    q1 = backend.take(quaternions, next_index, axis=time_axis)
+    if method == "slerp":
+        return quaternion_slerp(backend, q0, q1, t, layout=layout)
+    control_points = squad_control_points(backend, quaternions, layout=layout)
+    s0 = backend.take(control_points, index, axis=time_axis)
+    s1 = backend.take(control_points, next_index, axis=time_axis)
+    return squad(backend, q0, q1, s0, s1, t, layout=layout)
+
+
 def axis_angle_to_matrix(
     backend : ComputeBackend[BArrayType, BDeviceType, BDtypeType, BRNGType],
-    axis_angle: BArrayType, fast: bool = False) -> BArrayType:
+    axis_angle: BArrayType, fast: bool = False,
+    out: Optional[BArrayType] = None, workspace: Optional[RotationWorkspace] = None,
+    layout: str = "interleaved",
+) -> BArrayType:
     """
     Convert rotations given as axis/angle to rotation matrices.
 
@@ -523,10 +936,20 @@ def axis_angle_to_matrix(
         fast: Whether to use the new faster implementation (based on the
             Rodrigues formula) instead of the original implementation (which
             first converted to a quaternion and then back to a rotation matrix).
+        out: Optional array of shape (..., 3, 3) to write the result into
+            (NumPy and PyTorch only).
+        workspace: Optional `RotationWorkspace` holding the intermediates,
+            reusing it (and `out`) makes repeated calls allocation-free.
+        layout: "interleaved", or "components" for (3, ...) axis/angle vectors and (9, ...) matrices.
 
     Returns:
         Rotation matrices as tensor of shape (..., 3, 3).
     """
+    if layout != "interleaved":
+        _check_components_layout(layout, out, workspace)
+        return _soa.axis_angle_to_matrix(backend, axis_angle, fast=fast)
+    if out is not None or workspace is not None:
+        return _inplace.axis_angle_to_matrix(backend, axis_angle, fast=fast, out=out, workspace=workspace)
     if not fast:
         return quaternion_to_matrix(backend, axis_angle_to_quaternion(backend, axis_angle))
 
@@ -542,11 +965,11 @@ def axis_angle_to_matrix(
     ), (shape + (3,)))
     cross_product_matrix_sqrd = cross_product_matrix @ cross_product_matrix
 
-    identity = backend.eye(3, dtype=dtype, device=device)
+    identity = get_constant(backend, _identity_3x3, dtype, device)
     angles_sqrd = angles * angles
     angles_sqrd = backend.where(angles_sqrd == 0, 1, angles_sqrd)
     return (
-        backend.reshape(identity, [1] * (len(shape) - 1) + (3,3))
+        backend.reshape(identity, (1,) * (len(shape) - 1) + (3, 3))
         + backend.sinc(angles / backend.pi) * cross_product_matrix
         + ((1 - backend.cos(angles)) / angles_sqrd) * cross_product_matrix_sqrd
     )
@@ -554,7 +977,8 @@ def axis_angle_to_matrix(
 
 def matrix_to_axis_angle(
     backend: ComputeBackend[BArrayType, BDeviceType, BDtypeType, BRNGType],
-    matrix: BArrayType, fast: bool = False
+    matrix: BArrayType, fast: bool = False,
+    layout: str = "interleaved",
 ) -> BArrayType:
     """
     Convert rotations given as rotation matrices to axis/angle.
@@ -565,6 +989,7 @@ def matrix_to_axis_angle(
         fast: Whether to use the new faster implementation (based on the
             Rodrigues formula) instead of the original implementation (which
             first converted to a quaternion and then back to a rotation matrix).
+        layout: "interleaved", or "components" for (9, ...) matrices and (3, ...) axis/angle vectors.
 
     Returns:
         Rotations given as a vector in axis angle form, as a tensor
@@ -573,6 +998,9 @@ def matrix_to_axis_angle(
             direction.
 
     """
+    if layout != "interleaved":
+        _check_components_layout(layout)
+        return _soa.matrix_to_axis_angle(backend, matrix, fast=fast)
     if not fast:
         return quaternion_to_axis_angle(backend, matrix_to_quaternion(backend, matrix))
 
@@ -587,34 +1015,58 @@ def matrix_to_axis_angle(
         ],
         axis=-1,
     )
-    norms = backend.linalg.vector_norm(omegas, ord=2, axis=-1, keepdims=True)
+    # norm of omegas, with a zero (instead of nan) gradient for the identity
+    norms_sqrd = backend.sum(omegas * omegas, axis=-1, keepdims=True)
+    nonzero = norms_sqrd > 0
+    norms = backend.where(nonzero, backend.sqrt(backend.where(nonzero, norms_sqrd, backend.ones_like(norms_sqrd))), backend.zeros_like(norms_sqrd))
     traces = backend.sum(backend.linalg.diagonal(matrix), axis=-1, keepdims=True)
     angles = backend.atan2(norms, traces - 1)
 
-    zeros = backend.zeros(3, dtype=matrix.dtype, device=backend.device(matrix))
+    zeros = get_constant(backend, _zeros_3, matrix.dtype, backend.device(matrix))
     omegas = backend.where(backend.isclose(angles, 0), zeros, omegas)
 
-    near_pi = backend.isclose(angles, backend.pi)[..., 0]
-
-    axis_angles = backend.empty_like(omegas)
-    axis_angles = backend.at(axis_angles, backend.logical_not(near_pi)).set(
-        0.5 * omegas[~near_pi] / backend.sinc(angles[~near_pi] / backend.pi)
-    )
-
-    # this derives from: nnT = (R + 1) / 2
-    n = 0.5 * (
-        matrix[near_pi][..., 0, :]
-        + backend.eye(1, 3, dtype=matrix.dtype, device=backend.device(matrix))
+    # Both branches are evaluated for every matrix and selected with `where`, so that shapes do not depend on the data
+    # (traceable by jax.jit / vmap and torch.compile, no host sync). The denominators of the branch that is not
+    # selected are kept away from zero, so that it does not produce nan values (nor nan gradients through `where`).
+    near_pi = backend.isclose(angles, backend.pi)
+    sinc_angles = backend.where(near_pi, backend.ones_like(angles), backend.sinc(angles / backend.pi))
+    axis_angles_regular = 0.5 * omegas / sinc_angles
+
+    # this derives from: R = cos(angle) I + sin(angle) K + (1 - cos(angle)) nnT, whose symmetric part minus cos(angle) I
+    # is (1 - cos(angle)) nnT (unlike (R + 1) / 2, it has no O(pi - angle) skew-symmetric error term).
+    # Every row i of it is proportional to n_i n, the row with the largest diagonal entry is used:
+    # near pi that entry is at least about 2 / 3, so unlike the first row it cannot vanish (axis orthogonal to x).
+    # Only the diagonal and the symmetrized off-diagonal entries are needed, computed on (...) shaped arrays
+    cos_angles = (traces[..., 0] - 1) * 0.5
+    d0, d1, d2 = matrix[..., 0, 0] - cos_angles, matrix[..., 1, 1] - cos_angles, matrix[..., 2, 2] - cos_angles
+    s01 = 0.5 * (matrix[..., 0, 1] + matrix[..., 1, 0])
+    s02 = 0.5 * (matrix[..., 0, 2] + matrix[..., 2, 0])
+    s12 = 0.5 * (matrix[..., 1, 2] + matrix[..., 2, 1])
+    use_row_0 = (d0 >= d1) & (d0 >= d2)
+    use_row_1 = d1 >= d2
+    n = backend.stack(
+        [
+            backend.where(use_row_0, d0, backend.where(use_row_1, s01, s02)),
+            backend.where(use_row_0, s01, backend.where(use_row_1, d1, s12)),
+            backend.where(use_row_0, s02, backend.where(use_row_1, s12, d2)),
+        ],
+        axis=-1,
     )
-    # TODO(Yunhao): The original pytorch3d file contains `torch.norm` which ignores batch shape, not sure if this is exactly what we wanted
-    axis_angles[near_pi] = angles[near_pi] * n / backend.linalg.vector_norm(n, axis=-1, keepdims=True, ord=2)
+    # n vanishes for matrices far from pi (e.g. the identity), where it is not used anyway
+    n = backend.where(near_pi, n, backend.ones_like(n))
+    n = n / backend.linalg.vector_norm(n, ord=2, axis=-1, keepdims=True)
+    # n is only defined up to its sign, omegas = 2 sin(angle) n (if not exactly at pi) tells which one
+    n = backend.where(backend.sum(n * omegas, axis=-1, keepdims=True) < 0, -n, n)
+    axis_angles_near_pi = angles * n
 
-    return axis_angles
+    return backend.where(near_pi, axis_angles_near_pi, axis_angles_regular)
 
 
 def axis_angle_to_quaternion(
     backend: ComputeBackend[BArrayType, BDeviceType, BDtypeType, BRNGType],
-    axis_angle: BArrayType
+    axis_angle: BArrayType,
+    out: Optional[BArrayType] = None, workspace: Optional[RotationWorkspace] = None,
+    layout: str = "interleaved",
 ) -> BArrayType:
     """
     Convert rotations given as axis/angle to quaternions.
@@ -625,10 +1077,20 @@ def axis_angle_to_quaternion(
             as a tensor of shape (..., 3), where the magnitude is
             the angle turned anticlockwise in radians around the
             vector's direction.
+        out: Optional array of shape (..., 4) to write the result into
+            (NumPy and PyTorch only).
+        workspace: Optional `RotationWorkspace` holding the intermediates,
+            reusing it (and `out`) makes repeated calls allocation-free.
+        layout: "interleaved", or "components" for (3, ...) axis/angle vectors and (4, ...) quaternions.
 
     Returns:
         quaternions with real part first, as tensor of shape (..., 4).
     """
+    if layout != "interleaved":
+        _check_components_layout(layout, out, workspace)
+        return _soa.axis_angle_to_quaternion(backend, axis_angle)
+    if out is not None or workspace is not None:
+        return _inplace.axis_angle_to_quaternion(backend, axis_angle, out=out, workspace=workspace)
     angles = backend.linalg.vector_norm(axis_angle, ord=2, axis=-1, keepdims=True)
     sin_half_angles_over_angles = 0.5 * backend.sinc(angles * 0.5 / backend.pi)
     return backend.concat(
@@ -638,7 +1100,9 @@ def axis_angle_to_quaternion(
 
 def quaternion_to_axis_angle(
     backend: ComputeBackend[BArrayType, BDeviceType, BDtypeType, BRNGType],
-    quaternions: BArrayType
+    quaternions: BArrayType,
+    out: Optional[BArrayType] = None, workspace: Optional[RotationWorkspace] = None,
+    layout: str = "interleaved",
 ) -> BArrayType:
     """
     Convert rotations given as quaternions to axis/angle.
@@ -647,6 +1111,11 @@ def quaternion_to_axis_angle(
         backend: The backend to use for the computation.
         quaternions: quaternions with real part first,
             as tensor of shape (..., 4).
+        out: Optional array of shape (..., 3) to write the result into
+            (NumPy and PyTorch only).
+        workspace: Optional `RotationWorkspace` holding the intermediates,
+            reusing it (and `out`) makes repeated calls allocation-free.
+        layout: "interleaved", or "components" for (4, ...) quaternions and (3, ...) axis/angle vectors.
 
     Returns:
         Rotations given as a vector in axis angle form, as a tensor
@@ -654,6 +1123,11 @@ def quaternion_to_axis_angle(
             turned anticlockwise in radians around the vector's
             direction.
     """
+    if layout != "interleaved":
+        _check_components_layout(layout, out, workspace)
+        return _soa.quaternion_to_axis_angle(backend, quaternions)
+    if out is not None or workspace is not None:
+        return _inplace.quaternion_to_axis_angle(backend, quaternions, out=out, workspace=workspace)
     norms = backend.linalg.vector_norm(quaternions[..., 1:], ord=2, axis=-1, keepdims=True)
     half_angles = backend.atan2(norms, quaternions[..., :1])
     sin_half_angles_over_angles = 0.5 * backend.sinc(half_angles / backend.pi)
@@ -664,7 +1138,8 @@ def quaternion_to_axis_angle(
 
 def rotation_6d_to_matrix(
     backend: ComputeBackend[BArrayType, BDeviceType, BDtypeType, BRNGType],
-    d6: BArrayType
+    d6: BArrayType,
+    layout: str = "interleaved",
 ) -> BArrayType:
     """
     Converts 6D rotation representation by Zhou et al. [1] to rotation matrix
@@ -672,6 +1147,7 @@ def rotation_6d_to_matrix(
     Args:
         backend: The backend to use for the computation.
         d6: 6D rotation representation, of size (*, 6)
+        layout: "interleaved", or "components" for (6, ...) 6D representations and (9, ...) matrices.
 
     Returns:
         batch of rotation matrices of size (*, 3, 3)
@@ -681,6 +1157,9 @@ def rotation_6d_to_matrix(
     IEEE Conference on Computer Vision and Pattern Recognition, 2019.
     Retrieved from http://arxiv.org/abs/1812.07035
     """
+    if layout != "interleaved":
+        _check_components_layout(layout)
+        return _soa.rotation_6d_to_matrix(backend, d6)
 
     a1, a2 = d6[..., :3], d6[..., 3:]
     b1 = a1 / backend.linalg.vector_norm(a1, ord=2, axis=-1, keepdims=True)
@@ -691,7 +1170,8 @@ def rotation_6d_to_matrix(
 
 def matrix_to_rotation_6d(
     backend: ComputeBackend[BArrayType, BDeviceType, BDtypeType, BRNGType],
-    matrix: BArrayType
+    matrix: BArrayType,
+    layout: str = "interleaved",
 ) -> BArrayType:
     """
     Converts rotation matrices to 6D rotation representation by Zhou et al. [1]
@@ -699,6 +1179,7 @@ def matrix_to_rotation_6d(
     Args:
         backend: The backend to use for the computation.
         matrix: batch of rotation matrices of size (*, 3, 3)
+        layout: "interleaved", or "components" for (9, ...) matrices and (6, ...) 6D representations.
 
     Returns:
         6D rotation representation, of size (*, 6)
@@ -708,5 +1189,48 @@ def matrix_to_rotation_6d(
     IEEE Conference on Computer Vision and Pattern Recognition, 2019.
     Retrieved from http://arxiv.org/abs/1812.07035
     """
+    if layout != "interleaved":
+        _check_components_layout(layout)
+        return _soa.matrix_to_rotation_6d(backend, matrix)
     batch_dim = matrix.shape[:-2]
-    return backend.reshape(matrix[..., :2, :], (batch_dim + (6,)))
\ No newline at end of file
+    return backend.reshape(matrix[..., :2, :], (batch_dim + (6,)))
+
+
+def to_components(
+    backend: ComputeBackend[BArrayType, BDeviceType, BDtypeType, BRNGType],
+    x: BArrayType, is_matrix: bool = False
+) -> BArrayType:
+    """
+    View interleaved data in the components-first layout (`layout="components"`), without copying.
+
+    Args:
+        backend: The backend to use for the computation.
+        x: Array of shape (..., n), or rotation matrices of shape (..., 3, 3)
+            if `is_matrix`.
+        is_matrix: Whether x holds rotation matrices.
+
+    Returns:
+        A view of x of shape (n, ...), or (9, ...) with the matrix entries
+            in row-major order if `is_matrix`. Its components are strided,
+            so the components layout only pays off for data stored that way.
+    """
+    return _soa.to_components(backend, x, is_matrix)
+
+
+def from_components(
+    backend: ComputeBackend[BArrayType, BDeviceType, BDtypeType, BRNGType],
+    x: BArrayType, is_matrix: bool = False
+) -> BArrayType:
+    """
+    View data in the components-first layout as interleaved data, without copying.
+
+    Args:
+        backend: The backend to use for the computation.
+        x: Array of shape (n, ...), or rotation matrices of shape (9, ...)
+            if `is_matrix`.
+        is_matrix: Whether x holds rotation matrices.
+
+    Returns:
+        A view of x of shape (..., n), or (..., 3, 3) if `is_matrix`.
+    """
+    return _soa.from_components(backend, x, is_matrix)
@@ -0,0 +1,103 @@
+"""
+Opt-in compiled rotation conversions.
+
+The functions in `base.py` are built from many small array operations, each a separate kernel in eager mode.
+`get_compiled_rotation_conversions(backend)` returns the same functions (without the `backend` argument) compiled for the backend:
+    - jax: `jax.jit`, with the code path selecting arguments (`convention`, `fast`, `layout`) as static arguments,
+    - pytorch: `torch.compile`,
+    - numpy: hand-fused kernels (`_numpy_fused.py`) that write into one preallocated output
+      (for the interleaved layout, the components layout uses the eager functions).
+Functions without a compiled version (e.g. the random samplers) are the eager ones.
+"""
+from typing import Any, Callable, Dict, Tuple
+import functools
+import types
+from xbarray.backends.base import ComputeBackend
+from . import base as base_impl
+
+__all__ = [
+    "STATIC_ARGNAMES",
+    "LAYOUT_ARGNAME",
+    "EAGER_FUNCTION_NAMES",
+    "get_compiled_rotation_conversions",
+]
+
+# Arguments that select a code path instead of carrying data, compiled as constants
+STATIC_ARGNAMES : Dict[str, Tuple[str, ...]] = {
+    "euler_angles_to_matrix": ("convention",),
+    "matrix_to_euler_angles": ("convention",),
+    "axis_angle_to_matrix": ("fast",),
+    "matrix_to_axis_angle": ("fast",),
+    "encode_quaternion": ("encoding",),
+    "decode_quaternion": ("encoding", "dtype"),
+    "resample_quaternion_trajectory": ("method",),
+}
+
+# Passed by keyword to every function that has a layout, always static
+LAYOUT_ARGNAME = "layout"
+
+# Functions that are never compiled: the samplers (their output shape depends on an argument and they are dominated by the sampling itself)
+# and the layout converters (views)
+EAGER_FUNCTION_NAMES : Tuple[str, ...] = (
+    "random_quaternions",
+    "random_rotations",
+    "random_rotation",
+    "to_components",
+    "from_components",
+)
+
+_compiled_cache : Dict[Any, types.SimpleNamespace] = {}
+
+def _compile_jax(name : str, func : Callable) -> Callable:
+    import jax
+    return jax.jit(func, static_argnames=STATIC_ARGNAMES.get(name, ()) + (LAYOUT_ARGNAME,))
+
+def _with_eager_layouts(fused : Callable, eager : Callable) -> Callable:
+    # The fused NumPy kernels only handle the interleaved layout
+    @functools.wraps(fused)
+    def wrapper(*args : Any, layout : str = "interleaved", **kwargs : Any) -> Any:
+        if layout == "interleaved":
+            return fused(*args, **kwargs)
+        return eager(*args, layout=layout, **kwargs)
+    return wrapper
+
+def _compile_pytorch(name : str, backend : ComputeBackend, **compile_kwargs : Any) -> Callable:
+    import torch
+    # Compile the function itself rather than a `functools.partial` of it:
+    # dynamo caches compiled graphs per code object, and all partials share the same wrapper code
+    return functools.partial(torch.compile(getattr(base_impl, name), **compile_kwargs), backend)
+
+def get_compiled_rotation_conversions(
+    backend : ComputeBackend,
+    **compile_kwargs : Any,
+) -> types.SimpleNamespace:
+    """
+    Get the compiled rotation conversions of a backend, as a namespace with the same function names as `base.py`.
+    Compilation itself is lazy (on the first call with a new input shape / dtype), and the namespace is cached per backend
+    unless `compile_kwargs` (forwarded to `torch.compile`) are given.
+    """
+    cache_key = backend if len(compile_kwargs) == 0 else None
+    if cache_key is not None and cache_key in _compiled_cache:
+        return _compiled_cache[cache_key]
+
+    fused = {}
+    if backend.simplified_name == "numpy":
+        from . import _numpy_fused
+        fused = {name: getattr(_numpy_fused, name) for name in _numpy_fused.__all__}
+
+    functions = {}
+    for name in base_impl.__all__:
+        eager = functools.partial(getattr(base_impl, name), backend)
+        if name in EAGER_FUNCTION_NAMES:
+            functions[name] = eager
+        elif backend.simplified_name == "jax":
+            functions[name] = _compile_jax(name, eager)
+        elif backend.simplified_name == "pytorch":
+            functions[name] = _compile_pytorch(name, backend, **compile_kwargs)
+        else:
+            functions[name] = _with_eager_layouts(fused[name], eager) if name in fused else eager
+
+    namespace = types.SimpleNamespace(**functions)
+    if cache_key is not None:
+        _compiled_cache[cache_key] = namespace
+    return namespace
@@ -0,0 +1,161 @@
+from typing import Dict, Tuple, Union
+import dataclasses
+
+__all__ = [
+    "EulerConvention",
+    "get_euler_convention",
+    "EULER_CONVENTIONS",
+]
+
+# All valid conventions: 6 Tait-Bryan (three different axes) and 6 proper Euler (first axis = third axis)
+EULER_CONVENTIONS : Tuple[str, ...] = (
+    "XYZ", "XZY", "YXZ", "YZX", "ZXY", "ZYX",
+    "XYX", "XZX", "YXY", "YZY", "ZXZ", "ZYZ",
+)
+
+# A factor of a closed-form matrix entry: (angle index, 0 for cos / 1 for sin)
+EulerFactor = Tuple[int, int]
+# A term of a closed-form matrix entry: (sign, factors), the value is sign * prod(factors)
+EulerTerm = Tuple[int, Tuple[EulerFactor, ...]]
+# An entry used by an atan2 when extracting angles: (row, column, sign)
+EulerMatrixEntry = Tuple[int, int, int]
+
+@dataclasses.dataclass(frozen=True)
+class EulerConvention:
+    """
+    A validated Euler angle convention with everything the conversions need precomputed:
+    the closed-form expression of every rotation matrix entry as a sum of signed products of cos / sin of the angles,
+    and the matrix entries (and signs) the angles are recovered from.
+    Use `get_euler_convention` to get the (prebuilt) instance of a convention string.
+
+    Attributes:
+        name: Convention string of three uppercase letters from {"X", "Y", "Z"}.
+        axes: Axis indices of the three letters.
+        tait_bryan: Whether the first and third axes differ.
+        matrix_terms: For every entry of the row-major flattened rotation matrix, its (sign, factors) terms,
+            with factors (angle index, 0 for cos / 1 for sin), none of the entries is constant.
+        central_angle_entry: The entry giving the central angle, through asin (Tait-Bryan) or acos (proper Euler).
+        first_angle_entries: The (y, x) entries of the atan2 giving the first angle.
+        third_angle_entries: The (y, x) entries of the atan2 giving the third angle.
+    """
+    name : str
+    axes : Tuple[int, int, int]
+    tait_bryan : bool
+    matrix_terms : Tuple[Tuple[EulerTerm, ...], ...]
+    central_angle_entry : EulerMatrixEntry
+    first_angle_entries : Tuple[EulerMatrixEntry, EulerMatrixEntry]
+    third_angle_entries : Tuple[EulerMatrixEntry, EulerMatrixEntry]
+
+def _index_from_letter(letter : str) -> int:
+    if letter == "X":
+        return 0
+    if letter == "Y":
+        return 1
+    if letter == "Z":
+        return 2
+    raise ValueError("letter must be either X, Y or Z.")
+
+# Monomials of a symbolic matrix entry: {factors: coefficient}
+_Polynomial = Dict[Tuple[EulerFactor, ...], int]
+
+def _axis_angle_rotation_terms(axis : int, angle_index : int) -> Tuple[Tuple[_Polynomial, ...], ...]:
+    """
+    Symbolic version of the rotation matrix about one axis (see `_axis_angle_rotation` in PyTorch3D).
+    """
+    one : _Polynomial = {(): 1}
+    cos : _Polynomial = {((angle_index, 0),): 1}
+    sin : _Polynomial = {((angle_index, 1),): 1}
+    minus_sin : _Polynomial = {((angle_index, 1),): -1}
+    zero : _Polynomial = {}
+    if axis == 0:
+        return ((one, zero, zero), (zero, cos, minus_sin), (zero, sin, cos))
+    if axis == 1:
+        return ((cos, zero, sin), (zero, one, zero), (minus_sin, zero, cos))
+    return ((cos, minus_sin, zero), (sin, cos, zero), (zero, zero, one))
+
+def _matmul_terms(a : Tuple[Tuple[_Polynomial, ...], ...], b : Tuple[Tuple[_Polynomial, ...], ...]) -> Tuple[Tuple[_Polynomial, ...], ...]:
+    result = []
+    for row in range(3):
+        result_row = []
+        for col in range(3):
+            entry : _Polynomial = {}
+            for k in range(3):
+                for factors_a, coef_a in a[row][k].items():
+                    for factors_b, coef_b in b[k][col].items():
+                        factors = tuple(sorted(factors_a + factors_b))
+                        entry[factors] = entry.get(factors, 0) + coef_a * coef_b
+            result_row.append({factors: coef for factors, coef in entry.items() if coef != 0})
+        result.append(tuple(result_row))
+    return tuple(result)
+
+def _angle_from_tan_entries(
+    axis : str, other_axis : str, horizontal : bool, tait_bryan : bool, fixed_index : int
+) -> Tuple[EulerMatrixEntry, EulerMatrixEntry]:
+    """
+    The (y, x) atan2 entries of `_angle_from_tan` in PyTorch3D, where `data` is column `fixed_index` of the matrix
+    (first angle, not horizontal) or row `fixed_index` (third angle, horizontal).
+    """
+    i1, i2 = {"X": (2, 1), "Y": (0, 2), "Z": (1, 0)}[axis]
+    if horizontal:
+        i2, i1 = i1, i2
+    entry = (lambda i, sign: (fixed_index, i, sign)) if horizontal else (lambda i, sign: (i, fixed_index, sign))
+    even = (axis + other_axis) in ["XY", "YZ", "ZX"]
+    if horizontal == even:
+        return entry(i1, 1), entry(i2, 1)
+    if tait_bryan:
+        return entry(i2, -1), entry(i1, 1)
+    return entry(i2, 1), entry(i1, -1)
+
+def _build_euler_convention(convention : str) -> EulerConvention:
+    if len(convention) != 3:
+        raise ValueError("Convention must have 3 letters.")
+    if convention[1] in (convention[0], convention[2]):
+        raise ValueError(f"Invalid convention {convention}.")
+    for letter in convention:
+        if letter not in ("X", "Y", "Z"):
+            raise ValueError(f"Invalid letter {letter} in convention string.")
+    axes = tuple(_index_from_letter(letter) for letter in convention)
+
+    # R = R_0(angle_0) @ R_1(angle_1) @ R_2(angle_2)
+    matrix = _axis_angle_rotation_terms(axes[0], 0)
+    for angle_index in (1, 2):
+        matrix = _matmul_terms(matrix, _axis_angle_rotation_terms(axes[angle_index], angle_index))
+    matrix_terms = tuple(
+        tuple((coef, factors) for factors, coef in sorted(matrix[row][col].items()))
+        for row in range(3) for col in range(3)
+    )
+
+    i0, i2 = axes[0], axes[2]
+    tait_bryan = i0 != i2
+    if tait_bryan:
+        central_angle_entry = (i0, i2, -1 if i0 - i2 in [-1, 2] else 1)
+    else:
+        central_angle_entry = (i0, i0, 1)
+    return EulerConvention(
+        name=convention,
+        axes=axes,
+        tait_bryan=tait_bryan,
+        matrix_terms=matrix_terms,
+        central_angle_entry=central_angle_entry,
+        first_angle_entries=_angle_from_tan_entries(convention[0], convention[1], False, tait_bryan, i2),
+        third_angle_entries=_angle_from_tan_entries(convention[2], convention[1], True, tait_bryan, i0),
+    )
+
+# Every valid convention is built once at import, the conversions only do a dictionary lookup
+_EULER_CONVENTION_TABLE : Dict[str, EulerConvention] = {
+    convention: _build_euler_convention(convention) for convention in EULER_CONVENTIONS
+}
+
+def get_euler_convention(convention : Union[str, EulerConvention]) -> EulerConvention:
+    """
+    Get the prebuilt `EulerConvention` of a convention string (an `EulerConvention` is returned as is).
+    Raises a ValueError for invalid conventions.
+    """
+    if isinstance(convention, EulerConvention):
+        return convention
+    euler_convention = _EULER_CONVENTION_TABLE.get(convention)
+    if euler_convention is None:
+        # Not a valid convention, building it raises the appropriate error
+        _build_euler_convention(convention)
+        raise ValueError(f"Invalid convention {convention}.")
+    return euler_convention
@@ -0,0 +1,100 @@
+from typing import Dict, Optional, Tuple, Union
+import dataclasses
+import math
+
+__all__ = [
+    "QuaternionEncoding",
+    "get_quaternion_encoding",
+    "QUATERNION_ENCODINGS",
+]
+
+# All compact encodings of unit quaternions, see `QuaternionEncoding`
+QUATERNION_ENCODINGS : Tuple[str, ...] = (
+    "smallest_three_32",
+    "smallest_three_48",
+    "float16",
+)
+
+@dataclasses.dataclass(frozen=True)
+class QuaternionEncoding:
+    """
+    A compact storage format of unit quaternions, used by `encode_quaternion` / `decode_quaternion`.
+
+    The smallest-three formats store the index of the largest (in absolute value) component in 2 bits
+    and the three other components, with the sign making the largest one positive, quantized on `component_bits` bits
+    over [-1/sqrt(2), 1/sqrt(2)] (the largest component is recovered from the unit norm):
+        - "smallest_three_32": one uint32 per quaternion, index in bits 30-31 and 10-bit components in bits 20-29, 10-19 and 0-9,
+        - "smallest_three_48": three uint16 per quaternion, each holding a 15-bit component in bits 0-14,
+          with the low / high bit of the index in bit 15 of the first / second one.
+    "float16" stores the four components as float16, the decoded quaternions are renormalized.
+    Use `get_quaternion_encoding` to get the (prebuilt) instance of an encoding name.
+
+    Attributes:
+        name: Encoding name, one of `QUATERNION_ENCODINGS`.
+        dtype: Name of the dtype of the encoded arrays ("uint32", "uint16" or "float16").
+        encoded_size: Size of the component axis of the encoded arrays, None if it has none (one scalar per quaternion).
+        nbytes: Bytes per encoded quaternion (16 for float32 quaternions).
+        component_bits: Bits per quantized component of the smallest-three formats, None for "float16".
+        max_angular_error: Worst-case angle (radians, to first order in the quantization step)
+            between the rotation of a unit quaternion and the rotation of its decoded encoding.
+    """
+    name : str
+    dtype : str
+    encoded_size : Optional[int]
+    nbytes : int
+    component_bits : Optional[int]
+    max_angular_error : float
+
+def _smallest_three_max_angular_error(component_bits : int) -> float:
+    # Each of the three stored components is off by at most half a quantization step, and the largest component w >= 1/2
+    # (recomputed from the unit norm) by at most 3 half steps (|dw| <= sum |c_k dc_k| / w <= sqrt(3 (1 - w^2)) / w half steps),
+    # so the decoded (unit) quaternion is at most sqrt(3 + 9) half steps away from the original one
+    half_step = math.sqrt(2.0) / (2 * (2 ** component_bits - 1))
+    chord = math.sqrt(12.0) * half_step
+    return 4.0 * math.asin(chord / 2.0)
+
+def _float16_max_angular_error() -> float:
+    # Components in [-1, 1] are rounded to float16 with an absolute error of at most 2^-12 (half a unit in the last place in [0.5, 1)),
+    # so the error vector has a norm of at most 2 * 2^-12 and only its component orthogonal to the quaternion remains after renormalizing
+    error = 2.0 * 2.0 ** -12
+    return 2.0 * math.atan(error / (1.0 - error))
+
+# Every encoding is built once at import
+_QUATERNION_ENCODING_TABLE : Dict[str, QuaternionEncoding] = {
+    "smallest_three_32": QuaternionEncoding(
+        name="smallest_three_32",
+        dtype="uint32",
+        encoded_size=None,
+        nbytes=4,
+        component_bits=10,
+        max_angular_error=_smallest_three_max_angular_error(10),
+    ),
+    "smallest_three_48": QuaternionEncoding(
+        name="smallest_three_48",
+        dtype="uint16",
+        encoded_size=3,
+        nbytes=6,
+        component_bits=15,
+        max_angular_error=_smallest_three_max_angular_error(15),
+    ),
+    "float16": QuaternionEncoding(
+        name="float16",
+        dtype="float16",
+        encoded_size=4,
+        nbytes=8,
+        component_bits=None,
+        max_angular_error=_float16_max_angular_error(),
+    ),
+}
+
+def get_quaternion_encoding(encoding : Union[str, QuaternionEncoding]) -> QuaternionEncoding:
+    """
+    Get the prebuilt `QuaternionEncoding` of an encoding name (a `QuaternionEncoding` is returned as is).
+    Raises a ValueError for unknown encodings.
+    """
+    if isinstance(encoding, QuaternionEncoding):
+        return encoding
+    quaternion_encoding = _QUATERNION_ENCODING_TABLE.get(encoding)
+    if quaternion_encoding is None:
+        raise ValueError(f"Unknown quaternion encoding {encoding!r}, expected one of {QUATERNION_ENCODINGS}.")
+    return quaternion_encoding
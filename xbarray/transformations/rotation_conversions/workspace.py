@@ -0,0 +1,81 @@
+from typing import Generic, Hashable, Optional, Sequence, Tuple
+from collections import OrderedDict
+from xbarray.backends.base import ComputeBackend, BArrayType, BDeviceType, BDtypeType, BRNGType
+
+__all__ = [
+    "RotationWorkspace",
+]
+
+class RotationWorkspace(Generic[BArrayType, BDeviceType, BDtypeType, BRNGType]):
+    """
+    Reusable scratch buffers for the `out=` / `workspace=` variants of the rotation conversions.
+
+    Buffers are keyed by (name, shape, dtype, device) and allocated (uninitialized) on first request,
+    so once every shape in a loop has been seen, the conversions do not allocate anymore.
+    A workspace must not be shared by calls running concurrently (e.g. from several threads).
+    Only backends with mutable arrays (NumPy, PyTorch) are supported.
+    """
+    def __init__(
+        self,
+        backend : ComputeBackend[BArrayType, BDeviceType, BDtypeType, BRNGType],
+        max_buffers : int = 256,
+    ) -> None:
+        """
+        Args:
+            backend: The backend the buffers are allocated with.
+            max_buffers: Maximum number of buffers kept, the least recently used ones are released beyond that.
+        """
+        if backend.simplified_name == "jax":
+            raise ValueError("JAX arrays are immutable, a RotationWorkspace can only be used with NumPy or PyTorch.")
+        if max_buffers <= 0:
+            raise ValueError(f"max_buffers must be positive, got {max_buffers}.")
+        self.backend = backend
+        self.max_buffers = max_buffers
+        self._buffers : "OrderedDict[Tuple[Hashable, ...], BArrayType]" = OrderedDict()
+
+    def get(
+        self,
+        name : str,
+        shape : Sequence[int],
+        dtype : BDtypeType,
+        device : Optional[BDeviceType] = None,
+    ) -> BArrayType:
+        """
+        Get the scratch buffer `name` of the given shape, dtype and device, allocating it on the first request.
+        The content of the buffer is whatever the previous user left in it.
+        """
+        key = (name, tuple(shape), dtype, device)
+        buffer = self._buffers.get(key)
+        if buffer is None:
+            buffer = self.backend.empty(tuple(shape), dtype=dtype, device=device)
+            self._buffers[key] = buffer
+            if len(self._buffers) > self.max_buffers:
+                self._buffers.popitem(last=False)
+        else:
+            self._buffers.move_to_end(key)
+        return buffer
+
+    def like(self, name : str, shape : Sequence[int], x : BArrayType) -> BArrayType:
+        """
+        Get the scratch buffer `name` of the given shape, with the dtype and device of `x`.
+        """
+        return self.get(name, shape, x.dtype, self.backend.device(x))
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Total size of the buffers currently held, in bytes.
+        """
+        return sum(int(buffer.nbytes) for buffer in self._buffers.values())
+
+    def clear(self) -> None:
+        """
+        Release all buffers.
+        """
+        self._buffers.clear()
+
+    def __len__(self) -> int:
+        return len(self._buffers)
+
+    def __repr__(self) -> str:
+        return f"RotationWorkspace(backend={self.backend.simplified_name}, buffers={len(self)}, nbytes={self.nbytes})"